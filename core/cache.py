@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+import redis
+
+from core.config import settings
+
+# Seconds to wait before retrying Redis after a connection failure
+_RETRY_INTERVAL = 30.0
+
+_client: Optional[redis.Redis] = None
+_retry_at = 0.0
+
+def get_redis() -> Optional[redis.Redis]:
+    """Return a shared Redis client, or None when caching is disabled or Redis is unreachable"""
+    global _client, _retry_at
+    if not settings.CACHE_ENABLED or not settings.REDIS_URL:
+        return None
+    if _client is not None:
+        return _client
+    if time.monotonic() < _retry_at:
+        return None
+    try:
+        client = redis.Redis.from_url(settings.REDIS_URL, socket_connect_timeout=0.2, socket_timeout=0.2)
+        client.ping()
+    except redis.RedisError:
+        _retry_at = time.monotonic() + _RETRY_INTERVAL
+        return None
+    _client = client
+    return _client
+
+def _mark_unavailable() -> None:
+    global _client, _retry_at
+    _client = None
+    _retry_at = time.monotonic() + _RETRY_INTERVAL
+
+def cache_get(key: str) -> Optional[Any]:
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        value = client.get(key)
+    except redis.RedisError:
+        _mark_unavailable()
+        return None
+    return json.loads(value) if value is not None else None
+
+def cache_set(key: str, value: Any, ttl: int) -> None:
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        client.setex(key, ttl, json.dumps(value, default=str))
+    except redis.RedisError:
+        _mark_unavailable()
+
+def cache_delete(*keys: str) -> None:
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        client.delete(*keys)
+    except redis.RedisError:
+        _mark_unavailable()
+
+class TTLCache:
+    """Small thread-safe in-process LRU cache whose entries expire after a TTL"""
+    
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else min(ttl, self.ttl))
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
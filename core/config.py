@@ -28,12 +28,23 @@ class Settings:
     DEFAULT_PAGE_SIZE: int = 100
     MAX_PAGE_SIZE: int = 1000
     
+    # HTTP caching for read-only GET endpoints
+    HTTP_CACHE_MAX_AGE: int = int(os.getenv("HTTP_CACHE_MAX_AGE", "30"))
+    
     # WhatsApp
     WHATSAPP_API_URL: Optional[str] = os.getenv("WHATSAPP_API_URL")
     WHATSAPP_WEBHOOK_URL: Optional[str] = os.getenv("WHATSAPP_WEBHOOK_URL")
     
     # Redis (for caching and sessions)
     REDIS_URL: Optional[str] = os.getenv("REDIS_URL", "redis://localhost:6379")
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "true").lower() == "true"
+    USER_CACHE_TTL: int = int(os.getenv("USER_CACHE_TTL", "60"))
+    DISTRIBUTION_SUMMARY_TTL: int = int(os.getenv("DISTRIBUTION_SUMMARY_TTL", "30"))
+    # Per-worker device session snapshots; revocations are checked against Redis on every hit
+    SESSION_CACHE_TTL: int = int(os.getenv("SESSION_CACHE_TTL", "30"))
+    
+    # Usage log retention; whole monthly partitions older than this are dropped daily (0 keeps everything)
+    USAGE_LOG_RETENTION_DAYS: int = int(os.getenv("USAGE_LOG_RETENTION_DAYS", "0"))
     
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
@@ -1,9 +1,12 @@
 from datetime import datetime, timedelta
 from typing import Optional, Union
+import hashlib
+import time
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from fastapi import HTTPException, status
 from core.config import settings
+from core.cache import TTLCache
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
@@ -18,12 +21,26 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
+# Decoded payloads of recently verified tokens, keyed by a digest of the token
+_token_cache = TTLCache(maxsize=10_000, ttl=60)
+
 def verify_token(token: str) -> Optional[dict]:
+    cache_key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    payload = _token_cache.get(cache_key)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    # Never keep a payload past the token's own expiry
+    exp = payload.get("exp")
+    ttl = exp - time.time() if isinstance(exp, (int, float)) else None
+    if ttl is None or ttl > 0:
+        _token_cache.set(cache_key, payload, ttl)
+    return payload
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
@@ -32,7 +49,7 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 def authenticate_user(username: str, password: str, user_service) -> Optional[object]:
-    user = user_service.get_user_by_username(username)
+    user = user_service.get_user_for_login(username)
     if not user:
         return None
     if not verify_password(password, user.password_hash):
@@ -0,0 +1,43 @@
+"""In-process cache of the user columns denormalized onto usage logs.
+
+Usage log writes need each sender's (parent_reseller_id, business_name). Those change rarely,
+so they are kept per worker for USER_CACHE_TTL seconds instead of being selected on every
+write. The local entry is dropped whenever the user is written through UserService.
+"""
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache
+from core.config import settings
+from models.user import User
+
+UserProjection = Tuple[Optional[str], Optional[str]]
+
+_projections = TTLCache(maxsize=10_000, ttl=settings.USER_CACHE_TTL)
+
+def get_user_projections(db: Session, user_ids: Iterable[str]) -> Dict[str, UserProjection]:
+    """Return {user_id: (parent_reseller_id, business_name)} for the users that exist"""
+    found: Dict[str, UserProjection] = {}
+    missing = []
+    for user_id in set(user_ids):
+        projection = _projections.get(user_id)
+        if projection is None:
+            missing.append(user_id)
+        else:
+            found[user_id] = projection
+
+    if missing:
+        for user_id, reseller_id, business_name in db.execute(
+            select(User.user_id, User.parent_reseller_id, User.business_name).where(User.user_id.in_(missing))
+        ):
+            found[user_id] = (reseller_id, business_name)
+            _projections.set(user_id, found[user_id])
+    return found
+
+def get_user_projection(db: Session, user_id: str) -> Optional[UserProjection]:
+    return get_user_projections(db, (user_id,)).get(user_id)
+
+def invalidate_user_projection(user_id: str) -> None:
+    _projections.pop(user_id)
@@ -7,12 +7,14 @@ from services.message_usage_log_service import MessageUsageLogService
 from schemas.message_usage_log import UsageLogCreateRequest
 from datetime import datetime
 
+SAMPLE_USAGE_ID = "00000000-0000-7000-8000-000000000333"
+
 def create_sample_usage_log():
     db = SessionLocal()
     usage_service = MessageUsageLogService(db)
     
     # Check if usage log already exists
-    existing_usage = db.query(MessageUsageLog).filter(MessageUsageLog.usage_id == "usage-333").first()
+    existing_usage = db.query(MessageUsageLog).filter(MessageUsageLog.usage_id == SAMPLE_USAGE_ID).first()
     if existing_usage:
         print("Sample usage log already exists!")
         return
@@ -50,7 +52,7 @@ def create_sample_usage_log():
         
         # Update usage log with sample data
         usage = usage_service.get_usage_log_by_id(usage_response.usage_id)
-        usage.usage_id = "usage-333"
+        usage.usage_id = SAMPLE_USAGE_ID
         usage.created_at = datetime(2026, 1, 6, 12, 15, 1)
         usage.timestamp = datetime(2026, 1, 6, 12, 15, 1)
         usage.balance_after = 1799
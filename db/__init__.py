@@ -1,3 +1,5 @@
-from .database import engine, SessionLocal, Base, get_db
+from .database import engine, SessionLocal, Base, get_db, init_db
+from .functions import utcnow
+from .ids import time_sorted_id, time_sorted_uuid
 
-__all__ = ["engine", "SessionLocal", "Base", "get_db"]
+__all__ = ["engine", "SessionLocal", "Base", "get_db", "init_db", "utcnow", "time_sorted_id", "time_sorted_uuid"]
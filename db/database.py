@@ -1,11 +1,31 @@
 from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 import os
 
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./whatsapp_platform.db")
 
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {})
+# Pool settings for server databases. Behind PgBouncer (transaction pooling) set
+# DB_USE_NULLPOOL=true so PgBouncer is the only pool and connections are not held per worker.
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "20"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_USE_NULLPOOL = os.getenv("DB_USE_NULLPOOL", "false").lower() == "true"
+
+# Local development only: create missing tables when the app starts instead of running Alembic
+DB_AUTO_CREATE = os.getenv("DB_AUTO_CREATE", "false").lower() == "true"
+
+if "sqlite" in DATABASE_URL:
+    engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+elif DB_USE_NULLPOOL:
+    engine = create_engine(DATABASE_URL, poolclass=NullPool)
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=True
+    )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
@@ -16,3 +36,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def init_db():
+    """Create all tables. One-off bootstrap; deployed databases use `alembic upgrade head`."""
+    import models  # noqa: F401  (registers every mapped table on Base.metadata)
+    Base.metadata.create_all(bind=engine)
@@ -0,0 +1,28 @@
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import FunctionElement
+from sqlalchemy.types import DateTime
+
+class utcnow(FunctionElement):
+    """Database-side current UTC timestamp, usable as a server_default / onupdate.
+    
+    The columns store naive UTC datetimes (as datetime.utcnow() did), so each dialect
+    renders the server clock in UTC rather than the session time zone.
+    """
+    type = DateTime()
+    inherit_cache = True
+
+@compiles(utcnow)
+def _default_utcnow(element, compiler, **kw):
+    return "CURRENT_TIMESTAMP"
+
+@compiles(utcnow, "postgresql")
+def _pg_utcnow(element, compiler, **kw):
+    return "TIMEZONE('utc', CURRENT_TIMESTAMP)"
+
+@compiles(utcnow, "mssql")
+def _mssql_utcnow(element, compiler, **kw):
+    return "GETUTCDATE()"
+
+@compiles(utcnow, "mysql")
+def _mysql_utcnow(element, compiler, **kw):
+    return "UTC_TIMESTAMP()"
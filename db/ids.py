@@ -0,0 +1,18 @@
+import secrets
+import time
+import uuid
+
+def time_sorted_id(prefix: str) -> str:
+    """Prefixed ID whose first 12 hex digits are the creation time in milliseconds.
+    
+    IDs with the same prefix sort by creation time (like ULID / UUIDv7), so primary-key
+    inserts append to the right edge of the B-tree instead of splitting random pages.
+    """
+    return f"{prefix}{time.time_ns() // 1_000_000:012x}{secrets.token_hex(4)}"
+
+def time_sorted_uuid() -> uuid.UUID:
+    """UUIDv7-layout UUID: 48-bit millisecond timestamp, version/variant bits, 74 random bits"""
+    value = (time.time_ns() // 1_000_000) << 80 | int.from_bytes(secrets.token_bytes(10), "big")
+    value = (value & ~(0xF << 76)) | (0x7 << 76)  # version 7
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)  # RFC 4122 variant
+    return uuid.UUID(int=value)
@@ -1,7 +1,9 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, status, Request, Response
+from fastapi.responses import ORJSONResponse
 from fastapi.security import HTTPBearer
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
-from db.database import engine, get_db
+from db.database import get_db, DB_AUTO_CREATE, init_db
 from models.user import User
 from models.credit_distribution import CreditDistribution
 from models.message import Message
@@ -9,28 +11,29 @@ from models.unofficial_device import UnofficialLinkedDevice
 from models.device_session import DeviceSession
 from models.message_usage_log import MessageUsageLog
 from models.reseller_analytics import ResellerAnalytics
-from schemas.user import UserCreate, UserResponse, UserLogin, UserLoginResponse
-from schemas.credit_distribution import CreditDistributionCreate, CreditDistributionResponse, ResellerCreditStats, BusinessOwnerCreditStats
-from schemas.message import MessageCreate, MessageResponse, MessageSendRequest, BulkMessageRequest, MessageStats, WebhookPayload
+from schemas.user import UserCreate, UserResponse, UserLogin, UserLoginResponse, USER_RESPONSE_LIST_ADAPTER
+from schemas.credit_distribution import CreditDistributionCreate, CreditDistributionResponse, ResellerCreditStats, BusinessOwnerCreditStats, CREDIT_DISTRIBUTION_LIST_ADAPTER
+from schemas.message import MessageCreate, MessageResponse, MessageSendRequest, BulkMessageRequest, MessageStats, WebhookPayload, MESSAGE_RESPONSE_LIST_ADAPTER
 from schemas.unofficial_device import (
     UnofficialDeviceCreate, UnofficialDeviceUpdate, UnofficialDeviceResponse,
     QRCodeRequest, QRCodeResponse, DeviceConnectRequest, DeviceConnectResponse,
     DeviceDisconnectRequest, DeviceDisconnectResponse, DeviceStatusUpdate,
-    DeviceStats, UserDeviceStats, BulkDeviceOperation, DeviceHealthCheck
+    DeviceStats, UserDeviceStats, BulkDeviceOperation, DeviceHealthCheck,
+    DEVICE_RESPONSE_LIST_ADAPTER
 )
 from schemas.device_session import (
     DeviceSessionCreate, DeviceSessionUpdate, DeviceSessionResponse,
     SessionCreateRequest, SessionCreateResponse, SessionValidateRequest, SessionValidateResponse,
     SessionExtendRequest, SessionExtendResponse, SessionRevokeRequest, SessionRevokeResponse,
     SessionLoginRequest, SessionLoginResponse, SessionActivityUpdate,
-    SessionStats, DeviceSessionStats, UserSessionStats, SessionSecurityCheck,
-    BulkSessionOperation, SessionCleanupRequest, SessionCleanupResponse,
-    SessionHealthCheck
+    SessionStats, DeviceSessionStats, UserSessionStats,
+    BulkSessionOperation, SessionCleanupRequest, SessionCleanupResponse
 )
+from schemas._adapters import ADAPTERS
 from schemas.message_usage_log import (
-    MessageUsageLogCreate, MessageUsageLogUpdate, MessageUsageLogResponse,
+    MessageUsageLogCreate, MessageUsageLogUpdate, MessageUsageLogResponse, usage_log_response, USAGE_LOG_RESPONSE_LIST_ADAPTER,
     UsageLogCreateRequest, UsageLogCreateResponse, UsageLogRefundRequest, UsageLogRefundResponse,
-    UsageLogUpdateRequest, UsageLogUpdateResponse, UsageStats, UserUsageStats,
+    UsageLogUpdateRequest, UsageLogUpdateResponse, UsageSummary, USAGE_SUMMARY_LIST_ADAPTER, UsageStats, UserUsageStats,
     DeviceUsageStats, SessionUsageStats, UsageAnalytics, UsageFilter,
     BulkUsageOperation, BulkUsageResponse, UsageCleanupRequest, UsageCleanupResponse
 )
@@ -40,8 +43,7 @@ from schemas.reseller_analytics import (
     CreateBusinessUserStatsRequest, UpdateBusinessUserStatsRequest,
     AnalyticsFilter, AnalyticsSummary, ResellerPerformanceMetrics,
     TopPerformersResponse, AnalyticsTrends, AnalyticsComparison,
-    AnalyticsExportRequest, AnalyticsExportResponse,
-    AnalyticsHealthCheck, AnalyticsCleanupRequest, AnalyticsCleanupResponse
+    AnalyticsExportRequest, AnalyticsExportResponse
 )
 from services.user_service import UserService
 from services.credit_distribution_service import CreditDistributionService
@@ -50,22 +52,27 @@ from services.unofficial_device_service import UnofficialDeviceService
 from services.device_session_service import DeviceSessionService
 from services.message_usage_log_service import MessageUsageLogService
 from services.reseller_analytics_service import ResellerAnalyticsService
+from core.config import settings
+from utils.helpers import format_http_date, is_not_modified
 from typing import List, Optional
 from datetime import datetime
+import sys
 import uvicorn
 
-# Create database tables
-from db.database import Base
-Base.metadata.create_all(bind=engine)
-
 app = FastAPI(
     title="WhatsApp Platform API",
     description="WhatsApp automation and messaging platform",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 security = HTTPBearer()
 
+if DB_AUTO_CREATE:
+    @app.on_event("startup")
+    def create_tables():
+        init_db()
+
 # Dependency to get user service
 def get_user_service(db: Session = Depends(get_db)) -> UserService:
     return UserService(db)
@@ -94,6 +101,61 @@ def get_message_usage_log_service(db: Session = Depends(get_db)) -> MessageUsage
 def get_reseller_analytics_service(db: Session = Depends(get_db)) -> ResellerAnalyticsService:
     return ResellerAnalyticsService(db)
 
+# Cache headers for read-only GET endpoints
+def set_cache_headers(response: Response, last_modified: Optional[datetime] = None) -> None:
+    response.headers["Cache-Control"] = f"private, max-age={settings.HTTP_CACHE_MAX_AGE}"
+    if last_modified:
+        response.headers["Last-Modified"] = format_http_date(last_modified)
+
+# Serialize user listings through the shared adapter; response_model stays declared for the OpenAPI schema
+def user_list_response(users: List[User]) -> Response:
+    return Response(
+        content=USER_RESPONSE_LIST_ADAPTER.dump_json(USER_RESPONSE_LIST_ADAPTER.validate_python(users)),
+        media_type="application/json"
+    )
+
+def message_list_response(messages: List[Message]) -> Response:
+    return Response(
+        content=MESSAGE_RESPONSE_LIST_ADAPTER.dump_json(MESSAGE_RESPONSE_LIST_ADAPTER.validate_python(messages)),
+        media_type="application/json"
+    )
+
+# Distribution listings arrive as plain column rows, which from_orm_fast reads by attribute
+def distribution_list_response(rows: List[Row]) -> Response:
+    return Response(
+        content=CREDIT_DISTRIBUTION_LIST_ADAPTER.dump_json([CreditDistributionResponse.from_orm_fast(row) for row in rows]),
+        media_type="application/json"
+    )
+
+# Each row becomes its status variant without validation; the union list is dumped in one pass
+def usage_log_list_response(usage_logs: List[MessageUsageLog]) -> Response:
+    return Response(
+        content=USAGE_LOG_RESPONSE_LIST_ADAPTER.dump_json([usage_log_response(log) for log in usage_logs]),
+        media_type="application/json"
+    )
+
+# Summaries are plain dicts, so they are validated once by the shared adapter and dumped straight to bytes
+def usage_summary_list_response(summaries: List[dict]) -> Response:
+    return Response(
+        content=USAGE_SUMMARY_LIST_ADAPTER.dump_json(USAGE_SUMMARY_LIST_ADAPTER.validate_python(summaries)),
+        media_type="application/json"
+    )
+
+# Device rows are trusted, so build them without validation and dump the list in one pass
+def device_list_response(devices: List[UnofficialLinkedDevice]) -> Response:
+    return Response(
+        content=DEVICE_RESPONSE_LIST_ADAPTER.dump_json([UnofficialDeviceResponse.from_orm_fast(device) for device in devices]),
+        media_type="application/json"
+    )
+
+# Single response models are already built, so dump them with their cached adapter
+def model_response(obj, status_code: int = status.HTTP_200_OK) -> Response:
+    return Response(
+        content=ADAPTERS[type(obj)].dump_json(obj),
+        media_type="application/json",
+        status_code=status_code
+    )
+
 @app.get("/")
 def root():
     return {"message": "WhatsApp Platform API is running"}
@@ -101,96 +163,35 @@ def root():
 @app.post("/users/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create_user(user: UserCreate, user_service: UserService = Depends(get_user_service)):
     # Check if user already exists
-    existing_user = user_service.get_user_by_username(user.profile.username)
-    if existing_user:
+    checks = user_service.preflight_user_checks(user.profile.username, user.profile.email)
+    if checks["username_taken"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    existing_email = user_service.get_user_by_email(user.profile.email)
-    if existing_email:
+    if checks["email_taken"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     db_user = user_service.create_user(user)
-    return UserResponse(
-        user_id=db_user.user_id,
-        role=db_user.role,
-        status=db_user.status,
-        profile={
-            "name": db_user.name,
-            "username": db_user.username,
-            "email": db_user.email,
-            "phone": db_user.phone,
-            "password_hash": db_user.password_hash
-        },
-        business={
-            "business_name": db_user.business_name,
-            "business_description": db_user.business_description,
-            "erp_system": db_user.erp_system,
-            "gstin": db_user.gstin
-        } if db_user.business_name else None,
-        address={
-            "full_address": db_user.full_address,
-            "pincode": db_user.pincode,
-            "country": db_user.country
-        } if db_user.full_address else None,
-        bank={
-            "bank_name": db_user.bank_name
-        } if db_user.bank_name else None,
-        wallet={
-            "total_credits": db_user.total_credits,
-            "available_credits": db_user.available_credits,
-            "used_credits": db_user.used_credits
-        },
-        created_at=db_user.created_at,
-        updated_at=db_user.updated_at
-    )
+    return model_response(UserResponse.model_validate(db_user), status.HTTP_201_CREATED)
 
 @app.get("/users/", response_model=List[UserResponse])
 def get_users(skip: int = 0, limit: int = 100, user_service: UserService = Depends(get_user_service)):
     users = user_service.get_users(skip=skip, limit=limit)
-    return [
-        UserResponse(
-            user_id=user.user_id,
-            role=user.role,
-            status=user.status,
-            profile={
-                "name": user.name,
-                "username": user.username,
-                "email": user.email,
-                "phone": user.phone,
-                "password_hash": user.password_hash
-            },
-            business={
-                "business_name": user.business_name,
-                "business_description": user.business_description,
-                "erp_system": user.erp_system,
-                "gstin": user.gstin
-            } if user.business_name else None,
-            address={
-                "full_address": user.full_address,
-                "pincode": user.pincode,
-                "country": user.country
-            } if user.full_address else None,
-            bank={
-                "bank_name": user.bank_name
-            } if user.bank_name else None,
-            wallet={
-                "total_credits": user.total_credits,
-                "available_credits": user.available_credits,
-                "used_credits": user.used_credits
-            },
-            created_at=user.created_at,
-            updated_at=user.updated_at
-        ) for user in users
-    ]
+    return user_list_response(users)
 
 @app.get("/users/{user_id}", response_model=UserResponse)
-def get_user(user_id: str, user_service: UserService = Depends(get_user_service)):
+def get_user(user_id: str, request: Request, user_service: UserService = Depends(get_user_service)):
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and is_not_modified(if_modified_since, user_service.get_user_updated_at(user_id)):
+        not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        set_cache_headers(not_modified)
+        return not_modified
+    
     user = user_service.get_user_by_id(user_id)
     if not user:
         raise HTTPException(
@@ -198,39 +199,9 @@ def get_user(user_id: str, user_service: UserService = Depends(get_user_service)
             detail="User not found"
         )
     
-    return UserResponse(
-        user_id=user.user_id,
-        role=user.role,
-        status=user.status,
-        profile={
-            "name": user.name,
-            "username": user.username,
-            "email": user.email,
-            "phone": user.phone,
-            "password_hash": user.password_hash
-        },
-        business={
-            "business_name": user.business_name,
-            "business_description": user.business_description,
-            "erp_system": user.erp_system,
-            "gstin": user.gstin
-        } if user.business_name else None,
-        address={
-            "full_address": user.full_address,
-            "pincode": user.pincode,
-            "country": user.country
-        } if user.full_address else None,
-        bank={
-            "bank_name": user.bank_name
-        } if user.bank_name else None,
-        wallet={
-            "total_credits": user.total_credits,
-            "available_credits": user.available_credits,
-            "used_credits": user.used_credits
-        },
-        created_at=user.created_at,
-        updated_at=user.updated_at
-    )
+    user_response = model_response(UserResponse.model_validate(user))
+    set_cache_headers(user_response, user.updated_at)
+    return user_response
 
 @app.post("/users/login", response_model=UserLoginResponse)
 def login_user(user_credentials: UserLogin, user_service: UserService = Depends(get_user_service)):
@@ -245,114 +216,38 @@ def login_user(user_credentials: UserLogin, user_service: UserService = Depends(
     # For now, return a simple token (in production, use JWT)
     access_token = f"simple_token_{user.user_id}"
     
-    return UserLoginResponse(
+    return model_response(UserLoginResponse(
         access_token=access_token,
         token_type="bearer",
-        user=UserResponse(
-            user_id=user.user_id,
-            role=user.role,
-            status=user.status,
-            parent_reseller_id=user.parent_reseller_id,
-            whatsapp_mode=user.whatsapp_mode,
-            profile={
-                "name": user.name,
-                "username": user.username,
-                "email": user.email,
-                "phone": user.phone,
-                "password_hash": user.password_hash
-            },
-            business={
-                "business_name": user.business_name,
-                "business_description": user.business_description,
-                "erp_system": user.erp_system,
-                "gstin": user.gstin
-            } if user.business_name else None,
-            address={
-                "full_address": user.full_address,
-                "pincode": user.pincode,
-                "country": user.country
-            } if user.full_address else None,
-            bank={
-                "bank_name": user.bank_name
-            } if user.bank_name else None,
-            wallet={
-                "total_credits": user.total_credits,
-                "available_credits": user.available_credits,
-                "used_credits": user.used_credits
-            } if user.role != "business_owner" else None,
-            business_owner_wallet={
-                "credits_allocated": user.credits_allocated,
-                "credits_used": user.credits_used,
-                "credits_remaining": user.credits_remaining
-            } if user.role == "business_owner" else None,
-            created_at=user.created_at,
-            updated_at=user.updated_at
-        )
-    )
+        user=UserResponse.model_validate(user)
+    ))
 
 # Business Owner specific endpoints
 @app.post("/resellers/{reseller_id}/business-owners/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 def create_business_owner(reseller_id: str, user: UserCreate, user_service: UserService = Depends(get_user_service)):
-    # Check if reseller exists
-    reseller = user_service.get_user_by_id(reseller_id)
-    if not reseller or reseller.role != "reseller":
+    # Check reseller and duplicate user in one round-trip
+    checks = user_service.preflight_user_checks(user.profile.username, user.profile.email, reseller_id)
+    if not checks["reseller_exists"]:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Reseller not found"
         )
     
     # Check if user already exists
-    existing_user = user_service.get_user_by_username(user.profile.username)
-    if existing_user:
+    if checks["username_taken"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already registered"
         )
     
-    existing_email = user_service.get_user_by_email(user.profile.email)
-    if existing_email:
+    if checks["email_taken"]:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
     db_user = user_service.create_business_owner(user, reseller_id)
-    return UserResponse(
-        user_id=db_user.user_id,
-        role=db_user.role,
-        status=db_user.status,
-        parent_reseller_id=db_user.parent_reseller_id,
-        whatsapp_mode=db_user.whatsapp_mode,
-        profile={
-            "name": db_user.name,
-            "username": db_user.username,
-            "email": db_user.email,
-            "phone": db_user.phone,
-            "password_hash": db_user.password_hash
-        },
-        business={
-            "business_name": db_user.business_name,
-            "business_description": db_user.business_description,
-            "erp_system": db_user.erp_system,
-            "gstin": db_user.gstin
-        } if db_user.business_name else None,
-        address={
-            "full_address": db_user.full_address,
-            "pincode": db_user.pincode,
-            "country": db_user.country
-        } if db_user.full_address else None,
-        bank={
-            "bank_name": db_user.bank_name
-        } if db_user.bank_name else None,
-        wallet=None,
-        business_owner_wallet={
-            "credits_allocated": db_user.credits_allocated,
-            "credits_used": db_user.credits_used,
-            "credits_remaining": db_user.credits_remaining
-        },
-        created_at=db_user.created_at,
-        updated_at=db_user.updated_at
-    )
+    return model_response(UserResponse.model_validate(db_user), status.HTTP_201_CREATED)
 
 @app.get("/resellers/{reseller_id}/business-owners/", response_model=List[UserResponse])
 def get_business_owners_by_reseller(reseller_id: str, skip: int = 0, limit: int = 100, user_service: UserService = Depends(get_user_service)):
@@ -365,44 +260,7 @@ def get_business_owners_by_reseller(reseller_id: str, skip: int = 0, limit: int
         )
     
     business_owners = user_service.get_business_owners_by_reseller(reseller_id, skip, limit)
-    return [
-        UserResponse(
-            user_id=user.user_id,
-            role=user.role,
-            status=user.status,
-            parent_reseller_id=user.parent_reseller_id,
-            whatsapp_mode=user.whatsapp_mode,
-            profile={
-                "name": user.name,
-                "username": user.username,
-                "email": user.email,
-                "phone": user.phone,
-                "password_hash": user.password_hash
-            },
-            business={
-                "business_name": user.business_name,
-                "business_description": user.business_description,
-                "erp_system": user.erp_system,
-                "gstin": user.gstin
-            } if user.business_name else None,
-            address={
-                "full_address": user.full_address,
-                "pincode": user.pincode,
-                "country": user.country
-            } if user.full_address else None,
-            bank={
-                "bank_name": user.bank_name
-            } if user.bank_name else None,
-            wallet=None,
-            business_owner_wallet={
-                "credits_allocated": user.credits_allocated,
-                "credits_used": user.credits_used,
-                "credits_remaining": user.credits_remaining
-            },
-            created_at=user.created_at,
-            updated_at=user.updated_at
-        ) for user in business_owners
-    ]
+    return user_list_response(business_owners)
 
 # Credit Distribution endpoints
 @app.post("/credit-distributions/", response_model=CreditDistributionResponse, status_code=status.HTTP_201_CREATED)
@@ -412,13 +270,7 @@ def create_credit_distribution(
 ):
     try:
         credit_distribution = credit_service.create_credit_distribution(distribution)
-        return CreditDistributionResponse(
-            distribution_id=credit_distribution.distribution_id,
-            from_reseller_id=credit_distribution.from_reseller_id,
-            to_business_user_id=credit_distribution.to_business_user_id,
-            credits_shared=credit_distribution.credits_shared,
-            shared_at=credit_distribution.shared_at
-        )
+        return model_response(CreditDistributionResponse.from_orm_fast(credit_distribution), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -432,21 +284,20 @@ def get_all_credit_distributions(
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
     distributions = credit_service.get_all_distributions(skip, limit)
-    return [
-        CreditDistributionResponse(
-            distribution_id=distribution.distribution_id,
-            from_reseller_id=distribution.from_reseller_id,
-            to_business_user_id=distribution.to_business_user_id,
-            credits_shared=distribution.credits_shared,
-            shared_at=distribution.shared_at
-        ) for distribution in distributions
-    ]
+    return distribution_list_response(distributions)
 
 @app.get("/credit-distributions/{distribution_id}", response_model=CreditDistributionResponse)
 def get_credit_distribution(
     distribution_id: str,
+    request: Request,
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and is_not_modified(if_modified_since, credit_service.get_distribution_shared_at(distribution_id)):
+        not_modified = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+        set_cache_headers(not_modified)
+        return not_modified
+    
     distribution = credit_service.get_distribution_by_id(distribution_id)
     if not distribution:
         raise HTTPException(
@@ -454,13 +305,9 @@ def get_credit_distribution(
             detail="Credit distribution not found"
         )
     
-    return CreditDistributionResponse(
-        distribution_id=distribution.distribution_id,
-        from_reseller_id=distribution.from_reseller_id,
-        to_business_user_id=distribution.to_business_user_id,
-        credits_shared=distribution.credits_shared,
-        shared_at=distribution.shared_at
-    )
+    distribution_response = model_response(CreditDistributionResponse.from_orm_fast(distribution))
+    set_cache_headers(distribution_response, distribution.shared_at)
+    return distribution_response
 
 @app.get("/resellers/{reseller_id}/credit-distributions/", response_model=List[CreditDistributionResponse])
 def get_credit_distributions_by_reseller(
@@ -470,15 +317,7 @@ def get_credit_distributions_by_reseller(
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
     distributions = credit_service.get_distributions_by_reseller(reseller_id, skip, limit)
-    return [
-        CreditDistributionResponse(
-            distribution_id=distribution.distribution_id,
-            from_reseller_id=distribution.from_reseller_id,
-            to_business_user_id=distribution.to_business_user_id,
-            credits_shared=distribution.credits_shared,
-            shared_at=distribution.shared_at
-        ) for distribution in distributions
-    ]
+    return distribution_list_response(distributions)
 
 @app.get("/business-owners/{business_user_id}/credit-distributions/", response_model=List[CreditDistributionResponse])
 def get_credit_distributions_by_business_owner(
@@ -488,19 +327,12 @@ def get_credit_distributions_by_business_owner(
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
     distributions = credit_service.get_distributions_by_business_owner(business_user_id, skip, limit)
-    return [
-        CreditDistributionResponse(
-            distribution_id=distribution.distribution_id,
-            from_reseller_id=distribution.from_reseller_id,
-            to_business_user_id=distribution.to_business_user_id,
-            credits_shared=distribution.credits_shared,
-            shared_at=distribution.shared_at
-        ) for distribution in distributions
-    ]
+    return distribution_list_response(distributions)
 
 @app.get("/resellers/{reseller_id}/credit-stats/", response_model=ResellerCreditStats)
 def get_reseller_credit_stats(
     reseller_id: str,
+    response: Response,
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
     stats = credit_service.get_reseller_credit_stats(reseller_id)
@@ -510,11 +342,13 @@ def get_reseller_credit_stats(
             detail="Reseller not found"
         )
     
+    set_cache_headers(response)
     return ResellerCreditStats(**stats)
 
 @app.get("/business-owners/{business_user_id}/credit-stats/", response_model=BusinessOwnerCreditStats)
 def get_business_owner_credit_stats(
     business_user_id: str,
+    response: Response,
     credit_service: CreditDistributionService = Depends(get_credit_distribution_service)
 ):
     stats = credit_service.get_business_owner_credit_stats(business_user_id)
@@ -524,6 +358,7 @@ def get_business_owner_credit_stats(
             detail="Business owner not found"
         )
     
+    set_cache_headers(response)
     return BusinessOwnerCreditStats(**stats)
 
 @app.get("/credit-distributions/summary/")
@@ -540,26 +375,7 @@ def create_message(
 ):
     try:
         db_message = message_service.create_message(message)
-        return MessageResponse(
-            message_id=db_message.message_id,
-            user_id=db_message.user_id,
-            channel=db_message.channel,
-            mode=db_message.mode,
-            sender_number=db_message.sender_number,
-            receiver_number=db_message.receiver_number,
-            message_type=db_message.message_type,
-            template_name=db_message.template_name,
-            message_body=db_message.message_body,
-            status=db_message.status,
-            credits_used=db_message.credits_used,
-            sent_at=db_message.sent_at,
-            delivered_at=db_message.delivered_at,
-            read_at=db_message.read_at,
-            error_message=db_message.error_message,
-            external_message_id=db_message.external_message_id,
-            retry_count=db_message.retry_count,
-            max_retries=db_message.max_retries
-        )
+        return model_response(MessageResponse.from_orm_fast(db_message), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -574,26 +390,7 @@ def send_message(
 ):
     try:
         db_message = message_service.send_message(user_id, message_request)
-        return MessageResponse(
-            message_id=db_message.message_id,
-            user_id=db_message.user_id,
-            channel=db_message.channel,
-            mode=db_message.mode,
-            sender_number=db_message.sender_number,
-            receiver_number=db_message.receiver_number,
-            message_type=db_message.message_type,
-            template_name=db_message.template_name,
-            message_body=db_message.message_body,
-            status=db_message.status,
-            credits_used=db_message.credits_used,
-            sent_at=db_message.sent_at,
-            delivered_at=db_message.delivered_at,
-            read_at=db_message.read_at,
-            error_message=db_message.error_message,
-            external_message_id=db_message.external_message_id,
-            retry_count=db_message.retry_count,
-            max_retries=db_message.max_retries
-        )
+        return model_response(MessageResponse.from_orm_fast(db_message), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -608,28 +405,7 @@ def send_bulk_messages(
 ):
     try:
         messages = message_service.send_bulk_messages(user_id, bulk_request)
-        return [
-            MessageResponse(
-                message_id=msg.message_id,
-                user_id=msg.user_id,
-                channel=msg.channel,
-                mode=msg.mode,
-                sender_number=msg.sender_number,
-                receiver_number=msg.receiver_number,
-                message_type=msg.message_type,
-                template_name=msg.template_name,
-                message_body=msg.message_body,
-                status=msg.status,
-                credits_used=msg.credits_used,
-                sent_at=msg.sent_at,
-                delivered_at=msg.delivered_at,
-                read_at=msg.read_at,
-                error_message=msg.error_message,
-                external_message_id=msg.external_message_id,
-                retry_count=msg.retry_count,
-                max_retries=msg.max_retries
-            ) for msg in messages
-        ]
+        return message_list_response(messages)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -643,28 +419,7 @@ def get_all_messages(
     message_service: MessageService = Depends(get_message_service)
 ):
     messages = message_service.get_all_messages(skip, limit)
-    return [
-        MessageResponse(
-            message_id=msg.message_id,
-            user_id=msg.user_id,
-            channel=msg.channel,
-            mode=msg.mode,
-            sender_number=msg.sender_number,
-            receiver_number=msg.receiver_number,
-            message_type=msg.message_type,
-            template_name=msg.template_name,
-            message_body=msg.message_body,
-            status=msg.status,
-            credits_used=msg.credits_used,
-            sent_at=msg.sent_at,
-            delivered_at=msg.delivered_at,
-            read_at=msg.read_at,
-            error_message=msg.error_message,
-            external_message_id=msg.external_message_id,
-            retry_count=msg.retry_count,
-            max_retries=msg.max_retries
-        ) for msg in messages
-    ]
+    return message_list_response(messages)
 
 @app.get("/messages/{message_id}", response_model=MessageResponse)
 def get_message(
@@ -678,26 +433,7 @@ def get_message(
             detail="Message not found"
         )
     
-    return MessageResponse(
-        message_id=message.message_id,
-        user_id=message.user_id,
-        channel=message.channel,
-        mode=message.mode,
-        sender_number=message.sender_number,
-        receiver_number=message.receiver_number,
-        message_type=message.message_type,
-        template_name=message.template_name,
-        message_body=message.message_body,
-        status=message.status,
-        credits_used=message.credits_used,
-        sent_at=message.sent_at,
-        delivered_at=message.delivered_at,
-        read_at=message.read_at,
-        error_message=message.error_message,
-        external_message_id=message.external_message_id,
-        retry_count=message.retry_count,
-        max_retries=message.max_retries
-    )
+    return model_response(MessageResponse.from_orm_fast(message))
 
 @app.get("/users/{user_id}/messages/", response_model=List[MessageResponse])
 def get_user_messages(
@@ -707,28 +443,7 @@ def get_user_messages(
     message_service: MessageService = Depends(get_message_service)
 ):
     messages = message_service.get_messages_by_user(user_id, skip, limit)
-    return [
-        MessageResponse(
-            message_id=msg.message_id,
-            user_id=msg.user_id,
-            channel=msg.channel,
-            mode=msg.mode,
-            sender_number=msg.sender_number,
-            receiver_number=msg.receiver_number,
-            message_type=msg.message_type,
-            template_name=msg.template_name,
-            message_body=msg.message_body,
-            status=msg.status,
-            credits_used=msg.credits_used,
-            sent_at=msg.sent_at,
-            delivered_at=msg.delivered_at,
-            read_at=msg.read_at,
-            error_message=msg.error_message,
-            external_message_id=msg.external_message_id,
-            retry_count=msg.retry_count,
-            max_retries=msg.max_retries
-        ) for msg in messages
-    ]
+    return message_list_response(messages)
 
 @app.get("/messages/status/{status}", response_model=List[MessageResponse])
 def get_messages_by_status(
@@ -738,28 +453,7 @@ def get_messages_by_status(
     message_service: MessageService = Depends(get_message_service)
 ):
     messages = message_service.get_messages_by_status(status, skip, limit)
-    return [
-        MessageResponse(
-            message_id=msg.message_id,
-            user_id=msg.user_id,
-            channel=msg.channel,
-            mode=msg.mode,
-            sender_number=msg.sender_number,
-            receiver_number=msg.receiver_number,
-            message_type=msg.message_type,
-            template_name=msg.template_name,
-            message_body=msg.message_body,
-            status=msg.status,
-            credits_used=msg.credits_used,
-            sent_at=msg.sent_at,
-            delivered_at=msg.delivered_at,
-            read_at=msg.read_at,
-            error_message=msg.error_message,
-            external_message_id=msg.external_message_id,
-            retry_count=msg.retry_count,
-            max_retries=msg.max_retries
-        ) for msg in messages
-    ]
+    return message_list_response(messages)
 
 @app.post("/messages/retry-failed/")
 def retry_failed_messages(
@@ -791,7 +485,7 @@ def process_whatsapp_webhook(
     webhook_data: WebhookPayload,
     message_service: MessageService = Depends(get_message_service)
 ):
-    message = message_service.process_webhook(message_id, webhook_data.dict())
+    message = message_service.process_webhook(message_id, webhook_data.model_dump())
     if not message:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -808,39 +502,7 @@ def create_unofficial_device(
 ):
     try:
         db_device = device_service.create_device(device)
-        return UnofficialDeviceResponse(
-            device_id=db_device.device_id,
-            user_id=db_device.user_id,
-            device_name=db_device.device_name,
-            device_type=db_device.device_type,
-            device_os=db_device.device_os,
-            browser_info=db_device.browser_info,
-            session_status=db_device.session_status,
-            qr_code_data=db_device.qr_code_data,
-            qr_last_generated=db_device.qr_last_generated,
-            qr_expires_at=db_device.qr_expires_at,
-            ip_address=db_device.ip_address,
-            user_agent=db_device.user_agent,
-            connection_string=db_device.connection_string,
-            last_active=db_device.last_active,
-            last_message_sent=db_device.last_message_sent,
-            last_message_received=db_device.last_message_received,
-            messages_sent=db_device.messages_sent,
-            messages_received=db_device.messages_received,
-            total_activity_time=db_device.total_activity_time,
-            is_active=db_device.is_active,
-            max_daily_messages=db_device.max_daily_messages,
-            daily_message_count=db_device.daily_message_count,
-            last_reset_date=db_device.last_reset_date,
-            last_error=db_device.last_error,
-            error_count=db_device.error_count,
-            reconnect_attempts=db_device.reconnect_attempts,
-            max_reconnect_attempts=db_device.max_reconnect_attempts,
-            created_at=db_device.created_at,
-            updated_at=db_device.updated_at,
-            last_connected_at=db_device.last_connected_at,
-            last_disconnected_at=db_device.last_disconnected_at
-        )
+        return model_response(UnofficialDeviceResponse.from_orm_fast(db_device), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -854,41 +516,7 @@ def get_all_unofficial_devices(
     device_service: UnofficialDeviceService = Depends(get_unofficial_device_service)
 ):
     devices = device_service.get_all_devices(skip, limit)
-    return [
-        UnofficialDeviceResponse(
-            device_id=device.device_id,
-            user_id=device.user_id,
-            device_name=device.device_name,
-            device_type=device.device_type,
-            device_os=device.device_os,
-            browser_info=device.browser_info,
-            session_status=device.session_status,
-            qr_code_data=device.qr_code_data,
-            qr_last_generated=device.qr_last_generated,
-            qr_expires_at=device.qr_expires_at,
-            ip_address=device.ip_address,
-            user_agent=device.user_agent,
-            connection_string=device.connection_string,
-            last_active=device.last_active,
-            last_message_sent=device.last_message_sent,
-            last_message_received=device.last_message_received,
-            messages_sent=device.messages_sent,
-            messages_received=device.messages_received,
-            total_activity_time=device.total_activity_time,
-            is_active=device.is_active,
-            max_daily_messages=device.max_daily_messages,
-            daily_message_count=device.daily_message_count,
-            last_reset_date=device.last_reset_date,
-            last_error=device.last_error,
-            error_count=device.error_count,
-            reconnect_attempts=device.reconnect_attempts,
-            max_reconnect_attempts=device.max_reconnect_attempts,
-            created_at=device.created_at,
-            updated_at=device.updated_at,
-            last_connected_at=device.last_connected_at,
-            last_disconnected_at=device.last_disconnected_at
-        ) for device in devices
-    ]
+    return device_list_response(devices)
 
 @app.get("/unofficial-devices/{device_id}", response_model=UnofficialDeviceResponse)
 def get_unofficial_device(
@@ -902,39 +530,7 @@ def get_unofficial_device(
             detail="Device not found"
         )
     
-    return UnofficialDeviceResponse(
-        device_id=device.device_id,
-        user_id=device.user_id,
-        device_name=device.device_name,
-        device_type=device.device_type,
-        device_os=device.device_os,
-        browser_info=device.browser_info,
-        session_status=device.session_status,
-        qr_code_data=device.qr_code_data,
-        qr_last_generated=device.qr_last_generated,
-        qr_expires_at=device.qr_expires_at,
-        ip_address=device.ip_address,
-        user_agent=device.user_agent,
-        connection_string=device.connection_string,
-        last_active=device.last_active,
-        last_message_sent=device.last_message_sent,
-        last_message_received=device.last_message_received,
-        messages_sent=device.messages_sent,
-        messages_received=device.messages_received,
-        total_activity_time=device.total_activity_time,
-        is_active=device.is_active,
-        max_daily_messages=device.max_daily_messages,
-        daily_message_count=device.daily_message_count,
-        last_reset_date=device.last_reset_date,
-        last_error=device.last_error,
-        error_count=device.error_count,
-        reconnect_attempts=device.reconnect_attempts,
-        max_reconnect_attempts=device.max_reconnect_attempts,
-        created_at=device.created_at,
-        updated_at=device.updated_at,
-        last_connected_at=device.last_connected_at,
-        last_disconnected_at=device.last_disconnected_at
-    )
+    return model_response(UnofficialDeviceResponse.from_orm_fast(device))
 
 @app.get("/users/{user_id}/unofficial-devices/", response_model=List[UnofficialDeviceResponse])
 def get_user_unofficial_devices(
@@ -944,41 +540,7 @@ def get_user_unofficial_devices(
     device_service: UnofficialDeviceService = Depends(get_unofficial_device_service)
 ):
     devices = device_service.get_devices_by_user(user_id, skip, limit)
-    return [
-        UnofficialDeviceResponse(
-            device_id=device.device_id,
-            user_id=device.user_id,
-            device_name=device.device_name,
-            device_type=device.device_type,
-            device_os=device.device_os,
-            browser_info=device.browser_info,
-            session_status=device.session_status,
-            qr_code_data=device.qr_code_data,
-            qr_last_generated=device.qr_last_generated,
-            qr_expires_at=device.qr_expires_at,
-            ip_address=device.ip_address,
-            user_agent=device.user_agent,
-            connection_string=device.connection_string,
-            last_active=device.last_active,
-            last_message_sent=device.last_message_sent,
-            last_message_received=device.last_message_received,
-            messages_sent=device.messages_sent,
-            messages_received=device.messages_received,
-            total_activity_time=device.total_activity_time,
-            is_active=device.is_active,
-            max_daily_messages=device.max_daily_messages,
-            daily_message_count=device.daily_message_count,
-            last_reset_date=device.last_reset_date,
-            last_error=device.last_error,
-            error_count=device.error_count,
-            reconnect_attempts=device.reconnect_attempts,
-            max_reconnect_attempts=device.max_reconnect_attempts,
-            created_at=device.created_at,
-            updated_at=device.updated_at,
-            last_connected_at=device.last_connected_at,
-            last_disconnected_at=device.last_disconnected_at
-        ) for device in devices
-    ]
+    return device_list_response(devices)
 
 @app.put("/unofficial-devices/{device_id}", response_model=UnofficialDeviceResponse)
 def update_unofficial_device(
@@ -993,39 +555,7 @@ def update_unofficial_device(
             detail="Device not found"
         )
     
-    return UnofficialDeviceResponse(
-        device_id=device.device_id,
-        user_id=device.user_id,
-        device_name=device.device_name,
-        device_type=device.device_type,
-        device_os=device.device_os,
-        browser_info=device.browser_info,
-        session_status=device.session_status,
-        qr_code_data=device.qr_code_data,
-        qr_last_generated=device.qr_last_generated,
-        qr_expires_at=device.qr_expires_at,
-        ip_address=device.ip_address,
-        user_agent=device.user_agent,
-        connection_string=device.connection_string,
-        last_active=device.last_active,
-        last_message_sent=device.last_message_sent,
-        last_message_received=device.last_message_received,
-        messages_sent=device.messages_sent,
-        messages_received=device.messages_received,
-        total_activity_time=device.total_activity_time,
-        is_active=device.is_active,
-        max_daily_messages=device.max_daily_messages,
-        daily_message_count=device.daily_message_count,
-        last_reset_date=device.last_reset_date,
-        last_error=device.last_error,
-        error_count=device.error_count,
-        reconnect_attempts=device.reconnect_attempts,
-        max_reconnect_attempts=device.max_reconnect_attempts,
-        created_at=device.created_at,
-        updated_at=device.updated_at,
-        last_connected_at=device.last_connected_at,
-        last_disconnected_at=device.last_disconnected_at
-    )
+    return model_response(UnofficialDeviceResponse.from_orm_fast(device))
 
 @app.delete("/unofficial-devices/{device_id}")
 def delete_unofficial_device(
@@ -1048,7 +578,7 @@ def generate_device_qr_code(
     device_service: UnofficialDeviceService = Depends(get_unofficial_device_service)
 ):
     try:
-        return device_service.generate_qr_code(device_id, regenerate)
+        return model_response(device_service.generate_qr_code(device_id, regenerate))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1101,7 +631,7 @@ def get_device_stats(
     device_service: UnofficialDeviceService = Depends(get_unofficial_device_service)
 ):
     try:
-        return device_service.get_device_stats(device_id)
+        return model_response(device_service.get_device_stats(device_id))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -1149,7 +679,7 @@ def create_usage_log(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     try:
-        return usage_service.create_usage_log(usage_request)
+        return model_response(usage_service.create_usage_log(usage_request), status.HTTP_201_CREATED)
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1161,6 +691,7 @@ def get_usage_logs(
     skip: int = 0,
     limit: int = 100,
     user_id: Optional[str] = None,
+    reseller_id: Optional[str] = None,
     device_id: Optional[str] = None,
     session_id: Optional[str] = None,
     message_id: Optional[str] = None,
@@ -1173,51 +704,18 @@ def get_usage_logs(
     # Build filter
     filters = UsageFilter(
         user_id=user_id,
+        reseller_id=reseller_id,
         device_id=device_id,
         session_id=session_id,
         message_id=message_id,
-        usage_type=UsageType(usage_type) if usage_type else None,
-        status=UsageStatus(status) if status else None,
+        usage_type=usage_type or None,
+        status=status or None,
         start_date=start_date,
         end_date=end_date
     )
     
     usage_logs = usage_service.get_usage_logs(skip, limit, filters)
-    return [
-        MessageUsageLogResponse(
-            usage_id=log.usage_id,
-            user_id=log.user_id,
-            message_id=log.message_id,
-            device_id=log.device_id,
-            session_id=log.session_id,
-            usage_type=log.usage_type,
-            credits_deducted=log.credits_deducted,
-            credits_refunded=log.credits_refunded,
-            net_credits=log.net_credits,
-            balance_before=log.balance_before,
-            balance_after=log.balance_after,
-            cost_per_credit=float(log.cost_per_credit),
-            total_cost=float(log.total_cost),
-            currency=log.currency,
-            message_type=log.message_type,
-            message_size=log.message_size,
-            recipient_count=log.recipient_count,
-            delivery_status=log.delivery_status,
-            status=log.status,
-            error_code=log.error_code,
-            error_message=log.error_message,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            api_endpoint=log.api_endpoint,
-            request_id=log.request_id,
-            refund_reason=log.refund_reason,
-            refund_timestamp=log.refund_timestamp,
-            refund_processed_by=log.refund_processed_by,
-            created_at=log.created_at,
-            updated_at=log.updated_at,
-            processed_at=log.processed_at
-        ) for log in usage_logs
-    ]
+    return usage_log_list_response(usage_logs)
 
 @app.get("/usage-logs/{usage_id}", response_model=MessageUsageLogResponse)
 def get_usage_log(
@@ -1231,39 +729,7 @@ def get_usage_log(
             detail="Usage log not found"
         )
     
-    return MessageUsageLogResponse(
-        usage_id=usage_log.usage_id,
-        user_id=usage_log.user_id,
-        message_id=usage_log.message_id,
-        device_id=usage_log.device_id,
-        session_id=usage_log.session_id,
-        usage_type=usage_log.usage_type,
-        credits_deducted=usage_log.credits_deducted,
-        credits_refunded=usage_log.credits_refunded,
-        net_credits=usage_log.net_credits,
-        balance_before=usage_log.balance_before,
-        balance_after=usage_log.balance_after,
-        cost_per_credit=float(usage_log.cost_per_credit),
-        total_cost=float(usage_log.total_cost),
-        currency=usage_log.currency,
-        message_type=usage_log.message_type,
-        message_size=usage_log.message_size,
-        recipient_count=usage_log.recipient_count,
-        delivery_status=usage_log.delivery_status,
-        status=usage_log.status,
-        error_code=usage_log.error_code,
-        error_message=usage_log.error_message,
-        ip_address=usage_log.ip_address,
-        user_agent=usage_log.user_agent,
-        api_endpoint=usage_log.api_endpoint,
-        request_id=usage_log.request_id,
-        refund_reason=usage_log.refund_reason,
-        refund_timestamp=usage_log.refund_timestamp,
-        refund_processed_by=usage_log.refund_processed_by,
-        created_at=usage_log.created_at,
-        updated_at=usage_log.updated_at,
-        processed_at=usage_log.processed_at
-    )
+    return model_response(usage_log_response(usage_log))
 
 @app.get("/users/{user_id}/usage-logs/", response_model=List[MessageUsageLogResponse])
 def get_user_usage_logs(
@@ -1273,41 +739,16 @@ def get_user_usage_logs(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     usage_logs = usage_service.get_user_usage_logs(user_id, skip, limit)
-    return [
-        MessageUsageLogResponse(
-            usage_id=log.usage_id,
-            user_id=log.user_id,
-            message_id=log.message_id,
-            device_id=log.device_id,
-            session_id=log.session_id,
-            usage_type=log.usage_type,
-            credits_deducted=log.credits_deducted,
-            credits_refunded=log.credits_refunded,
-            net_credits=log.net_credits,
-            balance_before=log.balance_before,
-            balance_after=log.balance_after,
-            cost_per_credit=float(log.cost_per_credit),
-            total_cost=float(log.total_cost),
-            currency=log.currency,
-            message_type=log.message_type,
-            message_size=log.message_size,
-            recipient_count=log.recipient_count,
-            delivery_status=log.delivery_status,
-            status=log.status,
-            error_code=log.error_code,
-            error_message=log.error_message,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            api_endpoint=log.api_endpoint,
-            request_id=log.request_id,
-            refund_reason=log.refund_reason,
-            refund_timestamp=log.refund_timestamp,
-            refund_processed_by=log.refund_processed_by,
-            created_at=log.created_at,
-            updated_at=log.updated_at,
-            processed_at=log.processed_at
-        ) for log in usage_logs
-    ]
+    return usage_log_list_response(usage_logs)
+
+@app.get("/users/{user_id}/usage-summaries/", response_model=List[UsageSummary])
+def get_user_usage_summaries(
+    user_id: str,
+    skip: int = 0,
+    limit: int = 100,
+    usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
+):
+    return usage_summary_list_response(usage_service.get_user_usage_summaries(user_id, skip, limit))
 
 @app.get("/devices/{device_id}/usage-logs/", response_model=List[MessageUsageLogResponse])
 def get_device_usage_logs(
@@ -1317,41 +758,7 @@ def get_device_usage_logs(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     usage_logs = usage_service.get_device_usage_logs(device_id, skip, limit)
-    return [
-        MessageUsageLogResponse(
-            usage_id=log.usage_id,
-            user_id=log.user_id,
-            message_id=log.message_id,
-            device_id=log.device_id,
-            session_id=log.session_id,
-            usage_type=log.usage_type,
-            credits_deducted=log.credits_deducted,
-            credits_refunded=log.credits_refunded,
-            net_credits=log.net_credits,
-            balance_before=log.balance_before,
-            balance_after=log.balance_after,
-            cost_per_credit=float(log.cost_per_credit),
-            total_cost=float(log.total_cost),
-            currency=log.currency,
-            message_type=log.message_type,
-            message_size=log.message_size,
-            recipient_count=log.recipient_count,
-            delivery_status=log.delivery_status,
-            status=log.status,
-            error_code=log.error_code,
-            error_message=log.error_message,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            api_endpoint=log.api_endpoint,
-            request_id=log.request_id,
-            refund_reason=log.refund_reason,
-            refund_timestamp=log.refund_timestamp,
-            refund_processed_by=log.refund_processed_by,
-            created_at=log.created_at,
-            updated_at=log.updated_at,
-            processed_at=log.processed_at
-        ) for log in usage_logs
-    ]
+    return usage_log_list_response(usage_logs)
 
 @app.get("/sessions/{session_id}/usage-logs/", response_model=List[MessageUsageLogResponse])
 def get_session_usage_logs(
@@ -1361,41 +768,7 @@ def get_session_usage_logs(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     usage_logs = usage_service.get_session_usage_logs(session_id, skip, limit)
-    return [
-        MessageUsageLogResponse(
-            usage_id=log.usage_id,
-            user_id=log.user_id,
-            message_id=log.message_id,
-            device_id=log.device_id,
-            session_id=log.session_id,
-            usage_type=log.usage_type,
-            credits_deducted=log.credits_deducted,
-            credits_refunded=log.credits_refunded,
-            net_credits=log.net_credits,
-            balance_before=log.balance_before,
-            balance_after=log.balance_after,
-            cost_per_credit=float(log.cost_per_credit),
-            total_cost=float(log.total_cost),
-            currency=log.currency,
-            message_type=log.message_type,
-            message_size=log.message_size,
-            recipient_count=log.recipient_count,
-            delivery_status=log.delivery_status,
-            status=log.status,
-            error_code=log.error_code,
-            error_message=log.error_message,
-            ip_address=log.ip_address,
-            user_agent=log.user_agent,
-            api_endpoint=log.api_endpoint,
-            request_id=log.request_id,
-            refund_reason=log.refund_reason,
-            refund_timestamp=log.refund_timestamp,
-            refund_processed_by=log.refund_processed_by,
-            created_at=log.created_at,
-            updated_at=log.updated_at,
-            processed_at=log.processed_at
-        ) for log in usage_logs
-    ]
+    return usage_log_list_response(usage_logs)
 
 @app.put("/usage-logs/{usage_id}", response_model=MessageUsageLogResponse)
 def update_usage_log(
@@ -1403,46 +776,20 @@ def update_usage_log(
     update_data: MessageUsageLogUpdate,
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
-    usage_log = usage_service.update_usage_log(usage_id, update_data)
+    try:
+        usage_log = usage_service.update_usage_log(usage_id, update_data)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     if not usage_log:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Usage log not found"
         )
     
-    return MessageUsageLogResponse(
-        usage_id=usage_log.usage_id,
-        user_id=usage_log.user_id,
-        message_id=usage_log.message_id,
-        device_id=usage_log.device_id,
-        session_id=usage_log.session_id,
-        usage_type=usage_log.usage_type,
-        credits_deducted=usage_log.credits_deducted,
-        credits_refunded=usage_log.credits_refunded,
-        net_credits=usage_log.net_credits,
-        balance_before=usage_log.balance_before,
-        balance_after=usage_log.balance_after,
-        cost_per_credit=float(usage_log.cost_per_credit),
-        total_cost=float(usage_log.total_cost),
-        currency=usage_log.currency,
-        message_type=usage_log.message_type,
-        message_size=usage_log.message_size,
-        recipient_count=usage_log.recipient_count,
-        delivery_status=usage_log.delivery_status,
-        status=usage_log.status,
-        error_code=usage_log.error_code,
-        error_message=usage_log.error_message,
-        ip_address=usage_log.ip_address,
-        user_agent=usage_log.user_agent,
-        api_endpoint=usage_log.api_endpoint,
-        request_id=usage_log.request_id,
-        refund_reason=usage_log.refund_reason,
-        refund_timestamp=usage_log.refund_timestamp,
-        refund_processed_by=usage_log.refund_processed_by,
-        created_at=usage_log.created_at,
-        updated_at=usage_log.updated_at,
-        processed_at=usage_log.processed_at
-    )
+    return model_response(usage_log_response(usage_log))
 
 @app.post("/usage-logs/refund/", response_model=UsageLogRefundResponse)
 def refund_usage_log(
@@ -1450,7 +797,7 @@ def refund_usage_log(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     try:
-        return usage_service.refund_usage_log(refund_request)
+        return model_response(usage_service.refund_usage_log(refund_request))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1463,7 +810,7 @@ def mark_usage_failed(
     usage_service: MessageUsageLogService = Depends(get_message_usage_log_service)
 ):
     try:
-        return usage_service.mark_usage_failed(update_request)
+        return model_response(usage_service.mark_usage_failed(update_request))
     except ValueError as e:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -1473,6 +820,7 @@ def mark_usage_failed(
 @app.get("/usage-logs/stats/", response_model=UsageStats)
 def get_usage_stats(
     user_id: Optional[str] = None,
+    reseller_id: Optional[str] = None,
     device_id: Optional[str] = None,
     session_id: Optional[str] = None,
     usage_type: Optional[str] = None,
@@ -1484,10 +832,11 @@ def get_usage_stats(
     # Build filter
     filters = UsageFilter(
         user_id=user_id,
+        reseller_id=reseller_id,
         device_id=device_id,
         session_id=session_id,
-        usage_type=UsageType(usage_type) if usage_type else None,
-        status=UsageStatus(status) if status else None,
+        usage_type=usage_type or None,
+        status=status or None,
         start_date=start_date,
         end_date=end_date
     )
@@ -1518,4 +867,9 @@ def get_session_usage_stats(
     return usage_service.get_session_usage_stats(session_id)
 
 if __name__ == "__main__":
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # `python -m main init-db` creates the tables once; table creation no longer runs on import
+    if len(sys.argv) > 1 and sys.argv[1] == "init-db":
+        init_db()
+        print("Database tables created")
+    else:
+        uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
@@ -9,9 +9,9 @@ security = HTTPBearer()
 
 def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db),
-    user_service: UserService = Depends(lambda db: UserService(db))
+    db: Session = Depends(get_db)
 ):
+    user_service = UserService(db)
     token = credentials.credentials
     payload = verify_token(token)
     
@@ -0,0 +1,39 @@
+"""add users (parent_reseller_id, role) index
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_users_reseller_role",
+            "users",
+            ["parent_reseller_id", "role"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_users_reseller_role",
+            table_name="users",
+            postgresql_concurrently=True,
+        )
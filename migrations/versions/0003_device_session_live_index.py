@@ -0,0 +1,39 @@
+"""add device_sessions (device_id, is_valid, is_active, expires_at) index
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 12:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0003'
+down_revision: Union[str, None] = '0002'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_dsession_live",
+            "device_sessions",
+            ["device_id", "is_valid", "is_active", "expires_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_dsession_live",
+            table_name="device_sessions",
+            postgresql_concurrently=True,
+        )
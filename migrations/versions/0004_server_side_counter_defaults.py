@@ -0,0 +1,50 @@
+"""server-side integer defaults for message and device session counters
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+DEFAULTS = {
+    "messages": {"credits_used": "1", "retry_count": "0", "max_retries": "3"},
+    "device_sessions": {
+        "login_attempts": "0",
+        "max_login_attempts": "5",
+        "total_requests": "0",
+        "messages_sent_via_session": "0",
+    },
+}
+
+
+def upgrade() -> None:
+    for table, columns in DEFAULTS.items():
+        # Backfill NULLs before the columns become NOT NULL
+        for column, default in columns.items():
+            op.execute(f"UPDATE {table} SET {column} = {default} WHERE {column} IS NULL")
+        with op.batch_alter_table(table) as batch_op:
+            for column, default in columns.items():
+                batch_op.alter_column(
+                    column,
+                    existing_type=sa.Integer(),
+                    nullable=False,
+                    server_default=sa.text(default),
+                )
+
+
+def downgrade() -> None:
+    for table, columns in DEFAULTS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.Integer(), nullable=True, server_default=None)
@@ -0,0 +1,42 @@
+"""server-side timestamp defaults for users, devices, usage logs and analytics
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-16 12:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from db.functions import utcnow
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = {
+    "users": ["created_at", "updated_at"],
+    "unofficial_linked_devices": ["last_active", "last_reset_date", "created_at", "updated_at"],
+    "message_usage_logs": ["created_at", "updated_at"],
+    "reseller_analytics": ["created_at", "updated_at"],
+    "business_user_analytics": ["created_at", "updated_at"],
+}
+
+
+def upgrade() -> None:
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.DateTime(), server_default=utcnow())
+
+
+def downgrade() -> None:
+    for table, columns in COLUMNS.items():
+        with op.batch_alter_table(table) as batch_op:
+            for column in columns:
+                batch_op.alter_column(column, existing_type=sa.DateTime(), server_default=None)
@@ -0,0 +1,70 @@
+"""reseller_analytics_mv materialized view (PostgreSQL only)
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 12:50:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Other databases keep loading business user stats through the ORM
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("""
+        CREATE MATERIALIZED VIEW reseller_analytics_mv AS
+        SELECT
+            ra.analytics_id,
+            ra.reseller_id,
+            ra.analytics_period,
+            ra.period_start,
+            COALESCE(
+                JSON_AGG(
+                    JSON_BUILD_OBJECT(
+                        'user_id', b.user_id,
+                        'business_name', u.business_name,
+                        'credits_allocated', b.credits_allocated,
+                        'credits_used', b.credits_used,
+                        'credits_remaining', b.credits_remaining,
+                        'messages_sent', b.messages_sent,
+                        'messages_delivered', b.messages_delivered,
+                        'messages_failed', b.messages_failed,
+                        'active_devices', b.active_devices,
+                        'total_devices', b.total_devices,
+                        'active_sessions', b.active_sessions,
+                        'total_sessions', b.total_sessions,
+                        'revenue_generated', b.revenue_generated,
+                        'period_start', b.period_start,
+                        'period_end', b.period_end
+                    ) ORDER BY b.user_id
+                ) FILTER (WHERE b.stat_id IS NOT NULL),
+                '[]'
+            ) AS business_user_stats
+        FROM reseller_analytics ra
+        LEFT JOIN business_user_analytics b ON b.reseller_analytics_id = ra.analytics_id
+        LEFT JOIN users u ON u.user_id = b.user_id
+        GROUP BY ra.analytics_id
+    """)
+    # A unique index is required for REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute("CREATE UNIQUE INDEX ix_reseller_analytics_mv_id ON reseller_analytics_mv (analytics_id)")
+    op.execute(
+        "CREATE INDEX ix_reseller_analytics_mv_lookup "
+        "ON reseller_analytics_mv (reseller_id, analytics_period, period_start)"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS reseller_analytics_mv")
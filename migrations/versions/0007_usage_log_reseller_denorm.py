@@ -0,0 +1,40 @@
+"""denormalize reseller_id and business_name onto message_usage_logs
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.add_column(sa.Column("reseller_id", sa.String(), nullable=True))
+        batch_op.add_column(sa.Column("business_name", sa.String(), nullable=True))
+
+    # Backfill from the owning user rows
+    op.execute("""
+        UPDATE message_usage_logs SET
+            reseller_id = (SELECT users.parent_reseller_id FROM users WHERE users.user_id = message_usage_logs.user_id),
+            business_name = (SELECT users.business_name FROM users WHERE users.user_id = message_usage_logs.user_id)
+    """)
+
+    op.create_index("ix_usage_reseller_created", "message_usage_logs", ["reseller_id", "created_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_reseller_created", table_name="message_usage_logs")
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.drop_column("business_name")
+        batch_op.drop_column("reseller_id")
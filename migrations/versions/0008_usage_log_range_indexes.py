@@ -0,0 +1,44 @@
+"""composite range-scan indexes on message_usage_logs
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 13:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0008'
+down_revision: Union[str, None] = '0007'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_usage_user_created",
+            "message_usage_logs",
+            ["user_id", "created_at"],
+            if_not_exists=True,
+            postgresql_include=["credits_deducted", "credits_refunded", "total_cost"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_usage_status_created",
+            "message_usage_logs",
+            ["status", "created_at"],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in ("ix_usage_status_created", "ix_usage_user_created"):
+            op.drop_index(name, table_name="message_usage_logs", postgresql_concurrently=True)
@@ -0,0 +1,62 @@
+"""store message_usage_logs.usage_id as a native UUID
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 13:20:00.000000
+
+"""
+from typing import Sequence, Union
+import uuid
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0009'
+down_revision: Union[str, None] = '0008'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _as_uuid(value: str) -> uuid.UUID:
+    try:
+        return uuid.UUID(value)
+    except ValueError:
+        # Old "usage-xxxxxxxx" IDs are not UUIDs; nothing references them, so they get fresh ones
+        return uuid.uuid4()
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    native = bind.dialect.name == "postgresql"
+    usage_logs = sa.table("message_usage_logs", sa.column("usage_id", sa.String()))
+
+    # Non-native storage is 32 hex characters without dashes
+    updates = []
+    for (old_id,) in bind.execute(sa.select(usage_logs.c.usage_id)):
+        new_uuid = _as_uuid(old_id)
+        new_id = str(new_uuid) if native else new_uuid.hex
+        if new_id != old_id:
+            updates.append({"old_id": old_id, "new_id": new_id})
+    if updates:
+        bind.execute(
+            usage_logs.update()
+            .where(usage_logs.c.usage_id == sa.bindparam("old_id"))
+            .values(usage_id=sa.bindparam("new_id")),
+            updates,
+        )
+
+    if native:
+        op.execute("ALTER TABLE message_usage_logs ALTER COLUMN usage_id TYPE uuid USING usage_id::uuid")
+    else:
+        with op.batch_alter_table("message_usage_logs") as batch_op:
+            batch_op.alter_column("usage_id", existing_type=sa.String(), type_=sa.CHAR(32))
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == "postgresql":
+        op.execute("ALTER TABLE message_usage_logs ALTER COLUMN usage_id TYPE varchar USING usage_id::text")
+    else:
+        with op.batch_alter_table("message_usage_logs") as batch_op:
+            batch_op.alter_column("usage_id", existing_type=sa.CHAR(32), type_=sa.String())
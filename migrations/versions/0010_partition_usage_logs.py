@@ -0,0 +1,99 @@
+"""partition message_usage_logs by month on created_at (PostgreSQL only)
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 13:30:00.000000
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0010'
+down_revision: Union[str, None] = '0009'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Copied from models.usage_log_partitions so later model changes cannot alter this migration
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+FOREIGN_KEYS = {
+    "user_id": "users(user_id)",
+    "message_id": "messages(message_id)",
+    "device_id": "unofficial_linked_devices(device_id)",
+    "session_id": "device_sessions(session_id)",
+}
+
+
+def _create_indexes() -> None:
+    for column in ("user_id", "message_id", "device_id", "session_id"):
+        op.create_index(f"ix_message_usage_logs_{column}", "message_usage_logs", [column])
+    op.create_index(
+        "ix_usage_user_created",
+        "message_usage_logs",
+        ["user_id", "created_at"],
+        postgresql_include=["credits_deducted", "credits_refunded", "total_cost"],
+    )
+    op.create_index("ix_usage_status_created", "message_usage_logs", ["status", "created_at"])
+    op.create_index("ix_usage_reseller_created", "message_usage_logs", ["reseller_id", "created_at"])
+
+
+def _rebuild(partitioned: bool) -> None:
+    """Copy message_usage_logs into a new (partitioned or plain) table and swap it in"""
+    op.execute("UPDATE message_usage_logs SET created_at = TIMEZONE('utc', CURRENT_TIMESTAMP) WHERE created_at IS NULL")
+    partition_clause = " PARTITION BY RANGE (created_at)" if partitioned else ""
+    op.execute(
+        "CREATE TABLE message_usage_logs_new "
+        f"(LIKE message_usage_logs INCLUDING DEFAULTS INCLUDING CONSTRAINTS){partition_clause}"
+    )
+    op.execute("ALTER TABLE message_usage_logs_new ALTER COLUMN created_at SET NOT NULL")
+    primary_key = "usage_id, created_at" if partitioned else "usage_id"
+    op.execute(f"ALTER TABLE message_usage_logs_new ADD PRIMARY KEY ({primary_key})")
+
+    bind = op.get_bind()
+    if partitioned:
+        op.execute("CREATE TABLE message_usage_logs_default PARTITION OF message_usage_logs_new DEFAULT")
+        # Monthly partitions from the oldest row through two months ahead
+        oldest = bind.execute(sa.text("SELECT min(created_at) FROM message_usage_logs")).scalar()
+        current = month_start(datetime.utcnow())
+        month = month_start(oldest) if oldest and oldest < current else current
+        while month <= add_months(current, 2):
+            bind.execute(sa.text(
+                f"CREATE TABLE message_usage_logs_{month:%Y_%m} PARTITION OF message_usage_logs_new "
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{add_months(month, 1):%Y-%m-%d}')"
+            ))
+            month = add_months(month, 1)
+
+    op.execute("INSERT INTO message_usage_logs_new SELECT * FROM message_usage_logs")
+    op.execute("DROP TABLE message_usage_logs")
+    op.execute("ALTER TABLE message_usage_logs_new RENAME TO message_usage_logs")
+    for column, target in FOREIGN_KEYS.items():
+        op.execute(
+            f"ALTER TABLE message_usage_logs ADD CONSTRAINT message_usage_logs_{column}_fkey "
+            f"FOREIGN KEY ({column}) REFERENCES {target}"
+        )
+    _create_indexes()
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(partitioned=True)
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    _rebuild(partitioned=False)
@@ -0,0 +1,68 @@
+"""store message_usage_logs costs as integer millicents
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-16 13:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0011'
+down_revision: Union[str, None] = '0010'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MILLICENTS_PER_UNIT = 100000
+
+
+def _create_user_created_index(cost_column: str) -> None:
+    op.create_index(
+        "ix_usage_user_created",
+        "message_usage_logs",
+        ["user_id", "created_at"],
+        postgresql_include=["credits_deducted", "credits_refunded", cost_column],
+    )
+
+
+def upgrade() -> None:
+    # The covering index INCLUDEs the old cost column
+    op.drop_index("ix_usage_user_created", table_name="message_usage_logs")
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.add_column(sa.Column("cost_per_credit_millicents", sa.BigInteger(), nullable=False, server_default="1000"))
+        batch_op.add_column(sa.Column("total_cost_millicents", sa.BigInteger(), nullable=False, server_default="0"))
+
+    op.execute(f"""
+        UPDATE message_usage_logs SET
+            cost_per_credit_millicents = COALESCE(ROUND(cost_per_credit * {MILLICENTS_PER_UNIT}), 1000),
+            total_cost_millicents = COALESCE(ROUND(total_cost * {MILLICENTS_PER_UNIT}), 0)
+    """)
+
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.alter_column("cost_per_credit_millicents", server_default=None)
+        batch_op.alter_column("total_cost_millicents", server_default=None)
+        batch_op.drop_column("total_cost")
+        batch_op.drop_column("cost_per_credit")
+    _create_user_created_index("total_cost_millicents")
+
+
+def downgrade() -> None:
+    op.drop_index("ix_usage_user_created", table_name="message_usage_logs")
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.add_column(sa.Column("cost_per_credit", sa.Numeric(10, 4), nullable=True))
+        batch_op.add_column(sa.Column("total_cost", sa.Numeric(10, 4), nullable=True))
+
+    op.execute(f"""
+        UPDATE message_usage_logs SET
+            cost_per_credit = cost_per_credit_millicents / {MILLICENTS_PER_UNIT}.0,
+            total_cost = total_cost_millicents / {MILLICENTS_PER_UNIT}.0
+    """)
+
+    with op.batch_alter_table("message_usage_logs") as batch_op:
+        batch_op.drop_column("total_cost_millicents")
+        batch_op.drop_column("cost_per_credit_millicents")
+    _create_user_created_index("total_cost")
@@ -0,0 +1,47 @@
+"""add credit_distributions reseller and business owner indexes
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-16 14:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0012'
+down_revision: Union[str, None] = '0011'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = {
+    "ix_credit_distributions_from_reseller": "from_reseller_id",
+    "ix_credit_distributions_to_business": "to_business_user_id",
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, column in INDEXES.items():
+            op.create_index(
+                name,
+                "credit_distributions",
+                [column],
+                if_not_exists=True,
+                postgresql_include=["credits_shared"],
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="credit_distributions",
+                postgresql_concurrently=True,
+            )
@@ -0,0 +1,51 @@
+"""add partial users indexes for resellers and business owners
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-16 14:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0013'
+down_revision: Union[str, None] = '0012'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (columns, included columns, role)
+INDEXES = {
+    "ix_users_reseller_wallet": (["user_id"], ["available_credits", "used_credits"], "reseller"),
+    "ix_users_business_owner_parent": (["user_id", "parent_reseller_id"], ["credits_allocated", "credits_remaining"], "business_owner"),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, (columns, include, role) in INDEXES.items():
+            where = sa.text(f"role = '{role}'")
+            op.create_index(
+                name,
+                "users",
+                columns,
+                if_not_exists=True,
+                postgresql_include=include,
+                postgresql_where=where,
+                sqlite_where=where,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="users",
+                postgresql_concurrently=True,
+            )
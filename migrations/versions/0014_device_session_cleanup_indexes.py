@@ -0,0 +1,50 @@
+"""add partial device_sessions indexes for session cleanup
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-16 15:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0014'
+down_revision: Union[str, None] = '0013'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (column, PostgreSQL predicate, SQLite predicate)
+INDEXES = {
+    "ix_dsession_valid_expires": ("expires_at", "is_valid = true", "is_valid = 1"),
+    "ix_dsession_live_activity": ("last_activity", "is_valid = true AND is_active = true", "is_valid = 1 AND is_active = 1"),
+    "ix_dsession_compromised": ("session_id", "is_compromised = true", "is_compromised = 1"),
+}
+
+
+def upgrade() -> None:
+    # CONCURRENTLY cannot run inside a transaction on PostgreSQL
+    with op.get_context().autocommit_block():
+        for name, (column, pg_where, sqlite_where) in INDEXES.items():
+            op.create_index(
+                name,
+                "device_sessions",
+                [column],
+                if_not_exists=True,
+                postgresql_where=sa.text(pg_where),
+                sqlite_where=sa.text(sqlite_where),
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(
+                name,
+                table_name="device_sessions",
+                postgresql_concurrently=True,
+            )
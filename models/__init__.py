@@ -1,3 +1,5 @@
+from sqlalchemy.orm import configure_mappers
+
 from .user import User
 from .credit_distribution import CreditDistribution
 from .message import Message
@@ -6,4 +8,7 @@ from .device_session import DeviceSession
 from .message_usage_log import MessageUsageLog
 from .reseller_analytics import ResellerAnalytics, BusinessUserAnalytics
 
+# Resolve every relationship once, now that all models are imported, instead of lazily on the first query
+configure_mappers()
+
 __all__ = ["User", "CreditDistribution", "Message", "UnofficialLinkedDevice", "DeviceSession", "MessageUsageLog", "ResellerAnalytics", "BusinessUserAnalytics"]
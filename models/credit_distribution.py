@@ -1,18 +1,29 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
-from datetime import datetime
-import uuid
+from db.functions import utcnow
+from db.ids import time_sorted_id
+
+_DISTRIBUTION_PREFIX = "dist-"
+
+def _new_distribution_id() -> str:
+    return time_sorted_id(_DISTRIBUTION_PREFIX)
 
 class CreditDistribution(Base):
     __tablename__ = "credit_distributions"
+    __table_args__ = (
+        # Per-reseller and per-business-owner listings and credit stats; credits_shared
+        # is included so the SUMs are answered from the index on PostgreSQL
+        Index("ix_credit_distributions_from_reseller", "from_reseller_id", postgresql_include=["credits_shared"]),
+        Index("ix_credit_distributions_to_business", "to_business_user_id", postgresql_include=["credits_shared"]),
+    )
     
-    distribution_id = Column(String, primary_key=True, default=lambda: f"dist-{uuid.uuid4().hex[:8]}")
+    distribution_id = Column(String, primary_key=True, default=_new_distribution_id)
     from_reseller_id = Column(String, ForeignKey("users.user_id"), nullable=False)
     to_business_user_id = Column(String, ForeignKey("users.user_id"), nullable=False)
     
     credits_shared = Column(Integer, nullable=False)
-    shared_at = Column(DateTime, default=datetime.utcnow)
+    shared_at = Column(DateTime, server_default=utcnow())
     
     # Relationships
     from_reseller = relationship("User", foreign_keys=[from_reseller_id], back_populates="credit_distributions_sent")
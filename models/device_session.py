@@ -1,19 +1,64 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Index, update, text
+from sqlalchemy.orm import relationship, Session
 from db.database import Base
+from db.functions import utcnow
+from db.ids import time_sorted_id
 from datetime import datetime, timedelta
-import uuid
-import secrets
 import hashlib
 from cryptography.fernet import Fernet
 from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 import base64
+import os
+import threading
+
+_SESSION_PREFIX = "session-"
+
+def _new_session_id() -> str:
+    return time_sorted_id(_SESSION_PREFIX)
+
+# Session tokens are sliced from a pre-filled os.urandom buffer to amortize the syscall
+_TOKEN_BYTES = 64
+_TOKEN_BUFFER_SIZE = _TOKEN_BYTES * 256
+_token_buffer = bytearray()
+_token_buffer_pid = None
+_token_lock = threading.Lock()
+
+def _random_token_bytes() -> bytes:
+    global _token_buffer, _token_buffer_pid
+    with _token_lock:
+        # Never share buffered bytes with a forked worker
+        if _token_buffer_pid != os.getpid() or len(_token_buffer) < _TOKEN_BYTES:
+            _token_buffer = bytearray(os.urandom(_TOKEN_BUFFER_SIZE))
+            _token_buffer_pid = os.getpid()
+        chunk = bytes(_token_buffer[-_TOKEN_BYTES:])
+        del _token_buffer[-_TOKEN_BYTES:]
+    return chunk
 
 class DeviceSession(Base):
     __tablename__ = "device_sessions"
-    
-    session_id = Column(String, primary_key=True, default=lambda: f"session-{uuid.uuid4().hex[:8]}")
+    __table_args__ = (
+        # Liveness lookup per device (is_valid_session predicate)
+        Index("ix_dsession_live", "device_id", "is_valid", "is_active", "expires_at"),
+        # Partial indexes matching cleanup_sessions' predicates, so each cleanup is a range scan
+        Index(
+            "ix_dsession_valid_expires", "expires_at",
+            postgresql_where=text("is_valid = true"),
+            sqlite_where=text("is_valid = 1"),
+        ),
+        Index(
+            "ix_dsession_live_activity", "last_activity",
+            postgresql_where=text("is_valid = true AND is_active = true"),
+            sqlite_where=text("is_valid = 1 AND is_active = 1"),
+        ),
+        Index(
+            "ix_dsession_compromised", "session_id",
+            postgresql_where=text("is_compromised = true"),
+            sqlite_where=text("is_compromised = 1"),
+        ),
+    )
+    
+    session_id = Column(String, primary_key=True, default=_new_session_id)
     device_id = Column(String, ForeignKey("unofficial_linked_devices.device_id"), nullable=False, index=True)
     
     # Authentication data
@@ -32,18 +77,18 @@ class DeviceSession(Base):
     last_ip_address = Column(String, nullable=True)
     
     # Security tracking
-    login_attempts = Column(Integer, default=0)
-    max_login_attempts = Column(Integer, default=5)
+    login_attempts = Column(Integer, nullable=False, server_default=text("0"))
+    max_login_attempts = Column(Integer, nullable=False, server_default=text("5"))
     last_login_attempt = Column(DateTime, nullable=True)
     last_successful_login = Column(DateTime, nullable=True)
     
     # Activity tracking
-    last_activity = Column(DateTime, default=datetime.utcnow)
-    total_requests = Column(Integer, default=0)
-    messages_sent_via_session = Column(Integer, default=0)
+    last_activity = Column(DateTime, server_default=utcnow())
+    total_requests = Column(Integer, nullable=False, server_default=text("0"))
+    messages_sent_via_session = Column(Integer, nullable=False, server_default=text("0"))
     
     # Session lifecycle
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
     expires_at = Column(DateTime, nullable=False)
     last_extended_at = Column(DateTime, nullable=True)
     revoked_at = Column(DateTime, nullable=True)
@@ -55,18 +100,22 @@ class DeviceSession(Base):
     
     # Relationships
     device = relationship("UnofficialLinkedDevice", back_populates="sessions")
-    usage_logs = relationship("MessageUsageLog", back_populates="session")
+    # Load explicitly with selectinload(DeviceSession.usage_logs); lazy access raises
+    usage_logs = relationship("MessageUsageLog", back_populates="session", lazy="raise")
     
     def __repr__(self):
-        return f"<DeviceSession(id={self.session_id}, device_id={self.device_id}, valid={self.is_valid})>"
+        state = self.__dict__
+        return "<DeviceSession(id=%s, device_id=%s, valid=%s)>" % (
+            state.get("session_id"), state.get("device_id"), state.get("is_valid")
+        )
     
-    def is_expired(self):
-        """Check if session has expired"""
-        return datetime.utcnow() > self.expires_at
+    def is_expired(self, now: datetime = None):
+        """Check if session has expired (as of now, default the current time)"""
+        return (now or datetime.utcnow()) > self.expires_at
     
-    def is_valid_session(self):
+    def is_valid_session(self, now: datetime = None):
         """Check if session is both valid and not expired"""
-        return self.is_valid and self.is_active and not self.is_expired() and not self.is_compromised
+        return self.is_valid and self.is_active and not self.is_expired(now) and not self.is_compromised
     
     def can_login(self):
         """Check if user can attempt login"""
@@ -112,13 +161,29 @@ class DeviceSession(Base):
         self.compromise_reason = reason
         self.revoked_at = datetime.utcnow()
     
-    def update_activity(self, ip_address: str = None):
-        """Update session activity"""
+    @staticmethod
+    def bulk_reap_expired(db: Session) -> int:
+        """Revoke every expired session that is still active with one UPDATE. Returns the row count."""
+        result = db.execute(
+            update(DeviceSession)
+            .where(DeviceSession.is_active == True, DeviceSession.expires_at < utcnow())
+            .values(is_valid=False, is_active=False, revoked_at=utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+    
+    def touch_activity(self, ip_address: str = None):
+        """Update last activity without touching the request counter"""
         self.last_activity = datetime.utcnow()
-        self.total_requests += 1
         if ip_address:
             self.last_ip_address = ip_address
     
+    def update_activity(self, ip_address: str = None):
+        """Update session activity"""
+        self.touch_activity(ip_address)
+        self.total_requests += 1
+    
     def increment_message_count(self):
         """Increment message count for this session"""
         self.messages_sent_via_session += 1
@@ -126,15 +191,19 @@ class DeviceSession(Base):
     
     @staticmethod
     def generate_encryption_key(password: str, salt: str = None) -> tuple:
-        """Generate encryption key from password"""
+        """Generate encryption key from a server-generated random secret.
+        
+        The secret already carries full entropy, so a single HKDF-SHA256 expansion is
+        enough; password-stretching KDFs only add CPU cost here.
+        """
         if salt is None:
-            salt = secrets.token_hex(16)
+            salt = os.urandom(16).hex()
         
-        kdf = PBKDF2HMAC(
+        kdf = HKDF(
             algorithm=hashes.SHA256(),
             length=32,
             salt=salt.encode(),
-            iterations=100000,
+            info=b"device-session",
         )
         key = base64.urlsafe_b64encode(kdf.derive(password.encode()))
         return key, salt
@@ -157,7 +226,7 @@ class DeviceSession(Base):
     @staticmethod
     def generate_session_token() -> str:
         """Generate secure session token"""
-        return secrets.token_urlsafe(64)
+        return base64.urlsafe_b64encode(_random_token_bytes()).rstrip(b"=").decode()
     
     def get_session_info(self) -> dict:
         """Get session information (excluding sensitive data)"""
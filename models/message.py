@@ -1,13 +1,18 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, text
 from sqlalchemy.orm import relationship
 from db.database import Base
-from datetime import datetime
-import uuid
+from db.functions import utcnow
+from db.ids import time_sorted_id
+
+_MESSAGE_PREFIX = "msg-"
+
+def _new_message_id() -> str:
+    return time_sorted_id(_MESSAGE_PREFIX)
 
 class Message(Base):
     __tablename__ = "messages"
     
-    message_id = Column(String, primary_key=True, default=lambda: f"msg-{uuid.uuid4().hex[:8]}")
+    message_id = Column(String, primary_key=True, default=_new_message_id)
     user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
     
     # Channel and mode
@@ -25,18 +30,18 @@ class Message(Base):
     
     # Status and tracking
     status = Column(String, default="pending")  # pending, sent, delivered, failed, read
-    credits_used = Column(Integer, default=1)
+    credits_used = Column(Integer, nullable=False, server_default=text("1"))
     
     # Timestamps
-    sent_at = Column(DateTime, default=datetime.utcnow)
+    sent_at = Column(DateTime, server_default=utcnow())
     delivered_at = Column(DateTime, nullable=True)
     read_at = Column(DateTime, nullable=True)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Error handling
     error_message = Column(Text, nullable=True)
-    retry_count = Column(Integer, default=0)
-    max_retries = Column(Integer, default=3)
+    retry_count = Column(Integer, nullable=False, server_default=text("0"))
+    max_retries = Column(Integer, nullable=False, server_default=text("3"))
     
     # External IDs
     external_message_id = Column(String, nullable=True)  # WhatsApp API message ID
@@ -47,4 +52,8 @@ class Message(Base):
     usage_logs = relationship("MessageUsageLog", back_populates="message")
     
     def __repr__(self):
-        return f"<Message(id={self.message_id}, user_id={self.user_id}, status={self.status})>"
+        # Loaded state only, so repr() never emits SQL on expired or detached instances
+        state = self.__dict__
+        return "<Message(id=%s, user_id=%s, status=%s)>" % (
+            state.get("message_id"), state.get("user_id"), state.get("status")
+        )
@@ -1,10 +1,23 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Numeric, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Integer, BigInteger, ForeignKey, Text, Boolean, Enum, Index, Uuid, insert, select
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import relationship, Session
 from db.database import Base
+from db.functions import utcnow
+from db.ids import time_sorted_uuid
+from core.user_cache import get_user_projections
 from datetime import datetime
-import uuid
+from typing import List
 import enum
 
+# Money is stored as integer millicents (1/100000 of a currency unit)
+MILLICENTS_PER_UNIT = 100_000
+
+def _new_usage_id() -> str:
+    return str(time_sorted_uuid())
+
+def to_millicents(amount: float) -> int:
+    return int(round(amount * MILLICENTS_PER_UNIT))
+
 class UsageType(str, enum.Enum):
     MESSAGE_SEND = "message_send"
     MESSAGE_RECEIVE = "message_receive"
@@ -22,15 +35,40 @@ class UsageStatus(str, enum.Enum):
     REFUNDED = "refunded"
     DISPUTED = "disputed"
 
+# Precomputed member -> value lookups for row serialization
+_USAGE_TYPE_VALUES = {member: member.value for member in UsageType}
+_USAGE_STATUS_VALUES = {member: member.value for member in UsageStatus}
+
+# Looking a member up on the Enum class costs far more than the comparison itself. Values
+# read back through the Enum column are the members themselves, so rows can use `is`.
+_SUCCESS = UsageStatus.SUCCESS
+
 class MessageUsageLog(Base):
     __tablename__ = "message_usage_logs"
+    __table_args__ = (
+        # Per-user period sums; INCLUDE lets PostgreSQL answer them with index-only scans
+        Index(
+            "ix_usage_user_created", "user_id", "created_at",
+            postgresql_include=["credits_deducted", "credits_refunded", "total_cost_millicents"]
+        ),
+        Index("ix_usage_status_created", "status", "created_at"),
+        # Per-reseller rollups over a time range without joining users
+        Index("ix_usage_reseller_created", "reseller_id", "created_at"),
+        # On PostgreSQL migration 0010 turns this into a monthly RANGE (created_at) partitioned
+        # table keyed on (usage_id, created_at); see models/usage_log_partitions.py
+    )
     
-    usage_id = Column(String, primary_key=True, default=lambda: f"usage-{uuid.uuid4().hex[:8]}")
+    # Native 16-byte UUID on PostgreSQL (CHAR(32) elsewhere); values are handled as strings
+    usage_id = Column(Uuid(as_uuid=False), primary_key=True, default=_new_usage_id)
     user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
     message_id = Column(String, ForeignKey("messages.message_id"), nullable=True, index=True)
     device_id = Column(String, ForeignKey("unofficial_linked_devices.device_id"), nullable=True, index=True)
     session_id = Column(String, ForeignKey("device_sessions.session_id"), nullable=True, index=True)
     
+    # Denormalized from the user row at insert time (users.parent_reseller_id, users.business_name)
+    reseller_id = Column(String, nullable=True)
+    business_name = Column(String, nullable=True)
+    
     # Usage details
     usage_type = Column(Enum(UsageType), default=UsageType.MESSAGE_SEND, nullable=False)
     credits_deducted = Column(Integer, nullable=False, default=0)
@@ -42,8 +80,8 @@ class MessageUsageLog(Base):
     balance_after = Column(Integer, nullable=False)
     
     # Cost details
-    cost_per_credit = Column(Numeric(10, 4), default=0.01)  # Cost in currency
-    total_cost = Column(Numeric(10, 4), default=0.00)  # Total cost in currency
+    cost_per_credit_millicents = Column(BigInteger, nullable=False, default=1000)
+    total_cost_millicents = Column(BigInteger, nullable=False, default=0)
     currency = Column(String, default="USD")
     
     # Message details
@@ -69,8 +107,8 @@ class MessageUsageLog(Base):
     refund_processed_by = Column(String, nullable=True)  # User ID who processed refund
     
     # Audit fields
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     processed_at = Column(DateTime, nullable=True)  # When the usage was processed
     
     # Relationships
@@ -79,12 +117,35 @@ class MessageUsageLog(Base):
     device = relationship("UnofficialLinkedDevice", back_populates="usage_logs")
     session = relationship("DeviceSession", back_populates="usage_logs")
     
+    @hybrid_property
+    def cost_per_credit(self) -> float:
+        """Cost per credit in currency units"""
+        return self.cost_per_credit_millicents / MILLICENTS_PER_UNIT
+    
+    @cost_per_credit.inplace.expression
+    @classmethod
+    def _cost_per_credit_expression(cls):
+        return cls.cost_per_credit_millicents / float(MILLICENTS_PER_UNIT)
+    
+    @hybrid_property
+    def total_cost(self) -> float:
+        """Total cost in currency units"""
+        return self.total_cost_millicents / MILLICENTS_PER_UNIT
+    
+    @total_cost.inplace.expression
+    @classmethod
+    def _total_cost_expression(cls):
+        return cls.total_cost_millicents / float(MILLICENTS_PER_UNIT)
+    
     def __repr__(self):
-        return f"<MessageUsageLog(id={self.usage_id}, user_id={self.user_id}, credits={self.credits_deducted})>"
+        state = self.__dict__
+        return "<MessageUsageLog(id=usage-%s, user_id=%s, credits=%s)>" % (
+            state.get("usage_id"), state.get("user_id"), state.get("credits_deducted")
+        )
     
     def is_successful(self):
         """Check if usage was successful"""
-        return self.status == UsageStatus.SUCCESS
+        return self.status == _SUCCESS
     
     def is_refunded(self):
         """Check if credits were refunded"""
@@ -96,12 +157,12 @@ class MessageUsageLog(Base):
     
     def get_total_cost(self):
         """Calculate total cost in currency"""
-        return float(self.total_cost)
+        return self.total_cost
     
     def can_be_refunded(self):
         """Check if this usage can be refunded"""
         return (
-            self.status == UsageStatus.SUCCESS and
+            self.status == _SUCCESS and
             self.credits_deducted > 0 and
             self.credits_refunded == 0 and
             not self.is_refunded()
@@ -115,13 +176,14 @@ class MessageUsageLog(Base):
         if refund_amount > self.credits_deducted:
             raise ValueError("Refund amount cannot exceed deducted credits")
         
+        now = datetime.utcnow()
         self.credits_refunded = refund_amount
         self.net_credits = self.credits_deducted - refund_amount
         self.refund_reason = reason
-        self.refund_timestamp = datetime.utcnow()
+        self.refund_timestamp = now
         self.refund_processed_by = processed_by
         self.status = UsageStatus.REFUNDED
-        self.updated_at = datetime.utcnow()
+        self.updated_at = now
     
     def mark_failed(self, error_code: str = None, error_message: str = None):
         """Mark usage as failed"""
@@ -130,28 +192,37 @@ class MessageUsageLog(Base):
         self.error_message = error_message
         self.updated_at = datetime.utcnow()
     
+    _SUMMARY_KEYS = (
+        "usage_id", "user_id", "message_id", "usage_type", "credits_deducted", "credits_refunded",
+        "net_credits", "balance_before", "balance_after", "total_cost", "currency", "status",
+        "created_at", "is_successful", "is_refunded"
+    )
+    
     def get_usage_summary(self) -> dict:
         """Get usage summary as dictionary"""
-        return {
-            "usage_id": self.usage_id,
-            "user_id": self.user_id,
-            "message_id": self.message_id,
-            "usage_type": self.usage_type.value,
-            "credits_deducted": self.credits_deducted,
-            "credits_refunded": self.credits_refunded,
-            "net_credits": self.get_net_credit_usage(),
-            "balance_before": self.balance_before,
-            "balance_after": self.balance_after,
-            "total_cost": float(self.total_cost),
-            "currency": self.currency,
-            "status": self.status.value,
-            "created_at": self.created_at,
-            "is_successful": self.is_successful(),
-            "is_refunded": self.is_refunded()
-        }
+        deducted = self.credits_deducted
+        refunded = self.credits_refunded
+        status = self.status
+        return dict(zip(self._SUMMARY_KEYS, (
+            self.usage_id,
+            self.user_id,
+            self.message_id,
+            _USAGE_TYPE_VALUES[self.usage_type],
+            deducted,
+            refunded,
+            deducted - refunded,
+            self.balance_before,
+            self.balance_after,
+            self.total_cost_millicents / MILLICENTS_PER_UNIT,
+            self.currency,
+            _USAGE_STATUS_VALUES[status],
+            self.created_at,
+            status == _SUCCESS,
+            refunded > 0
+        )))
     
     @staticmethod
-    def create_usage_log(
+    def build_row(
         user_id: str,
         message_id: str = None,
         device_id: str = None,
@@ -167,29 +238,86 @@ class MessageUsageLog(Base):
         ip_address: str = None,
         user_agent: str = None,
         api_endpoint: str = None,
-        request_id: str = None
-    ):
-        """Create a new usage log entry"""
-        total_cost = credits_deducted * cost_per_credit
+        request_id: str = None,
+        reseller_id: str = None,
+        business_name: str = None
+    ) -> dict:
+        """Build the column values for a new usage log entry"""
+        cost_per_credit_millicents = to_millicents(cost_per_credit)
+        return {
+            "usage_id": _new_usage_id(),
+            "user_id": user_id,
+            "message_id": message_id,
+            "device_id": device_id,
+            "session_id": session_id,
+            "usage_type": usage_type,
+            "credits_deducted": credits_deducted,
+            "net_credits": credits_deducted,
+            "balance_before": balance_before,
+            "balance_after": balance_after,
+            "cost_per_credit_millicents": cost_per_credit_millicents,
+            "total_cost_millicents": credits_deducted * cost_per_credit_millicents,
+            "message_type": message_type,
+            "message_size": message_size,
+            "recipient_count": recipient_count,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "api_endpoint": api_endpoint,
+            "request_id": request_id,
+            "reseller_id": reseller_id,
+            "business_name": business_name,
+            "processed_at": datetime.utcnow()
+        }
+    
+    @staticmethod
+    def create_usage_log(**kwargs):
+        """Create a new usage log entry (takes the same arguments as build_row)"""
+        return MessageUsageLog(**MessageUsageLog.build_row(**kwargs))
+    
+    @classmethod
+    def bulk_create(cls, session: Session, rows: List[dict]) -> List[str]:
+        """Insert many usage logs with one executemany INSERT, skipping ORM instance construction.
+        
+        Each row takes the build_row() arguments. Returns the new usage IDs; the caller commits.
+        """
+        values = [cls.build_row(**row) for row in rows]
         
-        return MessageUsageLog(
-            user_id=user_id,
-            message_id=message_id,
-            device_id=device_id,
-            session_id=session_id,
-            usage_type=usage_type,
-            credits_deducted=credits_deducted,
-            net_credits=credits_deducted,
-            balance_before=balance_before,
-            balance_after=balance_after,
-            cost_per_credit=cost_per_credit,
-            total_cost=total_cost,
-            message_type=message_type,
-            message_size=message_size,
-            recipient_count=recipient_count,
-            ip_address=ip_address,
-            user_agent=user_agent,
-            api_endpoint=api_endpoint,
-            request_id=request_id,
-            processed_at=datetime.utcnow()
+        # Fill the denormalized user columns for rows that didn't supply them, from the per-worker cache
+        missing = {row["user_id"] for row in values if row["reseller_id"] is None and row["business_name"] is None}
+        if missing:
+            users = get_user_projections(session, missing)
+            for row in values:
+                if row["user_id"] in users and row["reseller_id"] is None and row["business_name"] is None:
+                    row["reseller_id"], row["business_name"] = users[row["user_id"]]
+        
+        if values:
+            session.execute(insert(cls), values)
+        return [row["usage_id"] for row in values]
+
+def list_usage_summaries(session: Session, user_id: str, skip: int = 0, limit: int = 100) -> List[dict]:
+    """get_usage_summary() dicts for a user's latest usage logs, read as plain rows without ORM instances"""
+    log = MessageUsageLog
+    stmt = (
+        select(
+            log.usage_id, log.user_id, log.message_id, log.usage_type, log.credits_deducted,
+            log.credits_refunded, log.balance_before, log.balance_after, log.total_cost_millicents,
+            log.currency, log.status, log.created_at
         )
+        .where(log.user_id == user_id)
+        .order_by(log.created_at.desc())
+        .offset(skip)
+        .limit(limit)
+        .execution_options(yield_per=1000)
+    )
+    keys = log._SUMMARY_KEYS
+    return [
+        dict(zip(keys, (
+            usage_id, row_user_id, message_id, _USAGE_TYPE_VALUES[usage_type], deducted, refunded,
+            deducted - refunded, balance_before, balance_after, cost / MILLICENTS_PER_UNIT, currency,
+            _USAGE_STATUS_VALUES[status], created_at, status is _SUCCESS, refunded > 0
+        )))
+        for (
+            usage_id, row_user_id, message_id, usage_type, deducted, refunded, balance_before,
+            balance_after, cost, currency, status, created_at
+        ) in session.execute(stmt)
+    ]
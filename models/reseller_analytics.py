@@ -1,9 +1,12 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Numeric, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, Numeric, Enum, JSON, MetaData, Table, case, func, insert
+from sqlalchemy.orm import relationship, Session
 from db.database import Base
+from db.functions import utcnow
+from db.ids import time_sorted_id
 from datetime import datetime
-import uuid
+from typing import List
 import enum
+import orjson
 
 class AnalyticsPeriod(str, enum.Enum):
     DAILY = "daily"
@@ -12,10 +15,29 @@ class AnalyticsPeriod(str, enum.Enum):
     QUARTERLY = "quarterly"
     YEARLY = "yearly"
 
+# Precomputed member -> value lookup for row serialization
+_ANALYTICS_PERIOD_VALUES = {member: member.value for member in AnalyticsPeriod}
+
+def percentage_expr(part, whole):
+    """SQL percentage that is 0 when the denominator is 0, like the calculate_* methods.
+    
+    Lets reports compute rates for many rows in the query instead of per ORM instance.
+    """
+    return case((func.coalesce(whole, 0) == 0, 0.0), else_=part * 100.0 / whole)
+
+_ANALYTICS_PREFIX = "analytics-"
+_STAT_PREFIX = "stat-"
+
+def _new_analytics_id() -> str:
+    return time_sorted_id(_ANALYTICS_PREFIX)
+
+def _new_stat_id() -> str:
+    return time_sorted_id(_STAT_PREFIX)
+
 class ResellerAnalytics(Base):
     __tablename__ = "reseller_analytics"
     
-    analytics_id = Column(String, primary_key=True, default=lambda: f"analytics-{uuid.uuid4().hex[:8]}")
+    analytics_id = Column(String, primary_key=True, default=_new_analytics_id)
     reseller_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
     
     # Credit analytics
@@ -43,43 +65,48 @@ class ResellerAnalytics(Base):
     analytics_period = Column(Enum(AnalyticsPeriod), default=AnalyticsPeriod.MONTHLY)
     period_start = Column(DateTime, nullable=False)
     period_end = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     reseller = relationship("User", back_populates="analytics")
-    business_user_stats = relationship("BusinessUserAnalytics", back_populates="reseller_analytics")
+    # Load explicitly (ResellerAnalyticsService._with_business_stats); lazy access raises
+    business_user_stats = relationship("BusinessUserAnalytics", back_populates="reseller_analytics", lazy="raise")
     
     def __repr__(self):
-        return f"<ResellerAnalytics(id={self.analytics_id}, reseller_id={self.reseller_id}, period={self.analytics_period})>"
+        state = self.__dict__
+        return "<ResellerAnalytics(id=%s, reseller_id=%s, period=%s)>" % (
+            state.get("analytics_id"), state.get("reseller_id"), state.get("analytics_period")
+        )
+    
+    # Keys of the "analytics" section of to_dict(), in output order
+    _EXPORT_KEYS = (
+        "total_credits_purchased", "total_credits_distributed", "total_credits_used", "remaining_credits",
+        "total_revenue", "revenue_from_credits", "revenue_from_subscriptions",
+        "total_business_users", "active_business_users", "inactive_business_users",
+        "total_messages_sent", "total_messages_delivered", "total_messages_failed",
+        "analytics_period", "period_start", "period_end"
+    )
     
     def to_dict(self):
-        """Convert analytics to dictionary format"""
+        """Convert analytics to dictionary format.
+        
+        Datetimes are left as datetime objects; orjson (to_json(), ORJSONResponse) encodes them.
+        """
+        analytics = {key: getattr(self, key) for key in self._EXPORT_KEYS}
+        for key in ("total_revenue", "revenue_from_credits", "revenue_from_subscriptions"):
+            analytics[key] = float(analytics[key] or 0)
+        analytics["analytics_period"] = _ANALYTICS_PERIOD_VALUES.get(analytics["analytics_period"])
         return {
             "reseller_id": self.reseller_id,
-            "analytics": {
-                "total_credits_purchased": self.total_credits_purchased,
-                "total_credits_distributed": self.total_credits_distributed,
-                "total_credits_used": self.total_credits_used,
-                "remaining_credits": self.remaining_credits,
-                "total_revenue": float(self.total_revenue),
-                "revenue_from_credits": float(self.revenue_from_credits),
-                "revenue_from_subscriptions": float(self.revenue_from_subscriptions),
-                "total_business_users": self.total_business_users,
-                "active_business_users": self.active_business_users,
-                "inactive_business_users": self.inactive_business_users,
-                "total_messages_sent": self.total_messages_sent,
-                "total_messages_delivered": self.total_messages_delivered,
-                "total_messages_failed": self.total_messages_failed,
-                "analytics_period": self.analytics_period,
-                "period_start": self.period_start.isoformat() if self.period_start else None,
-                "period_end": self.period_end.isoformat() if self.period_end else None
-            },
-            "business_user_stats": [
-                stat.to_dict() for stat in self.business_user_stats
-            ]
+            "analytics": analytics,
+            "business_user_stats": [stat.to_dict() for stat in self.business_user_stats]
         }
     
+    def to_json(self) -> bytes:
+        """Serialize to_dict() straight to JSON bytes"""
+        return orjson.dumps(self.to_dict())
+    
     def calculate_credit_utilization(self):
         """Calculate credit utilization percentage"""
         if self.total_credits_distributed == 0:
@@ -102,7 +129,7 @@ class ResellerAnalytics(Base):
 class BusinessUserAnalytics(Base):
     __tablename__ = "business_user_analytics"
     
-    stat_id = Column(String, primary_key=True, default=lambda: f"stat-{uuid.uuid4().hex[:8]}")
+    stat_id = Column(String, primary_key=True, default=_new_stat_id)
     reseller_analytics_id = Column(String, ForeignKey("reseller_analytics.analytics_id"), nullable=False)
     user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
     
@@ -130,15 +157,18 @@ class BusinessUserAnalytics(Base):
     # Period and timestamps
     period_start = Column(DateTime, nullable=False)
     period_end = Column(DateTime, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     reseller_analytics = relationship("ResellerAnalytics", back_populates="business_user_stats")
     user = relationship("User", back_populates="business_analytics")
     
     def __repr__(self):
-        return f"<BusinessUserAnalytics(id={self.stat_id}, user_id={self.user_id}, credits_used={self.credits_used})>"
+        state = self.__dict__
+        return "<BusinessUserAnalytics(id=%s, user_id=%s, credits_used=%s)>" % (
+            state.get("stat_id"), state.get("user_id"), state.get("credits_used")
+        )
     
     def to_dict(self):
         """Convert business user stats to dictionary format"""
@@ -160,11 +190,44 @@ class BusinessUserAnalytics(Base):
             "total_devices": self.total_devices,
             "active_sessions": self.active_sessions,
             "total_sessions": self.total_sessions,
-            "revenue_generated": float(self.revenue_generated),
-            "period_start": self.period_start.isoformat() if self.period_start else None,
-            "period_end": self.period_end.isoformat() if self.period_end else None
+            "revenue_generated": float(self.revenue_generated or 0),
+            "period_start": self.period_start,
+            "period_end": self.period_end
         }
     
+    # Columns written by bulk_create; created_at/updated_at come from the server defaults
+    _BULK_COLUMNS = (
+        "stat_id", "reseller_analytics_id", "user_id", "credits_allocated", "credits_used",
+        "credits_remaining", "messages_sent", "messages_delivered", "messages_failed",
+        "active_devices", "total_devices", "active_sessions", "total_sessions",
+        "revenue_generated", "period_start", "period_end"
+    )
+    _BULK_DEFAULTS = dict.fromkeys(_BULK_COLUMNS[3:14], 0)
+    
+    @classmethod
+    def bulk_create(cls, session: Session, rows: List[dict]) -> List[str]:
+        """Write many stats rows at once. Returns the new stat IDs; the caller commits.
+        
+        On PostgreSQL with the psycopg (3) driver the rows are streamed with COPY FROM STDIN;
+        otherwise they go through one executemany INSERT.
+        """
+        values = [
+            tuple(row[column] for column in cls._BULK_COLUMNS)
+            for row in ({"stat_id": _new_stat_id(), **cls._BULK_DEFAULTS, **row} for row in rows)
+        ]
+        if not values:
+            return []
+        
+        connection = session.connection()
+        if connection.dialect.name == "postgresql" and connection.dialect.driver == "psycopg":
+            copy_sql = "COPY %s (%s) FROM STDIN" % (cls.__tablename__, ", ".join(cls._BULK_COLUMNS))
+            with connection.connection.cursor() as cursor, cursor.copy(copy_sql) as copy:
+                for value in values:
+                    copy.write_row(value)
+        else:
+            session.execute(insert(cls), [dict(zip(cls._BULK_COLUMNS, value)) for value in values])
+        return [value[0] for value in values]
+    
     def calculate_credit_utilization(self):
         """Calculate credit utilization percentage"""
         if self.credits_allocated == 0:
@@ -183,3 +246,15 @@ class BusinessUserAnalytics(Base):
             if hasattr(self, key):
                 setattr(self, key, value)
         self.updated_at = datetime.utcnow()
+
+# PostgreSQL materialized view (migration 0006) holding each analytics record's business user
+# stats pre-aggregated as a JSON array. It lives on its own MetaData so create_all() skips it.
+reseller_analytics_mv = Table(
+    "reseller_analytics_mv",
+    MetaData(),
+    Column("analytics_id", String, primary_key=True),
+    Column("reseller_id", String),
+    Column("analytics_period", Enum(AnalyticsPeriod)),
+    Column("period_start", DateTime),
+    Column("business_user_stats", JSON)
+)
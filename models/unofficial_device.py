@@ -1,13 +1,19 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, Text, Boolean, case, func, or_, update
+from sqlalchemy.orm import relationship, Session, object_session
 from db.database import Base
+from db.functions import utcnow
+from db.ids import time_sorted_id
 from datetime import datetime
-import uuid
+
+_DEVICE_PREFIX = "device-"
+
+def _new_device_id() -> str:
+    return time_sorted_id(_DEVICE_PREFIX)
 
 class UnofficialLinkedDevice(Base):
     __tablename__ = "unofficial_linked_devices"
     
-    device_id = Column(String, primary_key=True, default=lambda: f"device-{uuid.uuid4().hex[:8]}")
+    device_id = Column(String, primary_key=True, default=_new_device_id)
     user_id = Column(String, ForeignKey("users.user_id"), nullable=False, index=True)
     
     # Device information
@@ -28,7 +34,7 @@ class UnofficialLinkedDevice(Base):
     connection_string = Column(Text, nullable=True)  # WhatsApp connection string
     
     # Activity tracking
-    last_active = Column(DateTime, default=datetime.utcnow)
+    last_active = Column(DateTime, server_default=utcnow())
     last_message_sent = Column(DateTime, nullable=True)
     last_message_received = Column(DateTime, nullable=True)
     
@@ -41,7 +47,7 @@ class UnofficialLinkedDevice(Base):
     is_active = Column(Boolean, default=True)
     max_daily_messages = Column(Integer, default=1000)
     daily_message_count = Column(Integer, default=0)
-    last_reset_date = Column(DateTime, default=datetime.utcnow)
+    last_reset_date = Column(DateTime, server_default=utcnow())
     
     # Error handling
     last_error = Column(Text, nullable=True)
@@ -50,8 +56,8 @@ class UnofficialLinkedDevice(Base):
     max_reconnect_attempts = Column(Integer, default=5)
     
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     last_connected_at = Column(DateTime, nullable=True)
     last_disconnected_at = Column(DateTime, nullable=True)
     
@@ -61,7 +67,10 @@ class UnofficialLinkedDevice(Base):
     usage_logs = relationship("MessageUsageLog", back_populates="device")
     
     def __repr__(self):
-        return f"<UnofficialLinkedDevice(id={self.device_id}, user_id={self.user_id}, status={self.session_status})>"
+        state = self.__dict__
+        return "<UnofficialLinkedDevice(id=%s, user_id=%s, status=%s)>" % (
+            state.get("device_id"), state.get("user_id"), state.get("session_status")
+        )
     
     def is_connected(self):
         return self.session_status == "connected"
@@ -78,19 +87,38 @@ class UnofficialLinkedDevice(Base):
             return False
         return True
     
-    def increment_message_sent(self):
-        self.messages_sent += 1
-        self.last_message_sent = datetime.utcnow()
-        self.last_active = datetime.utcnow()
+    @classmethod
+    def bump_sent(cls, db: Session, device_id: str) -> int:
+        """Count one sent message with a single UPDATE, resetting the daily count on a new day.
         
-        # Reset daily count if needed
-        if self.last_reset_date.date() != datetime.utcnow().date():
-            self.daily_message_count = 0
-            self.last_reset_date = datetime.utcnow()
-        
-        self.daily_message_count += 1
+        The increments happen in SQL, so concurrent senders cannot lose updates. Returns the
+        row count; the caller commits.
+        """
+        now = utcnow()
+        new_day = or_(cls.last_reset_date.is_(None), func.date(cls.last_reset_date) != func.date(now))
+        result = db.execute(
+            update(cls)
+            .where(cls.device_id == device_id)
+            .values(
+                messages_sent=cls.messages_sent + 1,
+                daily_message_count=case((new_day, 1), else_=cls.daily_message_count + 1),
+                last_reset_date=case((new_day, now), else_=cls.last_reset_date),
+                last_message_sent=now,
+                last_active=now
+            )
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount
+    
+    def increment_message_sent(self):
+        UnofficialLinkedDevice.bump_sent(object_session(self), self.device_id)
+        # Reload the counters from the row on next access
+        object_session(self).expire(self, [
+            "messages_sent", "daily_message_count", "last_reset_date", "last_message_sent", "last_active"
+        ])
     
     def increment_message_received(self):
         self.messages_received += 1
-        self.last_message_received = datetime.utcnow()
-        self.last_active = datetime.utcnow()
+        now = datetime.utcnow()
+        self.last_message_received = now
+        self.last_active = now
@@ -0,0 +1,83 @@
+"""Monthly range partitions for message_usage_logs on PostgreSQL.
+
+The parent table is PARTITION BY RANGE (created_at) with a DEFAULT partition as a safety
+net (created by migration 0010). Partitions for upcoming months are created ahead of time
+by a Celery beat task, and retention (also a beat task) drops whole partitions instead of
+deleting rows. On
+other databases, or before the migration has run, these helpers are no-ops.
+"""
+from datetime import datetime
+from typing import List
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from models.message_usage_log import MessageUsageLog
+
+TABLE = MessageUsageLog.__tablename__
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+def _is_partitioned(bind: Connection) -> bool:
+    """True on PostgreSQL once migration 0010 has converted the table"""
+    if bind.dialect.name != "postgresql":
+        return False
+    return bind.execute(
+        text("SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"),
+        {"table": TABLE}
+    ).first() is not None
+
+def month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+def add_months(value: datetime, months: int) -> datetime:
+    index = value.year * 12 + value.month - 1 + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+def partition_name(month: datetime) -> str:
+    return f"{TABLE}_{month:%Y_%m}"
+
+def create_partition(bind: Connection, month: datetime) -> str:
+    """Create the partition holding `month` if it does not exist yet"""
+    start = month_start(month)
+    name = partition_name(start)
+    bind.execute(text(
+        f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{start:%Y-%m-%d}') TO ('{add_months(start, 1):%Y-%m-%d}')"
+    ))
+    return name
+
+def ensure_usage_log_partitions(db: Session, months_ahead: int = 2) -> List[str]:
+    """Create partitions for the current month and the next `months_ahead` months"""
+    bind = db.connection()
+    if not _is_partitioned(bind):
+        return []
+    current = month_start(datetime.utcnow())
+    names = [create_partition(bind, add_months(current, i)) for i in range(months_ahead + 1)]
+    db.commit()
+    return names
+
+def drop_usage_log_partitions_before(db: Session, cutoff: datetime) -> int:
+    """Detach and drop monthly partitions that end on or before `cutoff`. Returns the rows dropped."""
+    bind = db.connection()
+    if not _is_partitioned(bind):
+        return 0
+    partitions = bind.execute(text(
+        "SELECT child.relname FROM pg_inherits "
+        "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+        "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+        "WHERE parent.relname = :table"
+    ), {"table": TABLE}).scalars().all()
+
+    dropped_rows = 0
+    for name in partitions:
+        if name == DEFAULT_PARTITION:
+            continue
+        month = datetime.strptime(name[len(TABLE) + 1:], "%Y_%m")
+        if add_months(month, 1) > cutoff:
+            continue
+        dropped_rows += bind.execute(text(f"SELECT count(*) FROM {name}")).scalar()
+        bind.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {name}"))
+        bind.execute(text(f"DROP TABLE {name}"))
+    db.commit()
+    return dropped_rows
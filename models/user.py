@@ -1,14 +1,37 @@
-from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean
+from sqlalchemy import Column, String, DateTime, Integer, Text, Boolean, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from db.database import Base
-import uuid
-from datetime import datetime
+from db.functions import utcnow
+from db.ids import time_sorted_id
+
+_USER_PREFIX = "uuid-"
+
+def _new_user_id() -> str:
+    return time_sorted_id(_USER_PREFIX)
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Business-owner listing per reseller
+        Index("ix_users_reseller_role", "parent_reseller_id", "role"),
+        # Narrow partial indexes for the credit distribution checks and stats: the reseller wallet
+        # and the business owner's reseller are read without visiting the table on PostgreSQL
+        Index(
+            "ix_users_reseller_wallet", "user_id",
+            postgresql_include=["available_credits", "used_credits"],
+            postgresql_where=text("role = 'reseller'"),
+            sqlite_where=text("role = 'reseller'"),
+        ),
+        Index(
+            "ix_users_business_owner_parent", "user_id", "parent_reseller_id",
+            postgresql_include=["credits_allocated", "credits_remaining"],
+            postgresql_where=text("role = 'business_owner'"),
+            sqlite_where=text("role = 'business_owner'"),
+        ),
+    )
     
-    user_id = Column(String, primary_key=True, default=lambda: f"uuid-{uuid.uuid4().hex[:12]}")
+    user_id = Column(String, primary_key=True, default=_new_user_id)
     role = Column(String, nullable=False, default="platform_user")  # reseller, admin, platform_user, business_owner
     status = Column(String, nullable=False, default="active")  # active, inactive, suspended
     parent_reseller_id = Column(String, nullable=True)  # Foreign key to reseller
@@ -45,8 +68,8 @@ class User(Base):
     credits_used = Column(Integer, default=0)
     credits_remaining = Column(Integer, default=0)
     
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    created_at = Column(DateTime, server_default=utcnow())
+    updated_at = Column(DateTime, server_default=utcnow(), onupdate=utcnow())
     
     # Relationships
     credit_distributions_sent = relationship("CreditDistribution", foreign_keys="CreditDistribution.from_reseller_id", back_populates="from_reseller")
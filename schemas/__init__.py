@@ -1,77 +1,75 @@
-from .user import (
-    UserProfile, BusinessInfo, Address, BankInfo, Wallet, BusinessOwnerWallet,
-    UserCreate, UserUpdate, UserResponse, UserLogin, UserLoginResponse
-)
-from .credit_distribution import (
-    CreditDistributionCreate, CreditDistributionResponse, CreditDistributionSummary,
-    ResellerCreditStats, BusinessOwnerCreditStats
-)
-from .message import (
-    MessageType, MessageStatus, Channel, Mode, MessageCreate, MessageUpdate, MessageResponse,
-    MessageSendRequest, BulkMessageRequest, MessageStats, UserMessageStats,
-    MessageTemplate, WebhookPayload
-)
-from .unofficial_device import (
-    DeviceType, SessionStatus, UnofficialDeviceCreate, UnofficialDeviceUpdate, UnofficialDeviceResponse,
-    QRCodeRequest, QRCodeResponse, DeviceConnectRequest, DeviceConnectResponse,
-    DeviceDisconnectRequest, DeviceDisconnectResponse, DeviceStatusUpdate,
-    DeviceStats, UserDeviceStats, BulkDeviceOperation, DeviceHealthCheck
-)
-from .device_session import (
-    DeviceSessionCreate, DeviceSessionUpdate, DeviceSessionResponse,
-    SessionCreateRequest, SessionCreateResponse, SessionValidateRequest, SessionValidateResponse,
-    SessionExtendRequest, SessionExtendResponse, SessionRevokeRequest, SessionRevokeResponse,
-    SessionLoginRequest, SessionLoginResponse, SessionActivityUpdate,
-    SessionStats, DeviceSessionStats, UserSessionStats, SessionSecurityCheck,
-    BulkSessionOperation, SessionCleanupRequest, SessionCleanupResponse,
-    SessionHealthCheck
-)
-from .message_usage_log import (
-    MessageUsageLogCreate, MessageUsageLogUpdate, MessageUsageLogResponse,
-    UsageLogCreateRequest, UsageLogCreateResponse, UsageLogRefundRequest, UsageLogRefundResponse,
-    UsageLogUpdateRequest, UsageLogUpdateResponse, UsageStats, UserUsageStats,
-    DeviceUsageStats, SessionUsageStats, UsageAnalytics, UsageFilter,
-    BulkUsageOperation, BulkUsageResponse, UsageCleanupRequest, UsageCleanupResponse
-)
-from .reseller_analytics import (
-    ResellerAnalyticsResponse, AnalyticsData, BusinessUserStats,
-    CreateAnalyticsRequest, UpdateAnalyticsRequest,
-    CreateBusinessUserStatsRequest, UpdateBusinessUserStatsRequest,
-    AnalyticsFilter, AnalyticsSummary, ResellerPerformanceMetrics,
-    TopPerformersResponse, AnalyticsTrends, AnalyticsComparison,
-    AnalyticsExportRequest, AnalyticsExportResponse,
-    AnalyticsHealthCheck, AnalyticsCleanupRequest, AnalyticsCleanupResponse
-)
+"""Schema re-exports, imported lazily (PEP 562) so a module's pydantic models are only built when first used.
 
-__all__ = [
-    "UserProfile", "BusinessInfo", "Address", "BankInfo", "Wallet", "BusinessOwnerWallet",
-    "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "UserLoginResponse",
-    "CreditDistributionCreate", "CreditDistributionResponse", "CreditDistributionSummary",
-    "ResellerCreditStats", "BusinessOwnerCreditStats",
-    "MessageType", "MessageStatus", "Channel", "Mode", "MessageCreate", "MessageUpdate", "MessageResponse",
-    "MessageSendRequest", "BulkMessageRequest", "MessageStats", "UserMessageStats",
-    "MessageTemplate", "WebhookPayload",
-    "DeviceType", "SessionStatus", "UnofficialDeviceCreate", "UnofficialDeviceUpdate", "UnofficialDeviceResponse",
-    "QRCodeRequest", "QRCodeResponse", "DeviceConnectRequest", "DeviceConnectResponse",
-    "DeviceDisconnectRequest", "DeviceDisconnectResponse", "DeviceStatusUpdate",
-    "DeviceStats", "UserDeviceStats", "BulkDeviceOperation", "DeviceHealthCheck",
-    "DeviceSessionCreate", "DeviceSessionUpdate", "DeviceSessionResponse",
-    "SessionCreateRequest", "SessionCreateResponse", "SessionValidateRequest", "SessionValidateResponse",
-    "SessionExtendRequest", "SessionExtendResponse", "SessionRevokeRequest", "SessionRevokeResponse",
-    "SessionLoginRequest", "SessionLoginResponse", "SessionActivityUpdate",
-    "SessionStats", "DeviceSessionStats", "UserSessionStats", "SessionSecurityCheck",
-    "BulkSessionOperation", "SessionCleanupRequest", "SessionCleanupResponse",
-    "SessionHealthCheck",
-    "MessageUsageLogCreate", "MessageUsageLogUpdate", "MessageUsageLogResponse",
-    "UsageLogCreateRequest", "UsageLogCreateResponse", "UsageLogRefundRequest", "UsageLogRefundResponse",
-    "UsageLogUpdateRequest", "UsageLogUpdateResponse", "UsageStats", "UserUsageStats",
-    "DeviceUsageStats", "SessionUsageStats", "UsageAnalytics", "UsageFilter",
-    "BulkUsageOperation", "BulkUsageResponse", "UsageCleanupRequest", "UsageCleanupResponse",
-    "ResellerAnalyticsResponse", "AnalyticsData", "BusinessUserStats",
-    "CreateAnalyticsRequest", "UpdateAnalyticsRequest",
-    "CreateBusinessUserStatsRequest", "UpdateBusinessUserStatsRequest",
-    "AnalyticsFilter", "AnalyticsSummary", "ResellerPerformanceMetrics",
-    "TopPerformersResponse", "AnalyticsTrends", "AnalyticsComparison",
-    "AnalyticsExportRequest", "AnalyticsExportResponse",
-    "AnalyticsHealthCheck", "AnalyticsCleanupRequest", "AnalyticsCleanupResponse"
-]
+The schema modules are deliberately left as plain Python rather than compiled with Cython:
+their import cost is pydantic-core schema building, which already runs in Rust and is
+deferred here, not the class-body bytecode a compiler would speed up.
+"""
+import importlib
+
+_EXPORTS = {
+    "user": (
+        "UserProfile", "UserProfileResponse", "BusinessInfo", "Address", "BankInfo", "Wallet", "BusinessOwnerWallet",
+        "UserCreate", "UserUpdate", "UserResponse", "UserLogin", "UserLoginResponse",
+    ),
+    "credit_distribution": (
+        "CreditDistributionCreate", "CreditDistributionResponse", "CreditDistributionSummary",
+        "ResellerCreditStats", "BusinessOwnerCreditStats",
+    ),
+    "message": (
+        "MessageType", "MessageStatus", "Channel", "Mode",
+        "MessageTypeLiteral", "MessageStatusLiteral", "ChannelLiteral", "ModeLiteral", "MessageCreate", "MessageUpdate", "MessageResponse",
+        "MessageSendRequest", "BulkMessageRequest", "MessageStats", "UserMessageStats",
+        "MessageTemplate", "WebhookPayload",
+    ),
+    "unofficial_device": (
+        "DeviceType", "SessionStatus", "DeviceTypeLiteral", "SessionStatusLiteral",
+        "UnofficialDeviceCreate", "UnofficialDeviceUpdate", "UnofficialDeviceResponse",
+        "QRCodeRequest", "QRCodeResponse", "DeviceConnectRequest", "DeviceConnectResponse",
+        "DeviceDisconnectRequest", "DeviceDisconnectResponse", "DeviceStatusUpdate",
+        "DeviceStats", "UserDeviceStats", "BulkDeviceOperation", "DeviceHealthCheck",
+    ),
+    "device_session": (
+        "DeviceSessionCreate", "DeviceSessionUpdate", "DeviceSessionResponse",
+        "SessionCreateRequest", "SessionCreateResponse", "SessionValidateRequest", "SessionValidateResponse",
+        "SessionExtendRequest", "SessionExtendResponse", "SessionRevokeRequest", "SessionRevokeResponse",
+        "SessionLoginRequest", "SessionLoginResponse", "SessionActivityUpdate",
+        "SessionStats", "DeviceSessionStats", "UserSessionStats", "SessionStatsColumnar",
+        "BulkSessionOperation", "SessionCleanupRequest", "SessionCleanupResponse",
+    ),
+    "device_session_admin": ("SessionSecurityCheck", "SessionAuditLog", "SessionHealthCheck"),
+    "message_usage_log": (
+        "MessageUsageLogCreate", "MessageUsageLogUpdate", "MessageUsageLogResponse",
+        "MessageUsageLogSuccessResponse", "MessageUsageLogFailedResponse", "MessageUsageLogRefundedResponse",
+        "usage_log_response",
+        "UsageLogCreateRequest", "UsageLogCreateResponse", "UsageLogRefundRequest", "UsageLogRefundResponse",
+        "UsageLogUpdateRequest", "UsageLogUpdateResponse", "UsageSummary", "UsageStats", "UserUsageStats",
+        "DeviceUsageStats", "SessionUsageStats", "DailyUsage", "HourlyUsage", "TopUserUsage", "TopDeviceUsage",
+        "UsageAnalytics", "UsageFilter",
+        "BulkUsageOperation", "BulkUsageResponse", "UsageCleanupRequest", "UsageCleanupResponse",
+    ),
+    "message_usage_log_admin": ("UsageAuditLog", "UsageHealthCheck"),
+    "reseller_analytics": (
+        "ResellerAnalyticsResponse", "AnalyticsData", "BusinessUserStats",
+        "CreateAnalyticsRequest", "UpdateAnalyticsRequest",
+        "CreateBusinessUserStatsRequest", "UpdateBusinessUserStatsRequest",
+        "AnalyticsFilter", "AnalyticsSummary", "ResellerPerformanceMetrics",
+        "TopPerformersResponse", "AnalyticsTrends", "TrendPoint", "TrendPeriod", "AnalyticsComparison",
+        "AnalyticsExportRequest", "AnalyticsExportResponse",
+    ),
+    "reseller_analytics_admin": ("AnalyticsHealthCheck", "AnalyticsCleanupRequest", "AnalyticsCleanupResponse"),
+}
+
+_LAZY = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,16 @@
+"""One TypeAdapter per response schema, built the first time the schema is served.
+
+Endpoints that already hold a response model can serialize it straight to JSON bytes with
+ADAPTERS[type(obj)].dump_json(obj) instead of going through FastAPI's response_model pass.
+Adapters are created on demand so that DeferredModel schemas stay unbuilt until used.
+"""
+from typing import Dict
+
+from pydantic import TypeAdapter
+
+class _AdapterCache(Dict[type, TypeAdapter]):
+    def __missing__(self, cls: type) -> TypeAdapter:
+        adapter = self[cls] = TypeAdapter(cls)
+        return adapter
+
+ADAPTERS: Dict[type, TypeAdapter] = _AdapterCache()
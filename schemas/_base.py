@@ -0,0 +1,63 @@
+from typing import Any, Callable, ClassVar, Optional
+
+from pydantic import BaseModel, ConfigDict
+
+class DeferredModel(BaseModel):
+    """Schema whose validator and serializer are built on first use instead of at import"""
+    
+    model_config = ConfigDict(defer_build=True)
+
+def _compile_orm_builder(cls: type) -> Callable[[Any], Any]:
+    """Generate cls's from_orm_fast body with one read per field, unrolled.
+    
+    Loaded ORM instances are read straight from their instance __dict__, skipping the
+    SQLAlchemy attribute descriptors. Core rows (no __dict__) and instances with expired or
+    unloaded columns (missing keys) fall back to plain attribute access, which loads them.
+    """
+    names = tuple(cls.model_fields)
+    from_state = ", ".join(f"{name!r}: state[{name!r}]" for name in names)
+    from_attributes = ", ".join(f"{name!r}: obj.{name}" for name in names)
+    source = (
+        "def build(obj):\n"
+        "    try:\n"
+        "        state = obj.__dict__\n"
+        f"        values = {{{from_state}}}\n"
+        "    except (AttributeError, KeyError):\n"
+        f"        values = {{{from_attributes}}}\n"
+        "    instance = new(cls)\n"
+        "    setattr(instance, '__dict__', values)\n"
+        "    setattr(instance, '__pydantic_fields_set__', set(names))\n"
+        "    setattr(instance, '__pydantic_extra__', None)\n"
+        "    setattr(instance, '__pydantic_private__', None)\n"
+        "    return instance\n"
+    )
+    namespace = {"cls": cls, "names": names, "new": object.__new__, "setattr": object.__setattr__}
+    exec(compile(source, f"<from_orm_fast {cls.__qualname__}>", "exec"), namespace)
+    return namespace["build"]
+
+class ORMResponse(BaseModel):
+    """Response schema populated from database rows"""
+    
+    _build_from_orm: ClassVar[Optional[Callable[[Any], Any]]] = None
+    
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+        # Private attributes and post-init hooks need model_construct's full path
+        if cls.__private_attributes__ or cls.__pydantic_post_init__:
+            cls._build_from_orm = None
+        else:
+            cls._build_from_orm = staticmethod(_compile_orm_builder(cls))
+    
+    @classmethod
+    def from_orm_fast(cls, obj):
+        """Build from a trusted ORM object without validation.
+        
+        Only for rows the application wrote itself: values are neither coerced nor checked,
+        so never use this on client input or on schemas that define validators. The result
+        matches model_construct(); the per-class builder just skips its generic field loop.
+        """
+        build = cls._build_from_orm
+        if build is None:
+            return cls.model_construct(**{name: getattr(obj, name) for name in cls.model_fields})
+        return build(obj)
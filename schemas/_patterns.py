@@ -0,0 +1,22 @@
+"""Validation constants and types shared by the request schemas"""
+from datetime import datetime, timezone
+from typing import Annotated
+
+from pydantic import AfterValidator, IPvAnyAddress
+
+# Parsed as a real IPv4/IPv6 address, then handed on as its canonical string for the String columns
+IPAddress = Annotated[IPvAnyAddress, AfterValidator(str)]
+
+def _to_naive_utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+# ISO-8601 or Unix epoch seconds/milliseconds (pydantic reads numbers without the ISO parser).
+# Epoch input comes back tz-aware, so normalize to the naive UTC the DateTime columns hold.
+UtcTimestamp = Annotated[datetime, AfterValidator(_to_naive_utc)]
+
+E164_PATTERN = r'^\+?[1-9]\d{1,14}$'
+
+USER_AGENT_MAX_LENGTH = 500
+MESSAGE_BODY_MAX_LENGTH = 4096
@@ -1,21 +1,23 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import List, Optional
 from datetime import datetime
+from schemas._base import ORMResponse
 
 class CreditDistributionCreate(BaseModel):
     from_reseller_id: str
     to_business_user_id: str
     credits_shared: int = Field(..., gt=0, description="Credits must be greater than 0")
 
-class CreditDistributionResponse(BaseModel):
+class CreditDistributionResponse(ORMResponse):
     distribution_id: str
     from_reseller_id: str
     to_business_user_id: str
     credits_shared: int
     shared_at: datetime
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+CREDIT_DISTRIBUTION_LIST_ADAPTER = TypeAdapter(List[CreditDistributionResponse])
 
 class CreditDistributionSummary(BaseModel):
     total_distributed: int
@@ -1,12 +1,16 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import ConfigDict, Field, field_validator
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
+from schemas._patterns import IPAddress, USER_AGENT_MAX_LENGTH
+from schemas._base import DeferredModel, ORMResponse
 
 class SessionType(str, Enum):
     UNOFFICIAL = "unofficial"
     OFFICIAL = "official"
 
+SessionTypeLiteral = Literal["unofficial", "official"]
+
 class SessionStatus(str, Enum):
     ACTIVE = "active"
     EXPIRED = "expired"
@@ -14,25 +18,27 @@ class SessionStatus(str, Enum):
     COMPROMISED = "compromised"
     LOCKED = "locked"
 
-class DeviceSessionCreate(BaseModel):
+SessionStatusLiteral = Literal["active", "expired", "revoked", "compromised", "locked"]
+
+class DeviceSessionCreate(DeferredModel):
     device_id: str
-    session_type: SessionType = SessionType.UNOFFICIAL
-    user_agent: Optional[str] = Field(None, max_length=500)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    session_type: SessionTypeLiteral = "unofficial"
+    user_agent: Optional[str] = Field(None, max_length=USER_AGENT_MAX_LENGTH)
+    ip_address: Optional[IPAddress] = None
     expires_in_hours: int = Field(default=24, gt=0, le=168)  # Max 7 days
     max_login_attempts: int = Field(default=5, gt=0, le=10)
 
-class DeviceSessionUpdate(BaseModel):
+class DeviceSessionUpdate(DeferredModel):
     is_valid: Optional[bool] = None
     is_active: Optional[bool] = None
-    user_agent: Optional[str] = Field(None, max_length=500)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    user_agent: Optional[str] = Field(None, max_length=USER_AGENT_MAX_LENGTH)
+    ip_address: Optional[IPAddress] = None
     requires_reauth: Optional[bool] = None
 
-class DeviceSessionResponse(BaseModel):
+class DeviceSessionResponse(ORMResponse):
     session_id: str
     device_id: str
-    session_type: SessionType
+    session_type: SessionTypeLiteral
     is_valid: bool
     is_active: bool
     user_agent: Optional[str] = None
@@ -53,17 +59,16 @@ class DeviceSessionResponse(BaseModel):
     compromise_reason: Optional[str] = None
     requires_reauth: bool
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True, defer_build=True)
 
-class SessionCreateRequest(BaseModel):
+class SessionCreateRequest(DeferredModel):
     device_id: str
     session_data: str = Field(..., min_length=1, max_length=10000)  # Raw session data to encrypt
-    user_agent: Optional[str] = Field(None, max_length=500)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    user_agent: Optional[str] = Field(None, max_length=USER_AGENT_MAX_LENGTH)
+    ip_address: Optional[IPAddress] = None
     expires_in_hours: int = Field(default=24, gt=0, le=168)
 
-class SessionCreateResponse(BaseModel):
+class SessionCreateResponse(DeferredModel):
     session_id: str
     device_id: str
     session_token: str  # Encrypted session data
@@ -71,11 +76,11 @@ class SessionCreateResponse(BaseModel):
     created_at: datetime
     is_valid: bool
 
-class SessionValidateRequest(BaseModel):
+class SessionValidateRequest(DeferredModel):
     session_id: str
     session_token: str  # For additional validation if needed
 
-class SessionValidateResponse(BaseModel):
+class SessionValidateResponse(DeferredModel):
     session_id: str
     is_valid: bool
     is_active: bool
@@ -86,34 +91,34 @@ class SessionValidateResponse(BaseModel):
     last_activity: datetime
     message: str
 
-class SessionExtendRequest(BaseModel):
+class SessionExtendRequest(DeferredModel):
     session_id: str
     extend_hours: int = Field(default=24, gt=0, le=168)
     reason: Optional[str] = Field(None, max_length=500)
 
-class SessionExtendResponse(BaseModel):
+class SessionExtendResponse(DeferredModel):
     session_id: str
     old_expires_at: datetime
     new_expires_at: datetime
     extended_at: datetime
     message: str
 
-class SessionRevokeRequest(BaseModel):
+class SessionRevokeRequest(DeferredModel):
     session_id: str
     reason: Optional[str] = Field(None, max_length=500)
 
-class SessionRevokeResponse(BaseModel):
+class SessionRevokeResponse(DeferredModel):
     session_id: str
     revoked_at: datetime
     reason: Optional[str] = None
     message: str
 
-class SessionLoginRequest(BaseModel):
+class SessionLoginRequest(DeferredModel):
     session_id: str
     password: Optional[str] = None  # For session re-authentication
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    ip_address: Optional[IPAddress] = None
 
-class SessionLoginResponse(BaseModel):
+class SessionLoginResponse(DeferredModel):
     session_id: str
     login_successful: bool
     login_attempts_remaining: int
@@ -121,17 +126,17 @@ class SessionLoginResponse(BaseModel):
     requires_reauth: bool
     message: str
 
-class SessionActivityUpdate(BaseModel):
+class SessionActivityUpdate(DeferredModel):
     session_id: str
     activity_type: str = Field(..., max_length=50)  # message_sent, status_check, etc.
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    ip_address: Optional[IPAddress] = None
     metadata: Optional[dict] = None
 
-class SessionStats(BaseModel):
+class SessionStats(DeferredModel):
     session_id: str
     device_id: str
-    session_type: SessionType
-    status: SessionStatus
+    session_type: SessionTypeLiteral
+    status: SessionStatusLiteral
     created_at: datetime
     expires_at: datetime
     last_activity: datetime
@@ -140,7 +145,7 @@ class SessionStats(BaseModel):
     uptime_hours: Optional[float] = None
     requests_per_hour: Optional[float] = None
 
-class DeviceSessionStats(BaseModel):
+class DeviceSessionStats(DeferredModel):
     device_id: str
     total_sessions: int
     active_sessions: int
@@ -152,7 +157,7 @@ class DeviceSessionStats(BaseModel):
     average_session_duration: Optional[float] = None
     sessions: List[SessionStats]
 
-class UserSessionStats(BaseModel):
+class UserSessionStats(DeferredModel):
     user_id: str
     total_devices: int
     total_sessions: int
@@ -164,42 +169,33 @@ class UserSessionStats(BaseModel):
     total_messages_sent: int
     devices: List[DeviceSessionStats]
 
-class SessionSecurityCheck(BaseModel):
-    session_id: str
-    security_issues: List[str]
-    risk_level: str  # low, medium, high, critical
-    recommendations: List[str]
-    last_check: datetime
-
-class BulkSessionOperation(BaseModel):
-    session_ids: List[str] = Field(..., min_items=1, max_items=100)
+class SessionStatsColumnar(DeferredModel):
+    """SessionStats for many sessions as parallel lists; index i of every list is one session"""
+    session_ids: List[str]
+    device_ids: List[str]
+    session_types: List[SessionTypeLiteral]
+    statuses: List[SessionStatusLiteral]
+    created_ats: List[datetime]
+    expires_ats: List[datetime]
+    last_activities: List[datetime]
+    total_requests: List[int]
+    messages_sent_via_session: List[int]
+    uptime_hours: List[float]
+    requests_per_hour: List[float]
+
+class BulkSessionOperation(DeferredModel):
+    session_ids: List[str] = Field(..., min_length=1, max_length=100)
     operation: str  # revoke, extend, deactivate, reactivate
     parameters: Optional[dict] = None
 
-class SessionCleanupRequest(BaseModel):
+class SessionCleanupRequest(DeferredModel):
     cleanup_type: str = Field(..., max_length=50)  # expired, inactive, compromised
     dry_run: bool = Field(default=True)  # If true, only report what would be cleaned
 
-class SessionCleanupResponse(BaseModel):
+class SessionCleanupResponse(DeferredModel):
     cleanup_type: str
     sessions_cleaned: int
     sessions_affected: List[str]
     cleanup_time: datetime
     dry_run: bool
     message: str
-
-class SessionAuditLog(BaseModel):
-    session_id: str
-    action: str  # create, login, extend, revoke, compromise
-    timestamp: datetime
-    ip_address: Optional[str] = None
-    user_agent: Optional[str] = None
-    details: Optional[dict] = None
-
-class SessionHealthCheck(BaseModel):
-    session_id: str
-    is_healthy: bool
-    health_score: float  # 0.0 to 1.0
-    issues: List[str]
-    recommendations: List[str]
-    last_check: datetime
@@ -0,0 +1,31 @@
+"""Session security, audit and health-check schemas.
+
+Only the admin tooling builds these, so they live outside schemas.device_session and are not
+compiled when the session endpoints are imported.
+"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class SessionSecurityCheck(BaseModel):
+    session_id: str
+    security_issues: List[str]
+    risk_level: str  # low, medium, high, critical
+    recommendations: List[str]
+    last_check: datetime
+
+class SessionAuditLog(BaseModel):
+    session_id: str
+    action: str  # create, login, extend, revoke, compromise
+    timestamp: datetime
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+    details: Optional[dict] = None
+
+class SessionHealthCheck(BaseModel):
+    session_id: str
+    is_healthy: bool
+    health_score: float  # 0.0 to 1.0
+    issues: List[str]
+    recommendations: List[str]
+    last_check: datetime
@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter, field_validator
+from typing import Annotated, Optional, List, Literal
 from datetime import datetime
 from enum import Enum
+from schemas._patterns import E164_PATTERN, MESSAGE_BODY_MAX_LENGTH, UtcTimestamp
+from schemas._base import ORMResponse
 
 class MessageType(str, Enum):
     OTP = "otp"
@@ -10,6 +12,8 @@ class MessageType(str, Enum):
     MEDIA = "media"
     DOCUMENT = "document"
 
+MessageTypeLiteral = Literal["otp", "text", "template", "media", "document"]
+
 class MessageStatus(str, Enum):
     PENDING = "pending"
     SENT = "sent"
@@ -17,24 +21,30 @@ class MessageStatus(str, Enum):
     FAILED = "failed"
     READ = "read"
 
+MessageStatusLiteral = Literal["pending", "sent", "delivered", "failed", "read"]
+
 class Channel(str, Enum):
     WHATSAPP = "whatsapp"
     SMS = "sms"
     EMAIL = "email"
 
+ChannelLiteral = Literal["whatsapp", "sms", "email"]
+
 class Mode(str, Enum):
     OFFICIAL = "official"
     UNOFFICIAL = "unofficial"
 
+ModeLiteral = Literal["official", "unofficial"]
+
 class MessageCreate(BaseModel):
     user_id: str
-    channel: Channel = Channel.WHATSAPP
-    mode: Mode
-    sender_number: str = Field(..., pattern=r'^\+?[1-9]\d{1,14}$')
-    receiver_number: str = Field(..., pattern=r'^\+?[1-9]\d{1,14}$')
-    message_type: MessageType
+    channel: ChannelLiteral = "whatsapp"
+    mode: ModeLiteral
+    sender_number: str = Field(..., pattern=E164_PATTERN)
+    receiver_number: str = Field(..., pattern=E164_PATTERN)
+    message_type: MessageTypeLiteral
     template_name: Optional[str] = None
-    message_body: str = Field(..., min_length=1, max_length=4096)
+    message_body: str = Field(..., min_length=1, max_length=MESSAGE_BODY_MAX_LENGTH)
     credits_used: int = Field(default=1, gt=0)
     
     @field_validator('template_name')
@@ -45,24 +55,24 @@ class MessageCreate(BaseModel):
         return v
 
 class MessageUpdate(BaseModel):
-    status: Optional[MessageStatus] = None
-    delivered_at: Optional[datetime] = None
-    read_at: Optional[datetime] = None
+    status: Optional[MessageStatusLiteral] = None
+    delivered_at: Optional[UtcTimestamp] = None
+    read_at: Optional[UtcTimestamp] = None
     error_message: Optional[str] = None
     external_message_id: Optional[str] = None
     webhook_response: Optional[str] = None
 
-class MessageResponse(BaseModel):
+class MessageResponse(ORMResponse):
     message_id: str
     user_id: str
-    channel: Channel
-    mode: Mode
+    channel: ChannelLiteral
+    mode: ModeLiteral
     sender_number: str
     receiver_number: str
-    message_type: MessageType
+    message_type: MessageTypeLiteral
     template_name: Optional[str] = None
     message_body: str
-    status: MessageStatus
+    status: MessageStatusLiteral
     credits_used: int
     sent_at: datetime
     delivered_at: Optional[datetime] = None
@@ -72,22 +82,30 @@ class MessageResponse(BaseModel):
     retry_count: int
     max_retries: int
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+# Message listings validate straight from ORM rows and dump JSON through this adapter
+MESSAGE_RESPONSE_LIST_ADAPTER = TypeAdapter(List[MessageResponse])
 
 class MessageSendRequest(BaseModel):
-    receiver_number: str = Field(..., pattern=r'^\+?[1-9]\d{1,14}$')
-    message_type: MessageType
+    receiver_number: str = Field(..., pattern=E164_PATTERN)
+    message_type: MessageTypeLiteral
     template_name: Optional[str] = None
-    message_body: str = Field(..., min_length=1, max_length=4096)
-    mode: Mode = Mode.UNOFFICIAL
+    message_body: str = Field(..., min_length=1, max_length=MESSAGE_BODY_MAX_LENGTH)
+    mode: ModeLiteral = "unofficial"
+
+PhoneNumber = Annotated[str, StringConstraints(pattern=E164_PATTERN)]
+
+# Checks a whole receiver list in one call; each error's loc is the index of the bad number.
+# The pattern runs on pydantic-core's Rust regex engine, which does not backtrack.
+RECEIVER_NUMBERS_ADAPTER = TypeAdapter(List[PhoneNumber])
 
 class BulkMessageRequest(BaseModel):
-    receiver_numbers: List[str] = Field(..., min_items=1, max_items=1000)
-    message_type: MessageType
+    receiver_numbers: List[str] = Field(..., min_length=1, max_length=1000)
+    message_type: MessageTypeLiteral
     template_name: Optional[str] = None
-    message_body: str = Field(..., min_length=1, max_length=4096)
-    mode: Mode = Mode.UNOFFICIAL
+    message_body: str = Field(..., min_length=1, max_length=MESSAGE_BODY_MAX_LENGTH)
+    mode: ModeLiteral = "unofficial"
 
 class MessageStats(BaseModel):
     total_messages: int
@@ -105,14 +123,14 @@ class UserMessageStats(BaseModel):
 class MessageTemplate(BaseModel):
     template_name: str
     template_body: str
-    message_type: MessageType
+    message_type: MessageTypeLiteral
     credits_required: int = 1
     is_active: bool = True
 
 class WebhookPayload(BaseModel):
     message_id: str
-    status: MessageStatus
+    status: MessageStatusLiteral
     external_message_id: Optional[str] = None
-    delivered_at: Optional[datetime] = None
-    read_at: Optional[datetime] = None
+    delivered_at: Optional[UtcTimestamp] = None
+    read_at: Optional[UtcTimestamp] = None
     error_message: Optional[str] = None
@@ -1,9 +1,14 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
-from datetime import datetime
-from decimal import Decimal
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter, field_validator
+from typing import Annotated, Literal, Optional, List, Union
+from datetime import date, datetime
+from uuid import UUID
 from enum import Enum
+from schemas._patterns import IPAddress, USER_AGENT_MAX_LENGTH, UtcTimestamp
+from schemas._base import ORMResponse
 
+# Unlike the message and device schemas these stay Enum fields, since the usage log columns are
+# SQLAlchemy Enums. Pydantic resolves a value with one _value2member_map_ lookup, so there is
+# nothing for a converter cache to save.
 class UsageType(str, Enum):
     MESSAGE_SEND = "message_send"
     MESSAGE_RECEIVE = "message_receive"
@@ -34,8 +39,8 @@ class MessageUsageLogCreate(BaseModel):
     message_type: Optional[str] = Field(None, max_length=50)
     message_size: Optional[int] = Field(None, ge=0)
     recipient_count: int = Field(default=1, ge=1)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
-    user_agent: Optional[str] = Field(None, max_length=500)
+    ip_address: Optional[IPAddress] = None
+    user_agent: Optional[str] = Field(None, max_length=USER_AGENT_MAX_LENGTH)
     api_endpoint: Optional[str] = Field(None, max_length=200)
     request_id: Optional[str] = Field(None, max_length=100)
 
@@ -44,9 +49,9 @@ class MessageUsageLogUpdate(BaseModel):
     error_code: Optional[str] = Field(None, max_length=50)
     error_message: Optional[str] = Field(None, max_length=500)
     delivery_status: Optional[str] = Field(None, max_length=50)
-    processed_at: Optional[datetime] = None
+    processed_at: Optional[UtcTimestamp] = None
 
-class MessageUsageLogResponse(BaseModel):
+class _UsageLogResponseBase(ORMResponse):
     usage_id: str
     user_id: str
     message_id: Optional[str] = None
@@ -65,22 +70,49 @@ class MessageUsageLogResponse(BaseModel):
     message_size: Optional[int] = None
     recipient_count: int
     delivery_status: Optional[str] = None
-    status: UsageStatus
-    error_code: Optional[str] = None
-    error_message: Optional[str] = None
     ip_address: Optional[str] = None
     user_agent: Optional[str] = None
     api_endpoint: Optional[str] = None
     request_id: Optional[str] = None
-    refund_reason: Optional[str] = None
-    refund_timestamp: Optional[datetime] = None
-    refund_processed_by: Optional[str] = None
     created_at: datetime
     updated_at: datetime
     processed_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+class MessageUsageLogSuccessResponse(_UsageLogResponseBase):
+    status: Literal[UsageStatus.SUCCESS, UsageStatus.PENDING, UsageStatus.DISPUTED]
+
+class MessageUsageLogFailedResponse(_UsageLogResponseBase):
+    status: Literal[UsageStatus.FAILED]
+    error_code: Optional[str] = None
+    error_message: Optional[str] = None
+
+class MessageUsageLogRefundedResponse(_UsageLogResponseBase):
+    status: Literal[UsageStatus.REFUNDED]
+    refund_reason: str
+    refund_timestamp: datetime
+    refund_processed_by: Optional[str] = None
+
+# Tagged by status, so validation goes straight to the matching variant
+MessageUsageLogResponse = Annotated[
+    Union[MessageUsageLogSuccessResponse, MessageUsageLogFailedResponse, MessageUsageLogRefundedResponse],
+    Field(discriminator="status"),
+]
+
+_USAGE_LOG_RESPONSES = {
+    UsageStatus.SUCCESS: MessageUsageLogSuccessResponse,
+    UsageStatus.PENDING: MessageUsageLogSuccessResponse,
+    UsageStatus.DISPUTED: MessageUsageLogSuccessResponse,
+    UsageStatus.FAILED: MessageUsageLogFailedResponse,
+    UsageStatus.REFUNDED: MessageUsageLogRefundedResponse,
+}
+
+def usage_log_response(usage_log) -> MessageUsageLogResponse:
+    """Build the response variant matching a usage log's status"""
+    return _USAGE_LOG_RESPONSES[usage_log.status].from_orm_fast(usage_log)
+
+USAGE_LOG_RESPONSE_LIST_ADAPTER = TypeAdapter(List[MessageUsageLogResponse])
 
 class UsageLogCreateRequest(BaseModel):
     user_id: str
@@ -93,8 +125,8 @@ class UsageLogCreateRequest(BaseModel):
     message_type: Optional[str] = Field(None, max_length=50)
     message_size: Optional[int] = Field(None, ge=0)
     recipient_count: int = Field(default=1, ge=1)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
-    user_agent: Optional[str] = Field(None, max_length=500)
+    ip_address: Optional[IPAddress] = None
+    user_agent: Optional[str] = Field(None, max_length=USER_AGENT_MAX_LENGTH)
     api_endpoint: Optional[str] = Field(None, max_length=200)
     request_id: Optional[str] = Field(None, max_length=100)
 
@@ -136,6 +168,25 @@ class UsageLogUpdateResponse(BaseModel):
     updated_at: datetime
     message: str
 
+class UsageSummary(BaseModel):
+    usage_id: str
+    user_id: str
+    message_id: Optional[str] = None
+    usage_type: UsageType
+    credits_deducted: int
+    credits_refunded: int
+    net_credits: int
+    balance_before: int
+    balance_after: int
+    total_cost: float
+    currency: str
+    status: UsageStatus
+    created_at: Optional[datetime] = None
+    is_successful: bool
+    is_refunded: bool
+
+USAGE_SUMMARY_LIST_ADAPTER = TypeAdapter(List[UsageSummary])
+
 class UsageStats(BaseModel):
     total_usage: int
     total_credits_deducted: int
@@ -149,6 +200,24 @@ class UsageStats(BaseModel):
     usage_by_type: dict
     usage_by_status: dict
 
+class DailyUsage(BaseModel):
+    date: date
+    usage_count: int
+
+class HourlyUsage(BaseModel):
+    hour: str  # "HH:00"
+    usage_count: int
+
+class TopUserUsage(BaseModel):
+    user_id: str
+    usage_count: int
+    credits_used: int
+
+class TopDeviceUsage(BaseModel):
+    device_id: str
+    usage_count: int
+    credits_used: int
+
 class UserUsageStats(BaseModel):
     user_id: str
     total_usage: int
@@ -159,8 +228,8 @@ class UserUsageStats(BaseModel):
     current_balance: int
     usage_by_type: dict
     usage_by_status: dict
-    daily_usage: List[dict]
-    hourly_usage: List[dict]
+    daily_usage: List[DailyUsage]
+    hourly_usage: List[HourlyUsage]
 
 class DeviceUsageStats(BaseModel):
     device_id: str
@@ -172,7 +241,7 @@ class DeviceUsageStats(BaseModel):
     total_cost: float
     usage_by_type: dict
     usage_by_status: dict
-    daily_usage: List[dict]
+    daily_usage: List[DailyUsage]
 
 class SessionUsageStats(BaseModel):
     session_id: str
@@ -195,13 +264,14 @@ class UsageAnalytics(BaseModel):
     net_credits_used: int
     total_revenue: float
     average_usage_per_user: float
-    top_users_by_usage: List[dict]
-    top_devices_by_usage: List[dict]
-    usage_trends: List[dict]
+    top_users_by_usage: List[TopUserUsage]
+    top_devices_by_usage: List[TopDeviceUsage]
+    usage_trends: List[DailyUsage]
     cost_analysis: dict
 
 class UsageFilter(BaseModel):
     user_id: Optional[str] = None
+    reseller_id: Optional[str] = None
     device_id: Optional[str] = None
     session_id: Optional[str] = None
     message_id: Optional[str] = None
@@ -214,7 +284,7 @@ class UsageFilter(BaseModel):
 
 class BulkUsageOperation(BaseModel):
     operation: str = Field(..., pattern=r'^(refund|update|delete)$')
-    usage_ids: List[str] = Field(..., min_items=1, max_items=100)
+    usage_ids: List[UUID] = Field(..., min_length=1, max_length=100)
     refund_amount: Optional[int] = Field(None, gt=0)
     refund_reason: Optional[str] = Field(None, min_length=1, max_length=500)
     new_status: Optional[UsageStatus] = None
@@ -228,25 +298,6 @@ class BulkUsageResponse(BaseModel):
     errors: List[dict]
     message: str
 
-class UsageAuditLog(BaseModel):
-    audit_id: str
-    usage_id: str
-    action: str
-    old_values: dict
-    new_values: dict
-    changed_by: str
-    changed_at: datetime
-    ip_address: Optional[str] = None
-    user_agent: Optional[str] = None
-
-class UsageHealthCheck(BaseModel):
-    usage_id: str
-    is_healthy: bool
-    health_score: float
-    issues: List[str]
-    recommendations: List[str]
-    last_checked: datetime
-
 class UsageCleanupRequest(BaseModel):
     older_than_days: int = Field(default=30, gt=0)
     status_filter: Optional[List[UsageStatus]] = None
@@ -0,0 +1,23 @@
+"""Usage log audit and health-check schemas, split out of schemas.message_usage_log"""
+from pydantic import BaseModel
+from typing import Optional, List
+from datetime import datetime
+
+class UsageAuditLog(BaseModel):
+    audit_id: str
+    usage_id: str
+    action: str
+    old_values: dict
+    new_values: dict
+    changed_by: str
+    changed_at: datetime
+    ip_address: Optional[str] = None
+    user_agent: Optional[str] = None
+
+class UsageHealthCheck(BaseModel):
+    usage_id: str
+    is_healthy: bool
+    health_score: float
+    issues: List[str]
+    recommendations: List[str]
+    last_checked: datetime
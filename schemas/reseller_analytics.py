@@ -1,7 +1,8 @@
-from pydantic import BaseModel, Field
+from pydantic import ConfigDict, Field
 from typing import List, Optional, Dict, Any
 from datetime import datetime
 from enum import Enum
+from schemas._base import DeferredModel
 
 class AnalyticsPeriod(str, Enum):
     DAILY = "daily"
@@ -11,7 +12,7 @@ class AnalyticsPeriod(str, Enum):
     YEARLY = "yearly"
 
 # Business User Stats Schema
-class BusinessUserStats(BaseModel):
+class BusinessUserStats(DeferredModel):
     user_id: str
     business_name: Optional[str] = None
     credits_allocated: int = 0
@@ -28,11 +29,10 @@ class BusinessUserStats(BaseModel):
     period_start: Optional[datetime] = None
     period_end: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # Analytics Data Schema
-class AnalyticsData(BaseModel):
+class AnalyticsData(DeferredModel):
     total_credits_purchased: int = 0
     total_credits_distributed: int = 0
     total_credits_used: int = 0
@@ -50,20 +50,18 @@ class AnalyticsData(BaseModel):
     period_start: Optional[datetime] = None
     period_end: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # Main Reseller Analytics Response Schema
-class ResellerAnalyticsResponse(BaseModel):
+class ResellerAnalyticsResponse(DeferredModel):
     reseller_id: str
     analytics: AnalyticsData
     business_user_stats: List[BusinessUserStats] = []
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
 
 # Create Analytics Request Schema
-class CreateAnalyticsRequest(BaseModel):
+class CreateAnalyticsRequest(DeferredModel):
     reseller_id: str
     analytics_period: AnalyticsPeriod = AnalyticsPeriod.MONTHLY
     period_start: datetime
@@ -83,7 +81,7 @@ class CreateAnalyticsRequest(BaseModel):
     total_messages_failed: int = 0
 
 # Update Analytics Request Schema
-class UpdateAnalyticsRequest(BaseModel):
+class UpdateAnalyticsRequest(DeferredModel):
     total_credits_purchased: Optional[int] = None
     total_credits_distributed: Optional[int] = None
     total_credits_used: Optional[int] = None
@@ -99,7 +97,7 @@ class UpdateAnalyticsRequest(BaseModel):
     total_messages_failed: Optional[int] = None
 
 # Business User Stats Create Request
-class CreateBusinessUserStatsRequest(BaseModel):
+class CreateBusinessUserStatsRequest(DeferredModel):
     reseller_analytics_id: str
     user_id: str
     credits_allocated: int = 0
@@ -117,7 +115,7 @@ class CreateBusinessUserStatsRequest(BaseModel):
     period_end: datetime
 
 # Business User Stats Update Request
-class UpdateBusinessUserStatsRequest(BaseModel):
+class UpdateBusinessUserStatsRequest(DeferredModel):
     credits_allocated: Optional[int] = None
     credits_used: Optional[int] = None
     credits_remaining: Optional[int] = None
@@ -131,7 +129,7 @@ class UpdateBusinessUserStatsRequest(BaseModel):
     revenue_generated: Optional[float] = None
 
 # Analytics Filter Schema
-class AnalyticsFilter(BaseModel):
+class AnalyticsFilter(DeferredModel):
     reseller_id: Optional[str] = None
     analytics_period: Optional[AnalyticsPeriod] = None
     start_date: Optional[datetime] = None
@@ -139,7 +137,7 @@ class AnalyticsFilter(BaseModel):
     include_business_stats: bool = True
 
 # Analytics Summary Schema
-class AnalyticsSummary(BaseModel):
+class AnalyticsSummary(DeferredModel):
     total_resellers: int
     total_credits_purchased: int
     total_credits_distributed: int
@@ -152,7 +150,7 @@ class AnalyticsSummary(BaseModel):
     average_delivery_rate: float
 
 # Reseller Performance Metrics
-class ResellerPerformanceMetrics(BaseModel):
+class ResellerPerformanceMetrics(DeferredModel):
     reseller_id: str
     reseller_name: Optional[str] = None
     total_credits_purchased: int
@@ -170,27 +168,43 @@ class ResellerPerformanceMetrics(BaseModel):
     rank: Optional[int] = None
 
 # Top Performers Schema
-class TopPerformersResponse(BaseModel):
+class TopPerformersResponse(DeferredModel):
     top_resellers_by_revenue: List[ResellerPerformanceMetrics]
     top_resellers_by_credits: List[ResellerPerformanceMetrics]
     top_resellers_by_users: List[ResellerPerformanceMetrics]
 
-# Analytics Trends Schema
-class AnalyticsTrends(BaseModel):
+# Analytics Trends Schemas
+class TrendPoint(DeferredModel):
+    period: datetime
+    value: float
+
+class TrendPeriod(DeferredModel):
+    period_start: datetime
+    period_end: datetime
+    total_credits_purchased: int
+    total_credits_distributed: int
+    total_credits_used: int
+    total_revenue: float
+    total_business_users: int
+    total_messages_sent: int
+    credit_utilization: float
+    delivery_rate: float
+
+class AnalyticsTrends(DeferredModel):
     reseller_id: str
     period: AnalyticsPeriod
-    trend_data: List[Dict[str, Any]]
+    trend_data: List[TrendPeriod]
     
     # Trend metrics
-    credits_purchased_trend: List[Dict[str, Any]]
-    credits_distributed_trend: List[Dict[str, Any]]
-    credits_used_trend: List[Dict[str, Any]]
-    revenue_trend: List[Dict[str, Any]]
-    business_users_trend: List[Dict[str, Any]]
-    messages_sent_trend: List[Dict[str, Any]]
+    credits_purchased_trend: List[TrendPoint]
+    credits_distributed_trend: List[TrendPoint]
+    credits_used_trend: List[TrendPoint]
+    revenue_trend: List[TrendPoint]
+    business_users_trend: List[TrendPoint]
+    messages_sent_trend: List[TrendPoint]
 
 # Analytics Comparison Schema
-class AnalyticsComparison(BaseModel):
+class AnalyticsComparison(DeferredModel):
     current_period: AnalyticsData
     previous_period: AnalyticsData
     comparison_metrics: Dict[str, float]  # Percentage changes
@@ -204,7 +218,7 @@ class AnalyticsComparison(BaseModel):
     messages_sent_growth: float
 
 # Analytics Export Schema
-class AnalyticsExportRequest(BaseModel):
+class AnalyticsExportRequest(DeferredModel):
     reseller_id: Optional[str] = None
     analytics_period: AnalyticsPeriod = AnalyticsPeriod.MONTHLY
     start_date: datetime
@@ -214,7 +228,7 @@ class AnalyticsExportRequest(BaseModel):
     include_trends: bool = False
 
 # Analytics Export Response
-class AnalyticsExportResponse(BaseModel):
+class AnalyticsExportResponse(DeferredModel):
     export_id: str
     file_url: Optional[str] = None
     export_status: str  # pending, processing, completed, failed
@@ -222,26 +236,3 @@ class AnalyticsExportResponse(BaseModel):
     file_size: Optional[int] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
-
-# Analytics Health Check
-class AnalyticsHealthCheck(BaseModel):
-    status: str  # healthy, warning, error
-    total_analytics_records: int
-    last_updated: Optional[datetime] = None
-    data_freshness: str  # fresh, stale, outdated
-    issues: List[str] = []
-    recommendations: List[str] = []
-
-# Analytics Cleanup Request
-class AnalyticsCleanupRequest(BaseModel):
-    older_than_days: int = 365
-    analytics_period: Optional[AnalyticsPeriod] = None
-    dry_run: bool = True
-
-# Analytics Cleanup Response
-class AnalyticsCleanupResponse(BaseModel):
-    total_records_found: int
-    records_to_delete: int
-    records_deleted: int
-    dry_run: bool
-    message: str
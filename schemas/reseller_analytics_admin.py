@@ -0,0 +1,29 @@
+"""Analytics maintenance schemas (health check and cleanup), imported on demand"""
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+from schemas.reseller_analytics import AnalyticsPeriod
+
+# Analytics Health Check
+class AnalyticsHealthCheck(BaseModel):
+    status: str  # healthy, warning, error
+    total_analytics_records: int
+    last_updated: Optional[datetime] = None
+    data_freshness: str  # fresh, stale, outdated
+    issues: List[str] = []
+    recommendations: List[str] = []
+
+# Analytics Cleanup Request
+class AnalyticsCleanupRequest(BaseModel):
+    older_than_days: int = 365
+    analytics_period: Optional[AnalyticsPeriod] = None
+    dry_run: bool = True
+
+# Analytics Cleanup Response
+class AnalyticsCleanupResponse(BaseModel):
+    total_records_found: int
+    records_to_delete: int
+    records_deleted: int
+    dry_run: bool
+    message: str
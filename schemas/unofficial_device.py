@@ -1,13 +1,17 @@
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional, List
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from typing import Optional, List, Literal
 from datetime import datetime
 from enum import Enum
+from schemas._base import ORMResponse
+from schemas._patterns import IPAddress
 
 class DeviceType(str, Enum):
     WEB = "web"
     MOBILE = "mobile"
     DESKTOP = "desktop"
 
+DeviceTypeLiteral = Literal["web", "mobile", "desktop"]
+
 class SessionStatus(str, Enum):
     CONNECTED = "connected"
     DISCONNECTED = "disconnected"
@@ -15,30 +19,32 @@ class SessionStatus(str, Enum):
     BANNED = "banned"
     PENDING = "pending"
 
+SessionStatusLiteral = Literal["connected", "disconnected", "expired", "banned", "pending"]
+
 class UnofficialDeviceCreate(BaseModel):
     user_id: str
     device_name: str = Field(..., min_length=1, max_length=100)
-    device_type: DeviceType
+    device_type: DeviceTypeLiteral
     device_os: Optional[str] = Field(None, max_length=50)
     browser_info: Optional[str] = Field(None, max_length=500)
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    ip_address: Optional[IPAddress] = None
     max_daily_messages: int = Field(default=1000, gt=0, le=10000)
 
 class UnofficialDeviceUpdate(BaseModel):
     device_name: Optional[str] = Field(None, min_length=1, max_length=100)
-    session_status: Optional[SessionStatus] = None
-    ip_address: Optional[str] = Field(None, pattern=r'^(\d{1,3}\.){3}\d{1,3}$')
+    session_status: Optional[SessionStatusLiteral] = None
+    ip_address: Optional[IPAddress] = None
     max_daily_messages: Optional[int] = Field(None, gt=0, le=10000)
     is_active: Optional[bool] = None
 
-class UnofficialDeviceResponse(BaseModel):
+class UnofficialDeviceResponse(ORMResponse):
     device_id: str
     user_id: str
     device_name: str
-    device_type: DeviceType
+    device_type: DeviceTypeLiteral
     device_os: Optional[str] = None
     browser_info: Optional[str] = None
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
     qr_code_data: Optional[str] = None
     qr_last_generated: Optional[datetime] = None
     qr_expires_at: Optional[datetime] = None
@@ -64,8 +70,9 @@ class UnofficialDeviceResponse(BaseModel):
     last_connected_at: Optional[datetime] = None
     last_disconnected_at: Optional[datetime] = None
     
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+DEVICE_RESPONSE_LIST_ADAPTER = TypeAdapter(List[UnofficialDeviceResponse])
 
 class QRCodeRequest(BaseModel):
     device_id: str
@@ -76,7 +83,7 @@ class QRCodeResponse(BaseModel):
     qr_code_data: str  # Base64 encoded QR code
     qr_last_generated: datetime
     qr_expires_at: datetime
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
 
 class DeviceConnectRequest(BaseModel):
     device_id: str
@@ -85,7 +92,7 @@ class DeviceConnectRequest(BaseModel):
 
 class DeviceConnectResponse(BaseModel):
     device_id: str
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
     connected_at: datetime
     connection_successful: bool
     message: str
@@ -96,20 +103,20 @@ class DeviceDisconnectRequest(BaseModel):
 
 class DeviceDisconnectResponse(BaseModel):
     device_id: str
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
     disconnected_at: datetime
     message: str
 
 class DeviceStatusUpdate(BaseModel):
     device_id: str
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
     last_error: Optional[str] = None
-    ip_address: Optional[str] = None
+    ip_address: Optional[IPAddress] = None
 
 class DeviceStats(BaseModel):
     device_id: str
     device_name: str
-    session_status: SessionStatus
+    session_status: SessionStatusLiteral
     messages_sent: int
     messages_received: int
     daily_message_count: int
@@ -134,7 +141,7 @@ class DeviceActivityLog(BaseModel):
     details: Optional[dict] = None
 
 class BulkDeviceOperation(BaseModel):
-    device_ids: List[str] = Field(..., min_items=1, max_items=50)
+    device_ids: List[str] = Field(..., min_length=1, max_length=50)
     operation: str  # disconnect, reconnect, reset_daily_count, activate, deactivate
 
 class DeviceHealthCheck(BaseModel):
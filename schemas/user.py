@@ -1,5 +1,5 @@
-from pydantic import BaseModel, EmailStr, Field
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, EmailStr, Field, TypeAdapter, model_validator
+from typing import Any, List, Optional
 from datetime import datetime
 
 class UserProfile(BaseModel):
@@ -9,30 +9,52 @@ class UserProfile(BaseModel):
     phone: str
     password_hash: str
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+class UserProfileResponse(BaseModel):
+    # Stored emails were checked by EmailStr on the way in; responses skip email-validator per row.
+    # The password hash is never returned, so users rebuilt from the cache (which omits it) validate too
+    name: str
+    username: str
+    email: str
+    phone: str
+
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class BusinessInfo(BaseModel):
     business_name: Optional[str] = None
     business_description: Optional[str] = None
     erp_system: Optional[str] = None
     gstin: Optional[str] = None
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class Address(BaseModel):
     full_address: Optional[str] = None
     pincode: Optional[str] = None
     country: str = "India"
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class BankInfo(BaseModel):
     bank_name: Optional[str] = None
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class Wallet(BaseModel):
     total_credits: int = 0
     available_credits: int = 0
     used_credits: int = 0
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class BusinessOwnerWallet(BaseModel):
     credits_allocated: int = 0
     credits_used: int = 0
     credits_remaining: int = 0
 
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
 class UserCreate(BaseModel):
     role: str = "platform_user"
     parent_reseller_id: Optional[str] = None
@@ -62,7 +84,7 @@ class UserResponse(BaseModel):
     status: str
     parent_reseller_id: Optional[str] = None
     whatsapp_mode: str = "official"
-    profile: UserProfile
+    profile: UserProfileResponse
     business: Optional[BusinessInfo] = None
     address: Optional[Address] = None
     bank: Optional[BankInfo] = None
@@ -71,8 +93,33 @@ class UserResponse(BaseModel):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, frozen=True)
+
+    @model_validator(mode="before")
+    @classmethod
+    def _from_user_row(cls, data: Any) -> Any:
+        # A flat User row feeds every nested section; the sub-models read their fields off it directly
+        if isinstance(data, dict):
+            return data
+        is_business_owner = data.role == "business_owner"
+        return {
+            "user_id": data.user_id,
+            "role": data.role,
+            "status": data.status,
+            "parent_reseller_id": data.parent_reseller_id,
+            "whatsapp_mode": data.whatsapp_mode,
+            "profile": data,
+            "business": data if data.business_name else None,
+            "address": data if data.full_address else None,
+            "bank": data if data.bank_name else None,
+            "wallet": None if is_business_owner else data,
+            "business_owner_wallet": data if is_business_owner else None,
+            "created_at": data.created_at,
+            "updated_at": data.updated_at
+        }
+
+# Built once at import; list endpoints validate and dump through it instead of per-request serializers
+USER_RESPONSE_LIST_ADAPTER = TypeAdapter(List[UserResponse])
 
 class UserLogin(BaseModel):
     username: str
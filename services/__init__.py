@@ -1,9 +1,25 @@
-from .user_service import UserService
-from .credit_distribution_service import CreditDistributionService
-from .message_service import MessageService
-from .unofficial_device_service import UnofficialDeviceService
-from .device_session_service import DeviceSessionService
-from .message_usage_log_service import MessageUsageLogService
-from .reseller_analytics_service import ResellerAnalyticsService
-
-__all__ = ["UserService", "CreditDistributionService", "MessageService", "UnofficialDeviceService", "DeviceSessionService", "MessageUsageLogService", "ResellerAnalyticsService"]
+"""Service re-exports, imported lazily (PEP 562) so a process only loads the services it uses"""
+import importlib
+
+_LAZY = {
+    "UserService": "user_service",
+    "CreditDistributionService": "credit_distribution_service",
+    "MessageService": "message_service",
+    "UnofficialDeviceService": "unofficial_device_service",
+    "DeviceSessionService": "device_session_service",
+    "MessageUsageLogService": "message_usage_log_service",
+    "ResellerAnalyticsService": "reseller_analytics_service",
+}
+
+__all__ = list(_LAZY)
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
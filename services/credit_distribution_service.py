@@ -1,146 +1,220 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import Row, exists, func, select, update
+from sqlalchemy.orm import Session, aliased
 from models.credit_distribution import CreditDistribution
 from models.user import User
+from core.cache import TTLCache
+from core.config import settings
+from services.user_service import invalidate_cached_user
 from schemas.credit_distribution import CreditDistributionCreate, CreditDistributionResponse
 from typing import Optional, List
 from datetime import datetime
 
+# Reads only serialize these columns, so they are fetched as plain rows without ORM instances.
+_RESPONSE_COLUMNS = (
+    CreditDistribution.distribution_id,
+    CreditDistribution.from_reseller_id,
+    CreditDistribution.to_business_user_id,
+    CreditDistribution.credits_shared,
+    CreditDistribution.shared_at,
+)
+
+# Platform-wide totals are dashboard figures: each worker recomputes them at most once per
+# DISTRIBUTION_SUMMARY_TTL seconds, or sooner after it records a distribution itself
+_summary_cache = TTLCache(maxsize=1, ttl=settings.DISTRIBUTION_SUMMARY_TTL)
+_SUMMARY_KEY = "summary"
+
 class CreditDistributionService:
+    __slots__ = ("db",)
+
     def __init__(self, db: Session):
         self.db = db
     
     def create_credit_distribution(self, distribution_data: CreditDistributionCreate) -> Optional[CreditDistribution]:
-        # Validate reseller exists and has sufficient credits
-        reseller = self.db.query(User).filter(
-            User.user_id == distribution_data.from_reseller_id,
-            User.role == "reseller"
+        credits = distribution_data.credits_shared
+        
+        # Check-and-debit the reseller in one statement so concurrent distributions cannot oversell;
+        # the business owner is checked in the same statement so a bad target never debits anything
+        business_owners = aliased(User)
+        belongs_to_reseller = exists().where(
+            business_owners.user_id == distribution_data.to_business_user_id,
+            business_owners.role == "business_owner",
+            business_owners.parent_reseller_id == distribution_data.from_reseller_id
+        )
+        reseller = self.db.execute(
+            update(User).where(
+                User.user_id == distribution_data.from_reseller_id,
+                User.role == "reseller",
+                User.available_credits >= credits,
+                belongs_to_reseller
+            ).values(
+                available_credits=User.available_credits - credits,
+                used_credits=User.used_credits + credits
+            ).returning(User.user_id, User.username).execution_options(synchronize_session=False)
         ).first()
         
         if not reseller:
-            raise ValueError("Reseller not found")
-        
-        if reseller.available_credits < distribution_data.credits_shared:
-            raise ValueError("Insufficient credits available")
-        
-        # Validate business owner exists and belongs to this reseller
-        business_owner = self.db.query(User).filter(
-            User.user_id == distribution_data.to_business_user_id,
-            User.role == "business_owner",
-            User.parent_reseller_id == distribution_data.from_reseller_id
+            self.db.rollback()
+            raise ValueError(self._distribution_error(distribution_data))
+        
+        # Credit the business owner; re-scoped to the reseller in case it moved since the check above
+        business_owner = self.db.execute(
+            update(User).where(
+                User.user_id == distribution_data.to_business_user_id,
+                User.role == "business_owner",
+                User.parent_reseller_id == distribution_data.from_reseller_id
+            ).values(
+                credits_allocated=User.credits_allocated + credits,
+                credits_remaining=User.credits_remaining + credits
+            ).returning(User.user_id, User.username).execution_options(synchronize_session=False)
         ).first()
         
         if not business_owner:
+            self.db.rollback()
             raise ValueError("Business owner not found or does not belong to this reseller")
         
-        # Create credit distribution record
         credit_distribution = CreditDistribution(
             from_reseller_id=distribution_data.from_reseller_id,
             to_business_user_id=distribution_data.to_business_user_id,
-            credits_shared=distribution_data.credits_shared
+            credits_shared=credits
         )
         
-        # Update reseller credits
-        reseller.available_credits -= distribution_data.credits_shared
-        reseller.used_credits += distribution_data.credits_shared
-        
-        # Update business owner credits
-        business_owner.credits_allocated += distribution_data.credits_shared
-        business_owner.credits_remaining += distribution_data.credits_shared
-        
+        # Both updates and the insert commit together
         self.db.add(credit_distribution)
         self.db.commit()
         self.db.refresh(credit_distribution)
         
+        # Wallet columns changed on both users
+        invalidate_cached_user(reseller)
+        invalidate_cached_user(business_owner)
+        _summary_cache.pop(_SUMMARY_KEY)
+        
         return credit_distribution
     
-    def get_distribution_by_id(self, distribution_id: str) -> Optional[CreditDistribution]:
-        return self.db.query(CreditDistribution).filter(
-            CreditDistribution.distribution_id == distribution_id
+    def _distribution_error(self, distribution_data: CreditDistributionCreate) -> str:
+        """Explain why the reseller debit matched no row, from one lookup of both users"""
+        users = {
+            row.user_id: row for row in self.db.query(
+                User.user_id, User.role, User.parent_reseller_id, User.available_credits
+            ).filter(
+                User.user_id.in_((distribution_data.from_reseller_id, distribution_data.to_business_user_id))
+            )
+        }
+        reseller = users.get(distribution_data.from_reseller_id)
+        if reseller is None or reseller.role != "reseller":
+            return "Reseller not found"
+        if reseller.available_credits < distribution_data.credits_shared:
+            return "Insufficient credits available"
+        business_owner = users.get(distribution_data.to_business_user_id)
+        if (
+            business_owner is None
+            or business_owner.role != "business_owner"
+            or business_owner.parent_reseller_id != distribution_data.from_reseller_id
+        ):
+            return "Business owner not found or does not belong to this reseller"
+        # Both users looked fine by the time of this lookup, so a concurrent distribution won the credits
+        return "Insufficient credits available"
+    
+    def get_distribution_by_id(self, distribution_id: str) -> Optional[Row]:
+        return self.db.execute(
+            select(*_RESPONSE_COLUMNS).where(CreditDistribution.distribution_id == distribution_id)
         ).first()
     
-    def get_distributions_by_reseller(self, reseller_id: str, skip: int = 0, limit: int = 100) -> List[CreditDistribution]:
-        return self.db.query(CreditDistribution).filter(
-            CreditDistribution.from_reseller_id == reseller_id
-        ).offset(skip).limit(limit).all()
+    def get_distribution_shared_at(self, distribution_id: str) -> Optional[datetime]:
+        return self.db.query(CreditDistribution.shared_at).filter(
+            CreditDistribution.distribution_id == distribution_id
+        ).scalar()
+    
+    def _list_distributions(self, *criteria, skip: int, limit: int) -> List[Row]:
+        stmt = (
+            select(*_RESPONSE_COLUMNS)
+            .where(*criteria)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=500)
+        )
+        return self.db.execute(stmt).all()
+    
+    def get_distributions_by_reseller(self, reseller_id: str, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_distributions(CreditDistribution.from_reseller_id == reseller_id, skip=skip, limit=limit)
     
-    def get_distributions_by_business_owner(self, business_user_id: str, skip: int = 0, limit: int = 100) -> List[CreditDistribution]:
-        return self.db.query(CreditDistribution).filter(
-            CreditDistribution.to_business_user_id == business_user_id
-        ).offset(skip).limit(limit).all()
+    def get_distributions_by_business_owner(self, business_user_id: str, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_distributions(CreditDistribution.to_business_user_id == business_user_id, skip=skip, limit=limit)
     
-    def get_all_distributions(self, skip: int = 0, limit: int = 100) -> List[CreditDistribution]:
-        return self.db.query(CreditDistribution).offset(skip).limit(limit).all()
+    def get_all_distributions(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_distributions(skip=skip, limit=limit)
+    
+    def _distribution_totals(self, column) -> tuple:
+        """Correlated SUM(credits_shared) and COUNT subqueries over the distributions whose `column` is the outer user"""
+        total = self.db.query(
+            func.coalesce(func.sum(CreditDistribution.credits_shared), 0)
+        ).filter(column == User.user_id).scalar_subquery()
+        count = self.db.query(
+            func.count(CreditDistribution.distribution_id)
+        ).filter(column == User.user_id).scalar_subquery()
+        return total, count
     
     def get_reseller_credit_stats(self, reseller_id: str) -> Optional[dict]:
-        reseller = self.db.query(User).filter(
+        business_owners = aliased(User)
+        total_distributed, distributions_made = self._distribution_totals(CreditDistribution.from_reseller_id)
+        total_business_owners = self.db.query(func.count(business_owners.user_id)).filter(
+            business_owners.parent_reseller_id == User.user_id,
+            business_owners.role == "business_owner"
+        ).scalar_subquery()
+        
+        # One round-trip: the reseller's wallet plus correlated aggregates
+        row = self.db.query(
+            User.available_credits, total_distributed, total_business_owners, distributions_made
+        ).filter(
             User.user_id == reseller_id,
             User.role == "reseller"
         ).first()
         
-        if not reseller:
+        if not row:
             return None
         
-        total_distributed = self.db.query(CreditDistribution).filter(
-            CreditDistribution.from_reseller_id == reseller_id
-        ).with_entities(
-            self.db.func.sum(CreditDistribution.credits_shared)
-        ).scalar() or 0
-        
-        total_business_owners = self.db.query(User).filter(
-            User.parent_reseller_id == reseller_id,
-            User.role == "business_owner"
-        ).count()
-        
-        distributions_made = self.db.query(CreditDistribution).filter(
-            CreditDistribution.from_reseller_id == reseller_id
-        ).count()
-        
         return {
             "reseller_id": reseller_id,
-            "total_credits_distributed": total_distributed,
-            "total_business_owners": total_business_owners,
-            "remaining_available_credits": reseller.available_credits,
-            "distributions_made": distributions_made
+            "total_credits_distributed": row[1],
+            "total_business_owners": row[2],
+            "remaining_available_credits": row[0],
+            "distributions_made": row[3]
         }
     
     def get_business_owner_credit_stats(self, business_user_id: str) -> Optional[dict]:
-        business_owner = self.db.query(User).filter(
+        total_received, distributions_received = self._distribution_totals(CreditDistribution.to_business_user_id)
+        row = self.db.query(
+            User.credits_used, User.credits_remaining, total_received, distributions_received
+        ).filter(
             User.user_id == business_user_id,
             User.role == "business_owner"
         ).first()
         
-        if not business_owner:
+        if not row:
             return None
         
-        total_received = self.db.query(CreditDistribution).filter(
-            CreditDistribution.to_business_user_id == business_user_id
-        ).with_entities(
-            self.db.func.sum(CreditDistribution.credits_shared)
-        ).scalar() or 0
-        
-        distributions_received = self.db.query(CreditDistribution).filter(
-            CreditDistribution.to_business_user_id == business_user_id
-        ).count()
-        
         return {
             "business_user_id": business_user_id,
-            "total_credits_received": total_received,
-            "credits_used": business_owner.credits_used,
-            "credits_remaining": business_owner.credits_remaining,
-            "distributions_received": distributions_received
+            "total_credits_received": row[2],
+            "credits_used": row[0],
+            "credits_remaining": row[1],
+            "distributions_received": row[3]
         }
     
     def get_distribution_summary(self) -> dict:
-        total_distributed = self.db.query(CreditDistribution).with_entities(
-            self.db.func.sum(CreditDistribution.credits_shared)
-        ).scalar() or 0
-        
-        total_distributions = self.db.query(CreditDistribution).count()
+        summary = _summary_cache.get(_SUMMARY_KEY)
+        if summary is not None:
+            return summary
         
-        average_distribution = total_distributed / total_distributions if total_distributions > 0 else 0
+        total_distributed, total_distributions, average_distribution = self.db.query(
+            func.coalesce(func.sum(CreditDistribution.credits_shared), 0),
+            func.count(CreditDistribution.distribution_id),
+            func.coalesce(func.avg(CreditDistribution.credits_shared), 0)
+        ).one()
         
-        return {
+        summary = {
             "total_distributed": total_distributed,
             "total_distributions": total_distributions,
-            "average_distribution": average_distribution
+            "average_distribution": float(average_distribution)
         }
+        _summary_cache.set(_SUMMARY_KEY, summary)
+        return summary
@@ -1,23 +1,37 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
+from sqlalchemy import Row, func, and_, or_, select, update
 from models.device_session import DeviceSession
 from models.unofficial_device import UnofficialLinkedDevice
+from services.session_cache import get_session_snapshot, invalidate_session_snapshot
+from services.session_counters import (
+    incr_session_counters, pending_last_activity, pending_session_counters, pending_session_counters_many
+)
 from schemas.device_session import (
     DeviceSessionCreate, DeviceSessionUpdate, DeviceSessionResponse,
     SessionCreateRequest, SessionCreateResponse, SessionValidateRequest, SessionValidateResponse,
     SessionExtendRequest, SessionExtendResponse, SessionRevokeRequest, SessionRevokeResponse,
     SessionLoginRequest, SessionLoginResponse, SessionActivityUpdate,
-    SessionStats, DeviceSessionStats, UserSessionStats, SessionSecurityCheck,
-    BulkSessionOperation, SessionCleanupRequest, SessionCleanupResponse,
-    SessionAuditLog, SessionHealthCheck
+    SessionStats, DeviceSessionStats, UserSessionStats, SessionStatsColumnar,
+    BulkSessionOperation, SessionCleanupRequest, SessionCleanupResponse
 )
-from typing import Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List, Tuple
 from datetime import datetime, timedelta
-import secrets
+import base64
+import os
 import logging
 
+if TYPE_CHECKING:
+    from schemas.device_session_admin import SessionSecurityCheck, SessionHealthCheck
+
 logger = logging.getLogger(__name__)
 
+# Session listings read only the DeviceSessionResponse columns as Core rows, never the
+# encrypted token, key or salt
+_LISTING_COLUMNS = tuple(getattr(DeviceSession, name) for name in DeviceSessionResponse.model_fields)
+
+# Rows revoked per UPDATE when cleaning up sessions
+_CLEANUP_BATCH_SIZE = 10_000
+
 class DeviceSessionService:
     def __init__(self, db: Session):
         self.db = db
@@ -34,39 +48,34 @@ class DeviceSessionService:
         if device.session_status != "connected":
             raise ValueError("Device must be connected to create a session")
         
-        # Check for existing active sessions
-        existing_sessions = self.db.query(DeviceSession).filter(
-            and_(
+        now = datetime.utcnow()
+        revoked_session_id = None
+        
+        # Oldest live session and the live-session count in one query
+        oldest = self.db.execute(
+            select(DeviceSession.session_id, func.count().over().label("live_sessions")).where(
                 DeviceSession.device_id == session_request.device_id,
                 DeviceSession.is_valid == True,
                 DeviceSession.is_active == True,
-                DeviceSession.expires_at > datetime.utcnow()
-            )
-        ).count()
+                DeviceSession.expires_at > now
+            ).order_by(DeviceSession.created_at).limit(1)
+        ).first()
         
         # Allow max 3 active sessions per device
-        if existing_sessions >= 3:
+        if oldest and oldest.live_sessions >= 3:
             # Revoke oldest session
-            oldest_session = self.db.query(DeviceSession).filter(
-                and_(
-                    DeviceSession.device_id == session_request.device_id,
-                    DeviceSession.is_valid == True,
-                    DeviceSession.is_active == True
-                )
-            ).order_by(DeviceSession.created_at).first()
-            
-            if oldest_session:
-                oldest_session.revoke_session("Max sessions reached, creating new session")
+            self.db.get(DeviceSession, oldest.session_id).revoke_session("Max sessions reached, creating new session")
+            revoked_session_id = oldest.session_id
         
         # Encrypt session data
-        session_password = secrets.token_urlsafe(32)
+        session_password = base64.urlsafe_b64encode(os.urandom(32)).decode()
         encrypted_data, key, salt = DeviceSession.encrypt_session_data(
             session_request.session_data, 
             session_password
         )
         
         # Create session
-        expires_at = datetime.utcnow() + timedelta(hours=session_request.expires_in_hours)
+        expires_at = now + timedelta(hours=session_request.expires_in_hours)
         
         session = DeviceSession(
             device_id=session_request.device_id,
@@ -76,13 +85,14 @@ class DeviceSessionService:
             session_type="unofficial",
             user_agent=session_request.user_agent,
             ip_address=session_request.ip_address,
-            max_login_attempts=5,
             expires_at=expires_at
         )
         
         self.db.add(session)
         self.db.commit()
         self.db.refresh(session)
+        if revoked_session_id:
+            invalidate_session_snapshot(revoked_session_id)
         
         return SessionCreateResponse(
             session_id=session.session_id,
@@ -98,40 +108,83 @@ class DeviceSessionService:
             DeviceSession.session_id == session_id
         ).first()
     
-    def get_sessions_by_device(self, device_id: str, skip: int = 0, limit: int = 100) -> List[DeviceSession]:
-        return self.db.query(DeviceSession).filter(
-            DeviceSession.device_id == device_id
-        ).offset(skip).limit(limit).all()
+    def _list_sessions(self, *criteria, skip: int, limit: int) -> List[Row]:
+        stmt = (
+            select(*_LISTING_COLUMNS)
+            .where(*criteria)
+            .offset(skip)
+            .limit(limit)
+            .execution_options(yield_per=500)
+        )
+        return self.db.execute(stmt).all()
     
-    def get_all_sessions(self, skip: int = 0, limit: int = 100) -> List[DeviceSession]:
-        return self.db.query(DeviceSession).offset(skip).limit(limit).all()
+    def get_sessions_by_device(self, device_id: str, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_sessions(DeviceSession.device_id == device_id, skip=skip, limit=limit)
     
-    def get_active_sessions(self, skip: int = 0, limit: int = 100) -> List[DeviceSession]:
-        return self.db.query(DeviceSession).filter(
-            and_(
-                DeviceSession.is_valid == True,
-                DeviceSession.is_active == True,
-                DeviceSession.expires_at > datetime.utcnow()
-            )
-        ).offset(skip).limit(limit).all()
+    def get_all_sessions(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_sessions(skip=skip, limit=limit)
+    
+    def get_active_sessions(self, skip: int = 0, limit: int = 100) -> List[Row]:
+        return self._list_sessions(
+            DeviceSession.is_valid == True,
+            DeviceSession.is_active == True,
+            DeviceSession.expires_at > datetime.utcnow(),
+            skip=skip,
+            limit=limit
+        )
     
     def update_session(self, session_id: str, update_data: DeviceSessionUpdate) -> Optional[DeviceSession]:
         session = self.get_session_by_id(session_id)
         if not session:
             return None
         
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             setattr(session, field, value)
         
         session.last_activity = datetime.utcnow()
         self.db.commit()
+        invalidate_session_snapshot(session_id)
         self.db.refresh(session)
         
         return session
     
+    def _record_activity(self, session_id: str, now: datetime, messages: int = 0, ip_address: str = None) -> None:
+        """Record a request against the session without loading the row.
+        
+        Goes to the Redis buffer flushed by flush_session_counters(); only when Redis is down
+        is the row updated (and committed) directly.
+        """
+        if incr_session_counters(session_id, messages=messages, activity_at=now, ip_address=ip_address):
+            return
+        table = DeviceSession.__table__
+        values = {"last_activity": now, "total_requests": table.c.total_requests + 1}
+        if messages:
+            values["messages_sent_via_session"] = table.c.messages_sent_via_session + messages
+        if ip_address:
+            values["last_ip_address"] = ip_address
+        self.db.execute(update(table).where(table.c.session_id == session_id).values(**values))
+        self.db.commit()
+    
     def validate_session(self, session_id: str, session_token: str = None) -> SessionValidateResponse:
-        session = self.get_session_by_id(session_id)
+        snapshot = get_session_snapshot(self.db, session_id)
+        now = datetime.utcnow()
+        if snapshot is not None and snapshot.is_usable(now):
+            # Hot path: the cached snapshot says valid and the activity goes to the Redis buffer
+            self._record_activity(session_id, now)
+            return SessionValidateResponse(
+                session_id=session_id,
+                is_valid=True,
+                is_active=True,
+                is_expired=False,
+                is_compromised=False,
+                requires_reauth=False,
+                expires_at=snapshot.expires_at,
+                last_activity=now,
+                message="Session is valid"
+            )
+        
+        session = self.get_session_by_id(session_id) if snapshot is not None else None
         if not session:
             return SessionValidateResponse(
                 session_id=session_id,
@@ -140,16 +193,17 @@ class DeviceSessionService:
                 is_expired=True,
                 is_compromised=False,
                 requires_reauth=True,
-                expires_at=datetime.utcnow(),
-                last_activity=datetime.utcnow(),
+                expires_at=now,
+                last_activity=now,
                 message="Session not found"
             )
         
         # Check various validation conditions
-        if session.is_expired():
+        if session.is_expired(now):
             session.is_valid = False
             session.is_active = False
             self.db.commit()
+            invalidate_session_snapshot(session_id)
             
             return SessionValidateResponse(
                 session_id=session.session_id,
@@ -181,7 +235,7 @@ class DeviceSessionService:
                 session_id=session.session_id,
                 is_valid=session.is_valid,
                 is_active=session.is_active,
-                is_expired=session.is_expired(),
+                is_expired=session.is_expired(now),
                 is_compromised=session.is_compromised,
                 requires_reauth=session.requires_reauth,
                 expires_at=session.expires_at,
@@ -189,9 +243,14 @@ class DeviceSessionService:
                 message="Session is invalid or inactive"
             )
         
-        # Update last activity
-        session.update_activity()
+        # Update last activity; the request counter goes to Redis when available
+        if incr_session_counters(session.session_id):
+            session.touch_activity()
+        else:
+            session.update_activity()
         self.db.commit()
+        # The cached snapshot disagreed with the row, so reload it on the next call
+        invalidate_session_snapshot(session_id)
         
         return SessionValidateResponse(
             session_id=session.session_id,
@@ -217,6 +276,7 @@ class DeviceSessionService:
         session.extend_session(extend_request.extend_hours)
         
         self.db.commit()
+        invalidate_session_snapshot(session.session_id)
         
         return SessionExtendResponse(
             session_id=session.session_id,
@@ -233,6 +293,7 @@ class DeviceSessionService:
         
         session.revoke_session(revoke_request.reason)
         self.db.commit()
+        invalidate_session_snapshot(session.session_id)
         
         return SessionRevokeResponse(
             session_id=session.session_id,
@@ -272,6 +333,7 @@ class DeviceSessionService:
                 session.last_ip_address = login_request.ip_address
             
             self.db.commit()
+            invalidate_session_snapshot(session.session_id)
             
             return SessionLoginResponse(
                 session_id=session.session_id,
@@ -284,6 +346,7 @@ class DeviceSessionService:
         else:
             session.increment_login_attempt()
             self.db.commit()
+            invalidate_session_snapshot(session.session_id)
             
             return SessionLoginResponse(
                 session_id=session.session_id,
@@ -295,16 +358,15 @@ class DeviceSessionService:
             )
     
     def update_session_activity(self, activity_update: SessionActivityUpdate) -> bool:
-        session = self.get_session_by_id(activity_update.session_id)
-        if not session or not session.is_valid_session():
+        now = datetime.utcnow()
+        snapshot = get_session_snapshot(self.db, activity_update.session_id)
+        if snapshot is None or not snapshot.is_usable(now):
             return False
         
-        session.update_activity(activity_update.ip_address)
-        
-        if activity_update.activity_type == "message_sent":
-            session.increment_message_count()
-        
-        self.db.commit()
+        message_sent = activity_update.activity_type == "message_sent"
+        self._record_activity(
+            snapshot.session_id, now, messages=1 if message_sent else 0, ip_address=activity_update.ip_address
+        )
         return True
     
     def get_session_stats(self, session_id: str) -> SessionStats:
@@ -312,22 +374,33 @@ class DeviceSessionService:
         if not session:
             raise ValueError("Session not found")
         
+        # Include counter increments and activity not yet flushed from Redis
+        pending_requests, pending_messages = pending_session_counters(session.session_id)
+        stats = self._build_session_stats(session, pending_requests, pending_messages, datetime.utcnow())
+        last_activity = pending_last_activity(session.session_id)
+        if last_activity and (stats.last_activity is None or last_activity > stats.last_activity):
+            stats.last_activity = last_activity
+        return stats
+    
+    @staticmethod
+    def _build_session_stats(
+        session: DeviceSession, pending_requests: int, pending_messages: int, now: datetime
+    ) -> SessionStats:
         # Calculate uptime
         uptime_hours = 0.0
         if session.created_at:
-            if session.revoked_at:
-                uptime_hours = (session.revoked_at - session.created_at).total_seconds() / 3600
-            else:
-                uptime_hours = (datetime.utcnow() - session.created_at).total_seconds() / 3600
+            uptime_hours = ((session.revoked_at or now) - session.created_at).total_seconds() / 3600
+        
+        total_requests = session.total_requests + pending_requests
         
         # Calculate requests per hour
         requests_per_hour = 0.0
         if uptime_hours > 0:
-            requests_per_hour = session.total_requests / uptime_hours
+            requests_per_hour = total_requests / uptime_hours
         
         # Determine status
         status = "active"
-        if session.is_expired():
+        if now > session.expires_at:
             status = "expired"
         elif session.revoked_at:
             status = "revoked"
@@ -342,38 +415,34 @@ class DeviceSessionService:
             created_at=session.created_at,
             expires_at=session.expires_at,
             last_activity=session.last_activity,
-            total_requests=session.total_requests,
-            messages_sent_via_session=session.messages_sent_via_session,
+            total_requests=total_requests,
+            messages_sent_via_session=session.messages_sent_via_session + pending_messages,
             uptime_hours=uptime_hours,
             requests_per_hour=requests_per_hour
         )
     
-    def get_device_session_stats(self, device_id: str) -> DeviceSessionStats:
-        sessions = self.get_sessions_by_device(device_id)
-        
+    def _build_device_session_stats(
+        self, device_id: str, sessions: List[DeviceSession], pending: Dict[str, Tuple[int, int]], now: datetime
+    ) -> DeviceSessionStats:
         total_sessions = len(sessions)
-        active_sessions = len([s for s in sessions if s.is_valid_session()])
-        expired_sessions = len([s for s in sessions if s.is_expired()])
+        active_sessions = len([s for s in sessions if s.is_valid_session(now)])
+        expired_sessions = len([s for s in sessions if s.is_expired(now)])
         revoked_sessions = len([s for s in sessions if s.revoked_at])
         compromised_sessions = len([s for s in sessions if s.is_compromised])
         
         total_requests = sum(s.total_requests for s in sessions)
         total_messages_sent = sum(s.messages_sent_via_session for s in sessions)
         
-        # Calculate average session duration
-        durations = []
-        for session in sessions:
-            end_time = session.revoked_at or datetime.utcnow()
-            duration = (end_time - session.created_at).total_seconds() / 3600
-            durations.append(duration)
+        # Build per-session stats from the rows already loaded
+        session_stats = [
+            self._build_session_stats(session, *pending.get(session.session_id, (0, 0)), now)
+            for session in sessions
+        ]
         
+        # Average session duration is the mean uptime computed above
+        durations = [stats.uptime_hours for stats in session_stats]
         avg_duration = sum(durations) / len(durations) if durations else 0.0
         
-        session_stats = []
-        for session in sessions:
-            stats = self.get_session_stats(session.session_id)
-            session_stats.append(stats)
-        
         return DeviceSessionStats(
             device_id=device_id,
             total_sessions=total_sessions,
@@ -387,70 +456,130 @@ class DeviceSessionService:
             sessions=session_stats
         )
     
+    def get_device_session_stats(self, device_id: str) -> DeviceSessionStats:
+        sessions = self.db.query(DeviceSession).filter(DeviceSession.device_id == device_id).all()
+        # One Redis round trip for all pending counters
+        pending = pending_session_counters_many(s.session_id for s in sessions)
+        return self._build_device_session_stats(device_id, sessions, pending, datetime.utcnow())
+    
     def get_user_session_stats(self, user_id: str) -> UserSessionStats:
-        # Get all devices for user
-        devices = self.db.query(UnofficialLinkedDevice).filter(
+        # Two queries for any number of devices: the device ids, then every session on them
+        device_ids = [device_id for device_id, in self.db.query(UnofficialLinkedDevice.device_id).filter(
             UnofficialLinkedDevice.user_id == user_id
-        ).all()
-        
-        device_stats = []
-        total_sessions = 0
-        active_sessions = 0
-        expired_sessions = 0
-        revoked_sessions = 0
-        compromised_sessions = 0
-        total_requests = 0
-        total_messages_sent = 0
-        
-        for device in devices:
-            stats = self.get_device_session_stats(device.device_id)
-            device_stats.append(stats)
-            
-            total_sessions += stats.total_sessions
-            active_sessions += stats.active_sessions
-            expired_sessions += stats.expired_sessions
-            revoked_sessions += stats.revoked_sessions
-            compromised_sessions += stats.compromised_sessions
-            total_requests += stats.total_requests
-            total_messages_sent += stats.total_messages_sent
+        )]
+        sessions_by_device: Dict[str, List[DeviceSession]] = {device_id: [] for device_id in device_ids}
+        sessions = self.db.query(DeviceSession).join(
+            UnofficialLinkedDevice, UnofficialLinkedDevice.device_id == DeviceSession.device_id
+        ).filter(UnofficialLinkedDevice.user_id == user_id).all()
+        for session in sessions:
+            sessions_by_device[session.device_id].append(session)
+        
+        pending = pending_session_counters_many(s.session_id for s in sessions)
+        now = datetime.utcnow()
+        device_stats = [
+            self._build_device_session_stats(device_id, device_sessions, pending, now)
+            for device_id, device_sessions in sessions_by_device.items()
+        ]
         
         return UserSessionStats(
             user_id=user_id,
-            total_devices=len(devices),
-            total_sessions=total_sessions,
-            active_sessions=active_sessions,
-            expired_sessions=expired_sessions,
-            revoked_sessions=revoked_sessions,
-            compromised_sessions=compromised_sessions,
-            total_requests=total_requests,
-            total_messages_sent=total_messages_sent,
+            total_devices=len(device_ids),
+            total_sessions=sum(stats.total_sessions for stats in device_stats),
+            active_sessions=sum(stats.active_sessions for stats in device_stats),
+            expired_sessions=sum(stats.expired_sessions for stats in device_stats),
+            revoked_sessions=sum(stats.revoked_sessions for stats in device_stats),
+            compromised_sessions=sum(stats.compromised_sessions for stats in device_stats),
+            total_requests=sum(stats.total_requests for stats in device_stats),
+            total_messages_sent=sum(stats.total_messages_sent for stats in device_stats),
             devices=device_stats
         )
     
+    def get_user_session_stats_columnar(self, user_id: str) -> SessionStatsColumnar:
+        """Stats for every session on the user's devices, read in one query and returned column-wise"""
+        rows = self.db.query(
+            DeviceSession.session_id, DeviceSession.device_id, DeviceSession.session_type,
+            DeviceSession.created_at, DeviceSession.expires_at, DeviceSession.last_activity,
+            DeviceSession.revoked_at, DeviceSession.is_compromised,
+            DeviceSession.total_requests, DeviceSession.messages_sent_via_session
+        ).join(
+            UnofficialLinkedDevice, UnofficialLinkedDevice.device_id == DeviceSession.device_id
+        ).filter(
+            UnofficialLinkedDevice.user_id == user_id
+        ).order_by(DeviceSession.device_id, DeviceSession.created_at).all()
+        
+        columns = [list(column) for column in zip(*rows)] or [[] for _ in range(10)]
+        (session_ids, device_ids, session_types, created_ats, expires_ats, last_activities,
+         revoked_ats, compromised, stored_requests, stored_messages) = columns
+        
+        pending = pending_session_counters_many(session_ids)
+        now = datetime.utcnow()
+        statuses, total_requests, messages_sent, uptime_hours, requests_per_hour = [], [], [], [], []
+        for i, session_id in enumerate(session_ids):
+            pending_requests, pending_messages = pending.get(session_id, (0, 0))
+            requests = stored_requests[i] + pending_requests
+            uptime = ((revoked_ats[i] or now) - created_ats[i]).total_seconds() / 3600 if created_ats[i] else 0.0
+            
+            if now > expires_ats[i]:
+                statuses.append("expired")
+            elif revoked_ats[i]:
+                statuses.append("revoked")
+            elif compromised[i]:
+                statuses.append("compromised")
+            else:
+                statuses.append("active")
+            total_requests.append(requests)
+            messages_sent.append(stored_messages[i] + pending_messages)
+            uptime_hours.append(uptime)
+            requests_per_hour.append(requests / uptime if uptime > 0 else 0.0)
+        
+        return SessionStatsColumnar.model_construct(
+            session_ids=session_ids,
+            device_ids=device_ids,
+            session_types=session_types,
+            statuses=statuses,
+            created_ats=created_ats,
+            expires_ats=expires_ats,
+            last_activities=last_activities,
+            total_requests=total_requests,
+            messages_sent_via_session=messages_sent,
+            uptime_hours=uptime_hours,
+            requests_per_hour=requests_per_hour
+        )
+    
     def bulk_session_operation(self, operation: BulkSessionOperation) -> dict:
         results = {"success": 0, "failed": 0, "details": []}
-        
-        for session_id in operation.session_ids:
+        # Drop duplicates but keep request order, so details line up with what was sent
+        session_ids = list(dict.fromkeys(operation.session_ids))
+        sessions = {
+            session.session_id: session
+            for session in self.db.query(DeviceSession).filter(DeviceSession.session_id.in_(session_ids))
+        }
+        
+        now = datetime.utcnow()
+        updated = []
+        for session_id in session_ids:
             try:
-                session = self.get_session_by_id(session_id)
+                session = sessions.get(session_id)
                 if not session:
                     results["failed"] += 1
                     results["details"].append(f"Session {session_id} not found")
                     continue
                 
-                if operation.operation == "revoke":
-                    session.revoke_session(operation.parameters.get("reason") if operation.parameters else None)
-                elif operation.operation == "extend":
-                    hours = operation.parameters.get("hours", 24) if operation.parameters else 24
-                    session.extend_session(hours)
-                elif operation.operation == "deactivate":
-                    session.is_active = False
-                elif operation.operation == "reactivate":
-                    if not session.is_expired() and not session.is_compromised:
-                        session.is_active = True
-                        session.is_valid = True
+                # A savepoint per session, so one failure undoes only that session's changes
+                with self.db.begin_nested():
+                    if operation.operation == "revoke":
+                        session.revoke_session(operation.parameters.get("reason") if operation.parameters else None)
+                    elif operation.operation == "extend":
+                        hours = operation.parameters.get("hours", 24) if operation.parameters else 24
+                        session.extend_session(hours)
+                    elif operation.operation == "deactivate":
+                        session.is_active = False
+                    elif operation.operation == "reactivate":
+                        if not session.is_expired(now) and not session.is_compromised:
+                            session.is_active = True
+                            session.is_valid = True
                 
-                self.db.commit()
+                updated.append(session_id)
                 results["success"] += 1
                 results["details"].append(f"Session {session_id} {operation.operation} successful")
                 
@@ -458,19 +587,27 @@ class DeviceSessionService:
                 results["failed"] += 1
                 results["details"].append(f"Session {session_id} failed: {str(e)}")
         
+        # One commit for the whole batch
+        self.db.commit()
+        invalidate_session_snapshot(*updated)
+        
         return results
     
-    def security_check(self, session_id: str) -> SessionSecurityCheck:
+    def security_check(self, session_id: str) -> "SessionSecurityCheck":
+        from schemas.device_session_admin import SessionSecurityCheck
+        
         session = self.get_session_by_id(session_id)
         if not session:
             raise ValueError("Session not found")
         
+        now = datetime.utcnow()
+        is_expired = session.is_expired(now)
         issues = []
         risk_level = "low"
         recommendations = []
         
         # Check for security issues
-        if session.is_expired():
+        if is_expired:
             issues.append("Session has expired")
             risk_level = "high"
         
@@ -482,7 +619,7 @@ class DeviceSessionService:
             issues.append("Failed login attempts detected")
             risk_level = "medium"
         
-        if session.total_requests > 10000:
+        if session.total_requests + pending_session_counters(session.session_id)[0] > 10000:
             issues.append("High request volume detected")
             risk_level = "medium"
         
@@ -491,7 +628,7 @@ class DeviceSessionService:
             risk_level = "medium"
         
         # Generate recommendations
-        if session.is_expired():
+        if is_expired:
             recommendations.append("Create new session")
         
         if session.is_compromised:
@@ -509,19 +646,23 @@ class DeviceSessionService:
             security_issues=issues,
             risk_level=risk_level,
             recommendations=recommendations,
-            last_check=datetime.utcnow()
+            last_check=now
         )
     
-    def health_check(self, session_id: str) -> SessionHealthCheck:
+    def health_check(self, session_id: str) -> "SessionHealthCheck":
+        from schemas.device_session_admin import SessionHealthCheck
+        
         session = self.get_session_by_id(session_id)
         if not session:
             raise ValueError("Session not found")
         
+        now = datetime.utcnow()
+        is_expired = session.is_expired(now)
         issues = []
         health_score = 1.0
         
         # Calculate health score
-        if session.is_expired():
+        if is_expired:
             health_score -= 0.5
             issues.append("Session expired")
         
@@ -538,7 +679,7 @@ class DeviceSessionService:
             issues.append("Multiple failed login attempts")
         
         # Check session age
-        session_age_hours = (datetime.utcnow() - session.created_at).total_seconds() / 3600
+        session_age_hours = (now - session.created_at).total_seconds() / 3600
         if session_age_hours > 48:  # Older than 2 days
             health_score -= 0.1
             issues.append("Session is older than 48 hours")
@@ -552,7 +693,7 @@ class DeviceSessionService:
         elif health_score < 0.8:
             recommendations.append("Monitor session activity closely")
         
-        if session.is_expired():
+        if is_expired:
             recommendations.append("Create new session")
         
         return SessionHealthCheck(
@@ -561,64 +702,66 @@ class DeviceSessionService:
             health_score=health_score,
             issues=issues,
             recommendations=recommendations,
-            last_check=datetime.utcnow()
+            last_check=now
         )
     
-    def cleanup_sessions(self, cleanup_request: SessionCleanupRequest) -> SessionCleanupResponse:
-        sessions_cleaned = 0
-        sessions_affected = []
-        
-        if cleanup_request.cleanup_type == "expired":
-            expired_sessions = self.db.query(DeviceSession).filter(
-                and_(
-                    DeviceSession.expires_at < datetime.utcnow(),
-                    DeviceSession.is_valid == True
-                )
-            ).all()
-            
-            for session in expired_sessions:
-                if not cleanup_request.dry_run:
-                    session.is_valid = False
-                    session.is_active = False
-                sessions_cleaned += 1
-                sessions_affected.append(session.session_id)
-        
-        elif cleanup_request.cleanup_type == "inactive":
-            cutoff_time = datetime.utcnow() - timedelta(hours=24)
-            inactive_sessions = self.db.query(DeviceSession).filter(
+    def _cleanup_target(self, cleanup_type: str, now: datetime) -> Optional[tuple]:
+        """(criteria, values) for a cleanup type; criteria exclude rows the values already cover"""
+        if cleanup_type == "expired":
+            return (
+                and_(DeviceSession.expires_at < now, DeviceSession.is_valid == True),
+                {"is_valid": False, "is_active": False}
+            )
+        if cleanup_type == "inactive":
+            return (
                 and_(
-                    DeviceSession.last_activity < cutoff_time,
+                    DeviceSession.last_activity < now - timedelta(hours=24),
                     DeviceSession.is_valid == True,
                     DeviceSession.is_active == True
-                )
-            ).all()
-            
-            for session in inactive_sessions:
-                if not cleanup_request.dry_run:
-                    session.is_active = False
-                sessions_cleaned += 1
-                sessions_affected.append(session.session_id)
-        
-        elif cleanup_request.cleanup_type == "compromised":
-            compromised_sessions = self.db.query(DeviceSession).filter(
-                DeviceSession.is_compromised == True
-            ).all()
-            
-            for session in compromised_sessions:
-                if not cleanup_request.dry_run:
-                    session.is_valid = False
-                    session.is_active = False
-                sessions_cleaned += 1
-                sessions_affected.append(session.session_id)
-        
-        if not cleanup_request.dry_run:
-            self.db.commit()
+                ),
+                {"is_active": False}
+            )
+        if cleanup_type == "compromised":
+            return (
+                and_(
+                    DeviceSession.is_compromised == True,
+                    or_(DeviceSession.is_valid == True, DeviceSession.is_active == True)
+                ),
+                {"is_valid": False, "is_active": False}
+            )
+        return None
+    
+    def cleanup_sessions(self, cleanup_request: SessionCleanupRequest) -> SessionCleanupResponse:
+        now = datetime.utcnow()
+        sessions_affected = []
+        target = self._cleanup_target(cleanup_request.cleanup_type, now)
+        
+        if target and cleanup_request.dry_run:
+            criteria, _ = target
+            sessions_affected = list(self.db.execute(
+                select(DeviceSession.session_id).where(criteria)
+            ).scalars())
+        elif target:
+            criteria, values = target
+            # One UPDATE ... RETURNING per batch; each batch commits so locks stay short
+            while True:
+                batch = select(DeviceSession.session_id).where(criteria).limit(_CLEANUP_BATCH_SIZE)
+                session_ids = list(self.db.execute(
+                    update(DeviceSession).where(DeviceSession.session_id.in_(batch)).values(**values)
+                    .returning(DeviceSession.session_id).execution_options(synchronize_session=False)
+                ).scalars())
+                self.db.commit()
+                invalidate_session_snapshot(*session_ids)
+                sessions_affected.extend(session_ids)
+                if len(session_ids) < _CLEANUP_BATCH_SIZE:
+                    break
+        sessions_cleaned = len(sessions_affected)
         
         return SessionCleanupResponse(
             cleanup_type=cleanup_request.cleanup_type,
             sessions_cleaned=sessions_cleaned,
             sessions_affected=sessions_affected,
-            cleanup_time=datetime.utcnow(),
+            cleanup_time=now,
             dry_run=cleanup_request.dry_run,
             message=f"{'Dry run completed' if cleanup_request.dry_run else 'Cleanup completed'} for {sessions_cleaned} sessions"
         )
@@ -1,13 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_
-from models.message import Message
+from sqlalchemy import func, and_, or_, insert, update
+from pydantic import ValidationError
+from models.message import Message, _new_message_id
 from models.user import User
-from schemas.message import MessageCreate, MessageUpdate, MessageSendRequest, BulkMessageRequest, MessageStats
+from services.user_service import invalidate_cached_user
+from schemas.message import MessageCreate, MessageUpdate, MessageSendRequest, BulkMessageRequest, MessageStats, RECEIVER_NUMBERS_ADAPTER
 from typing import Optional, List
 from datetime import datetime, timedelta
+import logging
 import uuid
 import requests
 
+logger = logging.getLogger(__name__)
+
 class MessageService:
     def __init__(self, db: Session):
         self.db = db
@@ -34,11 +39,11 @@ class MessageService:
         # Create message
         message = Message(
             user_id=message_data.user_id,
-            channel=message_data.channel.value,
-            mode=message_data.mode.value,
+            channel=message_data.channel,
+            mode=message_data.mode,
             sender_number=message_data.sender_number,
             receiver_number=message_data.receiver_number,
-            message_type=message_data.message_type.value,
+            message_type=message_data.message_type,
             template_name=message_data.template_name,
             message_body=message_data.message_body,
             credits_used=message_data.credits_used,
@@ -48,6 +53,7 @@ class MessageService:
         self.db.add(message)
         self.db.commit()
         self.db.refresh(message)
+        invalidate_cached_user(user)
         
         # Send message (async or sync based on mode)
         self._send_message(message)
@@ -73,26 +79,100 @@ class MessageService:
         
         return self.create_message(message_data)
     
+    def bulk_create_messages(self, rows: List[dict]) -> List[str]:
+        """Insert message rows with one executemany INSERT (batched VALUES where the driver
+        supports it). Rows must share the same keys. The caller commits."""
+        for row in rows:
+            row.setdefault("message_id", _new_message_id())
+        if rows:
+            self.db.execute(insert(Message), rows)
+        return [row["message_id"] for row in rows]
+    
     def send_bulk_messages(self, user_id: str, bulk_request: BulkMessageRequest) -> List[Message]:
-        messages = []
-        for receiver_number in bulk_request.receiver_numbers:
-            try:
-                message = self.send_message(
-                    user_id=user_id,
-                    message_request=MessageSendRequest(
-                        receiver_number=receiver_number,
-                        message_type=bulk_request.message_type,
-                        template_name=bulk_request.template_name,
-                        message_body=bulk_request.message_body,
-                        mode=bulk_request.mode
-                    )
-                )
-                messages.append(message)
-            except Exception as e:
-                # Log error but continue with other messages
-                print(f"Failed to send message to {receiver_number}: {e}")
+        user = self.db.query(User).filter(User.user_id == user_id).first()
+        if not user:
+            raise ValueError("User not found")
+        
+        receiver_numbers = bulk_request.receiver_numbers
+        try:
+            RECEIVER_NUMBERS_ADAPTER.validate_python(receiver_numbers)
+        except ValidationError as e:
+            # Log errors but continue with the other receivers
+            invalid = {}
+            for error in e.errors():
+                invalid.setdefault(error["loc"][0], error["msg"])
+            for index, msg in invalid.items():
+                logger.warning("Failed to send message to %s: %s", receiver_numbers[index], msg)
+            receiver_numbers = [number for i, number in enumerate(receiver_numbers) if i not in invalid]
+        
+        rows = [
+            {
+                "user_id": user_id,
+                "channel": "whatsapp",
+                "mode": bulk_request.mode,
+                "sender_number": user.phone,
+                "receiver_number": receiver_number,
+                "message_type": bulk_request.message_type,
+                "template_name": bulk_request.template_name,
+                "message_body": bulk_request.message_body,
+                "status": "pending"
+            }
+            for receiver_number in receiver_numbers
+        ]
+        
+        # Send as many messages as the wallet covers
+        if user.role == "business_owner":
+            affordable = max(user.credits_remaining, 0)
+        elif user.role == "reseller":
+            affordable = max(user.available_credits, 0)
+        else:
+            affordable = len(rows)  # Not billed from a wallet
         
-        return messages
+        for row in rows[affordable:]:
+            logger.warning("Failed to send message to %s: Insufficient credits", row["receiver_number"])
+        rows = rows[:affordable]
+        if not rows:
+            return []
+        
+        # Commit the debit and the pending messages before anything is sent, so the wallet row
+        # is not held locked across the sends and every sent message is already recorded
+        self._debit_wallet(user, len(rows))
+        message_ids = self.bulk_create_messages(rows)
+        self.db.commit()
+        invalidate_cached_user(user)
+        
+        messages = self.db.query(Message).filter(Message.message_id.in_(message_ids)).all()
+        for message in messages:
+            self._send_message(message, commit=False)
+        self.db.commit()
+        
+        # Reload in request order with one SELECT instead of a refresh per expired row
+        by_id = {m.message_id: m for m in self.db.query(Message).filter(Message.message_id.in_(message_ids)).all()}
+        return [by_id[message_id] for message_id in message_ids]
+    
+    def _debit_wallet(self, user: User, credits: int) -> Optional[int]:
+        """Debit the user's wallet with one conditional UPDATE and return the balance before it.
+        
+        Returns None for roles that are not billed from a wallet. Raises ValueError when a
+        concurrent debit has left fewer than credits.
+        """
+        if user.role == "business_owner":
+            remaining, used = User.credits_remaining, User.credits_used
+        elif user.role == "reseller":
+            remaining, used = User.available_credits, User.used_credits
+        else:
+            return None
+        
+        row = self.db.execute(
+            update(User)
+            .where(User.user_id == user.user_id, remaining >= credits)
+            .values({remaining: remaining - credits, used: used + credits})
+            .returning(remaining)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if row is None:
+            raise ValueError("Insufficient credits")
+        return row[0] + credits
     
     def get_message_by_id(self, message_id: str) -> Optional[Message]:
         return self.db.query(Message).filter(Message.message_id == message_id).first()
@@ -111,7 +191,7 @@ class MessageService:
         if not message:
             return None
         
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             setattr(message, field, value)
         
@@ -185,7 +265,7 @@ class MessageService:
             average_delivery_time=avg_delivery_time
         )
     
-    def _send_message(self, message: Message):
+    def _send_message(self, message: Message, commit: bool = True):
         """Internal method to send message via appropriate channel"""
         try:
             if message.mode == "official":
@@ -211,7 +291,8 @@ class MessageService:
             message.error_message = str(e)
             message.sent_at = datetime.utcnow()
         
-        self.db.commit()
+        if commit:
+            self.db.commit()
     
     def _send_via_official_api(self, message: Message) -> dict:
         """Send message via official WhatsApp API"""
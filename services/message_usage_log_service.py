@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, or_, desc, asc
-from models.message_usage_log import MessageUsageLog, UsageType, UsageStatus
+from models.message_usage_log import MessageUsageLog, UsageType, UsageStatus, MILLICENTS_PER_UNIT, list_usage_summaries
+from core.user_cache import get_user_projection
 from models.user import User
 from models.message import Message
 from models.unofficial_device import UnofficialLinkedDevice
@@ -9,14 +10,14 @@ from schemas.message_usage_log import (
     MessageUsageLogCreate, MessageUsageLogUpdate, MessageUsageLogResponse,
     UsageLogCreateRequest, UsageLogCreateResponse, UsageLogRefundRequest, UsageLogRefundResponse,
     UsageLogUpdateRequest, UsageLogUpdateResponse, UsageStats, UserUsageStats,
-    DeviceUsageStats, SessionUsageStats, UsageAnalytics, UsageFilter,
-    BulkUsageOperation, BulkUsageResponse, UsageAuditLog, UsageHealthCheck,
+    DeviceUsageStats, SessionUsageStats, DailyUsage, HourlyUsage, UsageAnalytics, UsageFilter,
+    BulkUsageOperation, BulkUsageResponse,
     UsageCleanupRequest, UsageCleanupResponse
 )
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import logging
-from decimal import Decimal
+import uuid
 
 logger = logging.getLogger(__name__)
 
@@ -27,9 +28,10 @@ class MessageUsageLogService:
     def create_usage_log(self, request: UsageLogCreateRequest) -> UsageLogCreateResponse:
         """Create a new usage log entry"""
         # Validate user exists
-        user = self.db.query(User).filter(User.user_id == request.user_id).first()
+        user = get_user_projection(self.db, request.user_id)
         if not user:
             raise ValueError("User not found")
+        reseller_id, business_name = user
         
         # Validate message exists if provided
         if request.message_id:
@@ -73,7 +75,9 @@ class MessageUsageLogService:
             ip_address=request.ip_address,
             user_agent=request.user_agent,
             api_endpoint=request.api_endpoint,
-            request_id=request.request_id
+            request_id=request.request_id,
+            reseller_id=reseller_id,
+            business_name=business_name
         )
         
         self.db.add(usage_log)
@@ -86,7 +90,7 @@ class MessageUsageLogService:
             credits_deducted=usage_log.credits_deducted,
             balance_before=usage_log.balance_before,
             balance_after=usage_log.balance_after,
-            total_cost=float(usage_log.total_cost),
+            total_cost=usage_log.total_cost,
             currency=usage_log.currency,
             status=usage_log.status,
             created_at=usage_log.created_at
@@ -94,6 +98,10 @@ class MessageUsageLogService:
     
     def get_usage_log_by_id(self, usage_id: str) -> Optional[MessageUsageLog]:
         """Get usage log by ID"""
+        try:
+            uuid.UUID(usage_id)
+        except ValueError:
+            return None
         return self.db.query(MessageUsageLog).filter(
             MessageUsageLog.usage_id == usage_id
         ).first()
@@ -105,6 +113,8 @@ class MessageUsageLogService:
         if filters:
             if filters.user_id:
                 query = query.filter(MessageUsageLog.user_id == filters.user_id)
+            if filters.reseller_id:
+                query = query.filter(MessageUsageLog.reseller_id == filters.reseller_id)
             if filters.device_id:
                 query = query.filter(MessageUsageLog.device_id == filters.device_id)
             if filters.session_id:
@@ -132,6 +142,10 @@ class MessageUsageLogService:
             MessageUsageLog.user_id == user_id
         ).order_by(desc(MessageUsageLog.created_at)).offset(skip).limit(limit).all()
     
+    def get_user_usage_summaries(self, user_id: str, skip: int = 0, limit: int = 100) -> List[dict]:
+        """Get usage summaries for a specific user (plain rows, no ORM instances)"""
+        return list_usage_summaries(self.db, user_id, skip, limit)
+    
     def get_device_usage_logs(self, device_id: str, skip: int = 0, limit: int = 100) -> List[MessageUsageLog]:
         """Get usage logs for a specific device"""
         return self.db.query(MessageUsageLog).filter(
@@ -149,8 +163,10 @@ class MessageUsageLogService:
         usage_log = self.get_usage_log_by_id(usage_id)
         if not usage_log:
             return None
+        if update_data.status == UsageStatus.REFUNDED:
+            raise ValueError("Use the refund endpoint to refund a usage log")
         
-        for field, value in update_data.dict(exclude_unset=True).items():
+        for field, value in update_data.model_dump(exclude_unset=True).items():
             setattr(usage_log, field, value)
         
         usage_log.updated_at = datetime.utcnow()
@@ -216,6 +232,8 @@ class MessageUsageLogService:
         query = self.db.query(MessageUsageLog)
         
         if filters:
+            if filters.reseller_id:
+                query = query.filter(MessageUsageLog.reseller_id == filters.reseller_id)
             if filters.start_date:
                 query = query.filter(MessageUsageLog.created_at >= filters.start_date)
             if filters.end_date:
@@ -226,7 +244,7 @@ class MessageUsageLogService:
         total_credits_deducted = query.with_entities(func.sum(MessageUsageLog.credits_deducted)).scalar() or 0
         total_credits_refunded = query.with_entities(func.sum(MessageUsageLog.credits_refunded)).scalar() or 0
         net_credits_used = total_credits_deducted - total_credits_refunded
-        total_cost = query.with_entities(func.sum(MessageUsageLog.total_cost)).scalar() or Decimal('0.00')
+        total_cost = (query.with_entities(func.sum(MessageUsageLog.total_cost_millicents)).scalar() or 0) / MILLICENTS_PER_UNIT
         
         # Status breakdown
         successful_usage = query.filter(MessageUsageLog.status == UsageStatus.SUCCESS).count()
@@ -247,14 +265,14 @@ class MessageUsageLogService:
             if count > 0:
                 usage_by_status[status.value] = count
         
-        average_cost_per_usage = float(total_cost) / total_usage if total_usage > 0 else 0.0
+        average_cost_per_usage = total_cost / total_usage if total_usage > 0 else 0.0
         
         return UsageStats(
             total_usage=total_usage,
             total_credits_deducted=total_credits_deducted,
             total_credits_refunded=total_credits_refunded,
             net_credits_used=net_credits_used,
-            total_cost=float(total_cost),
+            total_cost=total_cost,
             successful_usage=successful_usage,
             failed_usage=failed_usage,
             refunded_usage=refunded_usage,
@@ -283,7 +301,7 @@ class MessageUsageLogService:
         total_credits_deducted = user_usage.with_entities(func.sum(MessageUsageLog.credits_deducted)).scalar() or 0
         total_credits_refunded = user_usage.with_entities(func.sum(MessageUsageLog.credits_refunded)).scalar() or 0
         net_credits_used = total_credits_deducted - total_credits_refunded
-        total_cost = user_usage.with_entities(func.sum(MessageUsageLog.total_cost)).scalar() or Decimal('0.00')
+        total_cost = (user_usage.with_entities(func.sum(MessageUsageLog.total_cost_millicents)).scalar() or 0) / MILLICENTS_PER_UNIT
         
         # Usage by type
         usage_by_type = {}
@@ -310,10 +328,7 @@ class MessageUsageLogService:
                     MessageUsageLog.created_at < day_end
                 )
             ).count()
-            daily_usage.append({
-                "date": day.date().isoformat(),
-                "usage_count": day_count
-            })
+            daily_usage.append(DailyUsage.model_construct(date=day.date(), usage_count=day_count))
         
         # Hourly usage (last 24 hours)
         hourly_usage = []
@@ -326,10 +341,7 @@ class MessageUsageLogService:
                     MessageUsageLog.created_at < hour_end
                 )
             ).count()
-            hourly_usage.append({
-                "hour": hour.strftime("%H:00"),
-                "usage_count": hour_count
-            })
+            hourly_usage.append(HourlyUsage.model_construct(hour=hour.strftime("%H:00"), usage_count=hour_count))
         
         return UserUsageStats(
             user_id=user_id,
@@ -337,7 +349,7 @@ class MessageUsageLogService:
             total_credits_deducted=total_credits_deducted,
             total_credits_refunded=total_credits_refunded,
             net_credits_used=net_credits_used,
-            total_cost=float(total_cost),
+            total_cost=total_cost,
             current_balance=current_balance,
             usage_by_type=usage_by_type,
             usage_by_status=usage_by_status,
@@ -367,7 +379,7 @@ class MessageUsageLogService:
         total_credits_deducted = device_usage.with_entities(func.sum(MessageUsageLog.credits_deducted)).scalar() or 0
         total_credits_refunded = device_usage.with_entities(func.sum(MessageUsageLog.credits_refunded)).scalar() or 0
         net_credits_used = total_credits_deducted - total_credits_refunded
-        total_cost = device_usage.with_entities(func.sum(MessageUsageLog.total_cost)).scalar() or Decimal('0.00')
+        total_cost = (device_usage.with_entities(func.sum(MessageUsageLog.total_cost_millicents)).scalar() or 0) / MILLICENTS_PER_UNIT
         
         # Usage by type and status
         usage_by_type = {}
@@ -393,10 +405,7 @@ class MessageUsageLogService:
                     MessageUsageLog.created_at < day_end
                 )
             ).count()
-            daily_usage.append({
-                "date": day.date().isoformat(),
-                "usage_count": day_count
-            })
+            daily_usage.append(DailyUsage.model_construct(date=day.date(), usage_count=day_count))
         
         return DeviceUsageStats(
             device_id=device_id,
@@ -405,7 +414,7 @@ class MessageUsageLogService:
             total_credits_deducted=total_credits_deducted,
             total_credits_refunded=total_credits_refunded,
             net_credits_used=net_credits_used,
-            total_cost=float(total_cost),
+            total_cost=total_cost,
             usage_by_type=usage_by_type,
             usage_by_status=usage_by_status,
             daily_usage=daily_usage
@@ -433,7 +442,7 @@ class MessageUsageLogService:
         total_credits_deducted = session_usage.with_entities(func.sum(MessageUsageLog.credits_deducted)).scalar() or 0
         total_credits_refunded = session_usage.with_entities(func.sum(MessageUsageLog.credits_refunded)).scalar() or 0
         net_credits_used = total_credits_deducted - total_credits_refunded
-        total_cost = session_usage.with_entities(func.sum(MessageUsageLog.total_cost)).scalar() or Decimal('0.00')
+        total_cost = (session_usage.with_entities(func.sum(MessageUsageLog.total_cost_millicents)).scalar() or 0) / MILLICENTS_PER_UNIT
         
         # Usage by type and status
         usage_by_type = {}
@@ -454,7 +463,7 @@ class MessageUsageLogService:
             total_credits_deducted=total_credits_deducted,
             total_credits_refunded=total_credits_refunded,
             net_credits_used=net_credits_used,
-            total_cost=float(total_cost),
+            total_cost=total_cost,
             usage_by_type=usage_by_type,
             usage_by_status=usage_by_status,
             session_duration_minutes=session_duration_minutes
@@ -465,10 +474,16 @@ class MessageUsageLogService:
         successful = 0
         failed = 0
         errors = []
-        
-        for usage_id in operation.usage_ids:
+        # Drop duplicates but keep request order, so errors line up with what was sent
+        usage_ids = list(dict.fromkeys(str(usage_id) for usage_id in operation.usage_ids))
+        usage_logs = {
+            usage_log.usage_id: usage_log
+            for usage_log in self.db.query(MessageUsageLog).filter(MessageUsageLog.usage_id.in_(usage_ids))
+        }
+        
+        for usage_id in usage_ids:
             try:
-                usage_log = self.get_usage_log_by_id(usage_id)
+                usage_log = usage_logs.get(usage_id)
                 if not usage_log:
                     errors.append({"usage_id": usage_id, "error": "Usage log not found"})
                     failed += 1
@@ -508,7 +523,7 @@ class MessageUsageLogService:
         
         return BulkUsageResponse(
             operation=operation.operation,
-            total_processed=len(operation.usage_ids),
+            total_processed=len(usage_ids),
             successful=successful,
             failed=failed,
             errors=errors,
@@ -537,7 +552,8 @@ class MessageUsageLogService:
                 message=f"Found {total_records_found} records to delete (dry run)"
             )
         
-        # Actually delete the records
+        # Actually delete the records. Dropping whole partitions needs an exclusive lock on the
+        # table, so that is left to the drop_old_usage_log_partitions beat task
         deleted_count = query.delete()
         self.db.commit()
         
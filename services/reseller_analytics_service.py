@@ -1,6 +1,9 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc
-from models.reseller_analytics import ResellerAnalytics, BusinessUserAnalytics, AnalyticsPeriod
+from sqlalchemy.orm import Session, Query, selectinload
+from sqlalchemy import func, and_, or_, desc, asc, select, text
+from sqlalchemy.exc import DBAPIError
+from models.reseller_analytics import (
+    ResellerAnalytics, BusinessUserAnalytics, AnalyticsPeriod, reseller_analytics_mv, percentage_expr
+)
 from models.user import User
 from models.credit_distribution import CreditDistribution
 from models.message_usage_log import MessageUsageLog
@@ -9,15 +12,17 @@ from schemas.reseller_analytics import (
     CreateAnalyticsRequest, UpdateAnalyticsRequest,
     CreateBusinessUserStatsRequest, UpdateBusinessUserStatsRequest,
     AnalyticsFilter, AnalyticsSummary, ResellerPerformanceMetrics,
-    TopPerformersResponse, AnalyticsTrends, AnalyticsComparison,
-    AnalyticsExportRequest, AnalyticsExportResponse,
-    AnalyticsHealthCheck, AnalyticsCleanupRequest, AnalyticsCleanupResponse
+    TopPerformersResponse, AnalyticsTrends, TrendPoint, TrendPeriod, AnalyticsComparison,
+    AnalyticsExportRequest, AnalyticsExportResponse
 )
-from typing import Optional, List, Dict, Any
+from typing import TYPE_CHECKING, Optional, List, Dict, Any
 from datetime import datetime, timedelta
 import logging
 from decimal import Decimal
 
+if TYPE_CHECKING:
+    from schemas.reseller_analytics_admin import AnalyticsHealthCheck, AnalyticsCleanupRequest, AnalyticsCleanupResponse
+
 logger = logging.getLogger(__name__)
 
 class ResellerAnalyticsService:
@@ -58,11 +63,12 @@ class ResellerAnalyticsService:
         self.db.commit()
         self.db.refresh(analytics)
         
-        return self._convert_to_response(analytics)
+        # A new record has no business user stats yet
+        return self._convert_to_response(analytics, business_stats=[])
     
     def get_analytics_by_id(self, analytics_id: str) -> Optional[ResellerAnalytics]:
         """Get analytics record by ID"""
-        return self.db.query(ResellerAnalytics).filter(
+        return self._with_business_stats(self.db.query(ResellerAnalytics)).filter(
             ResellerAnalytics.analytics_id == analytics_id
         ).first()
     
@@ -90,16 +96,29 @@ class ResellerAnalyticsService:
         
         query = query.order_by(desc(ResellerAnalytics.period_start))
         
+        if include_business_stats and not self._uses_materialized_view():
+            query = self._with_business_stats(query)
+        
         analytics_records = query.all()
         
+        view_stats = {}
+        if include_business_stats and self._uses_materialized_view():
+            view_stats = self._get_business_stats_from_view([a.analytics_id for a in analytics_records])
+            # Records newer than the last view refresh: load their stats in one IN query
+            missing = [a.analytics_id for a in analytics_records if a.analytics_id not in view_stats]
+            if missing:
+                self._with_business_stats(self.db.query(ResellerAnalytics)).filter(
+                    ResellerAnalytics.analytics_id.in_(missing)
+                ).all()
+        
         return [
-            self._convert_to_response(analytics, include_business_stats)
+            self._convert_to_response(analytics, include_business_stats, view_stats.get(analytics.analytics_id))
             for analytics in analytics_records
         ]
     
     def get_latest_analytics(self, reseller_id: str) -> Optional[ResellerAnalyticsResponse]:
         """Get latest analytics for reseller"""
-        analytics = self.db.query(ResellerAnalytics).filter(
+        analytics = self._with_business_stats(self.db.query(ResellerAnalytics)).filter(
             ResellerAnalytics.reseller_id == reseller_id
         ).order_by(desc(ResellerAnalytics.period_start)).first()
         
@@ -115,7 +134,7 @@ class ResellerAnalyticsService:
             return None
         
         # Update fields
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             if hasattr(analytics, field):
                 setattr(analytics, field, value)
@@ -165,6 +184,23 @@ class ResellerAnalyticsService:
         
         return stats
     
+    def bulk_create_business_user_stats(self, requests: List[CreateBusinessUserStatsRequest]) -> List[str]:
+        """Create many business user statistics in one write (COPY on PostgreSQL). Returns the stat IDs."""
+        analytics_ids = {request.reseller_analytics_id for request in requests}
+        user_ids = {request.user_id for request in requests}
+        found_analytics = set(self.db.execute(
+            select(ResellerAnalytics.analytics_id).where(ResellerAnalytics.analytics_id.in_(analytics_ids))
+        ).scalars())
+        if found_analytics != analytics_ids:
+            raise ValueError("Analytics record not found")
+        found_users = set(self.db.execute(select(User.user_id).where(User.user_id.in_(user_ids))).scalars())
+        if found_users != user_ids:
+            raise ValueError("User not found")
+        
+        stat_ids = BusinessUserAnalytics.bulk_create(self.db, [request.model_dump() for request in requests])
+        self.db.commit()
+        return stat_ids
+    
     def update_business_user_stats(self, stat_id: str, update_data: UpdateBusinessUserStatsRequest) -> Optional[BusinessUserAnalytics]:
         """Update business user statistics"""
         stats = self.db.query(BusinessUserAnalytics).filter(
@@ -175,7 +211,7 @@ class ResellerAnalyticsService:
             return None
         
         # Update fields
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             if hasattr(stats, field):
                 setattr(stats, field, value)
@@ -254,40 +290,55 @@ class ResellerAnalyticsService:
             func.max(ResellerAnalytics.period_start).label('latest_period')
         ).group_by(ResellerAnalytics.reseller_id).subquery()
         
-        latest_analytics = self.db.query(ResellerAnalytics).join(
-            subquery,
-            and_(
-                ResellerAnalytics.reseller_id == subquery.c.reseller_id,
-                ResellerAnalytics.period_start == subquery.c.latest_period
+        # One query returning plain rows: reseller name joined in and rates computed in SQL
+        ra = ResellerAnalytics
+        rows = self.db.execute(
+            select(
+                ra.reseller_id,
+                User.name.label("reseller_name"),
+                ra.total_credits_purchased,
+                ra.total_credits_distributed,
+                ra.total_credits_used,
+                ra.remaining_credits,
+                ra.total_revenue,
+                ra.total_business_users,
+                ra.active_business_users,
+                ra.total_messages_sent,
+                percentage_expr(ra.total_credits_used, ra.total_credits_distributed).label("credit_utilization_rate"),
+                percentage_expr(ra.total_messages_delivered, ra.total_messages_sent).label("delivery_rate")
+            )
+            .join(
+                subquery,
+                and_(
+                    ra.reseller_id == subquery.c.reseller_id,
+                    ra.period_start == subquery.c.latest_period
+                )
             )
+            .outerjoin(User, User.user_id == ra.reseller_id)
         ).all()
         
         # Convert to performance metrics
-        performers = []
-        for analytics in latest_analytics:
-            reseller = self.db.query(User).filter(
-                User.user_id == analytics.reseller_id
-            ).first()
-            
-            metrics = ResellerPerformanceMetrics(
-                reseller_id=analytics.reseller_id,
-                reseller_name=reseller.name if reseller else None,
-                total_credits_purchased=analytics.total_credits_purchased,
-                total_credits_distributed=analytics.total_credits_distributed,
-                total_credits_used=analytics.total_credits_used,
-                remaining_credits=analytics.remaining_credits,
-                total_revenue=float(analytics.total_revenue),
-                total_business_users=analytics.total_business_users,
-                active_business_users=analytics.active_business_users,
-                total_messages_sent=analytics.total_messages_sent,
-                credit_utilization_rate=analytics.calculate_credit_utilization(),
-                delivery_rate=analytics.calculate_delivery_rate(),
+        performers = [
+            ResellerPerformanceMetrics(
+                reseller_id=row.reseller_id,
+                reseller_name=row.reseller_name,
+                total_credits_purchased=row.total_credits_purchased,
+                total_credits_distributed=row.total_credits_distributed,
+                total_credits_used=row.total_credits_used,
+                remaining_credits=row.remaining_credits,
+                total_revenue=float(row.total_revenue),
+                total_business_users=row.total_business_users,
+                active_business_users=row.active_business_users,
+                total_messages_sent=row.total_messages_sent,
+                credit_utilization_rate=float(row.credit_utilization_rate),
+                delivery_rate=float(row.delivery_rate),
                 revenue_per_business_user=(
-                    float(analytics.total_revenue) / analytics.total_business_users
-                    if analytics.total_business_users > 0 else 0.0
+                    float(row.total_revenue) / row.total_business_users
+                    if row.total_business_users > 0 else 0.0
                 )
             )
-            performers.append(metrics)
+            for row in rows
+        ]
         
         # Sort by different criteria
         top_by_revenue = sorted(performers, key=lambda x: x.total_revenue, reverse=True)[:limit]
@@ -331,50 +382,29 @@ class ResellerAnalyticsService:
         business_users_trend = []
         messages_sent_trend = []
         
+        # Rows are trusted DB values, so the trend items skip per-item validation
         for analytics in analytics_records:
-            period_data = {
-                "period_start": analytics.period_start.isoformat(),
-                "period_end": analytics.period_end.isoformat(),
-                "total_credits_purchased": analytics.total_credits_purchased,
-                "total_credits_distributed": analytics.total_credits_distributed,
-                "total_credits_used": analytics.total_credits_used,
-                "total_revenue": float(analytics.total_revenue),
-                "total_business_users": analytics.total_business_users,
-                "total_messages_sent": analytics.total_messages_sent,
-                "credit_utilization": analytics.calculate_credit_utilization(),
-                "delivery_rate": analytics.calculate_delivery_rate()
-            }
-            trend_data.append(period_data)
-            
-            credits_purchased_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": analytics.total_credits_purchased
-            })
-            
-            credits_distributed_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": analytics.total_credits_distributed
-            })
-            
-            credits_used_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": analytics.total_credits_used
-            })
-            
-            revenue_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": float(analytics.total_revenue)
-            })
-            
-            business_users_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": analytics.total_business_users
-            })
+            period_start = analytics.period_start
+            revenue = float(analytics.total_revenue)
+            trend_data.append(TrendPeriod.model_construct(
+                period_start=period_start,
+                period_end=analytics.period_end,
+                total_credits_purchased=analytics.total_credits_purchased,
+                total_credits_distributed=analytics.total_credits_distributed,
+                total_credits_used=analytics.total_credits_used,
+                total_revenue=revenue,
+                total_business_users=analytics.total_business_users,
+                total_messages_sent=analytics.total_messages_sent,
+                credit_utilization=analytics.calculate_credit_utilization(),
+                delivery_rate=analytics.calculate_delivery_rate()
+            ))
             
-            messages_sent_trend.append({
-                "period": analytics.period_start.isoformat(),
-                "value": analytics.total_messages_sent
-            })
+            credits_purchased_trend.append(TrendPoint.model_construct(period=period_start, value=float(analytics.total_credits_purchased)))
+            credits_distributed_trend.append(TrendPoint.model_construct(period=period_start, value=float(analytics.total_credits_distributed)))
+            credits_used_trend.append(TrendPoint.model_construct(period=period_start, value=float(analytics.total_credits_used)))
+            revenue_trend.append(TrendPoint.model_construct(period=period_start, value=revenue))
+            business_users_trend.append(TrendPoint.model_construct(period=period_start, value=float(analytics.total_business_users)))
+            messages_sent_trend.append(TrendPoint.model_construct(period=period_start, value=float(analytics.total_messages_sent)))
         
         return AnalyticsTrends(
             reseller_id=reseller_id,
@@ -474,7 +504,8 @@ class ResellerAnalyticsService:
             "messages_sent_growth": messages_sent_growth
         }
         
-        return AnalyticsComparison(
+        # Every value here is a float computed above, so skip re-checking the metrics dict key by key
+        return AnalyticsComparison.model_construct(
             current_period=current_data,
             previous_period=previous_data,
             comparison_metrics=comparison_metrics,
@@ -486,8 +517,10 @@ class ResellerAnalyticsService:
             messages_sent_growth=messages_sent_growth
         )
     
-    def get_health_check(self) -> AnalyticsHealthCheck:
+    def get_health_check(self) -> "AnalyticsHealthCheck":
         """Get analytics system health check"""
+        from schemas.reseller_analytics_admin import AnalyticsHealthCheck
+        
         total_records = self.db.query(ResellerAnalytics).count()
         
         # Get last updated time
@@ -530,8 +563,10 @@ class ResellerAnalyticsService:
             recommendations=recommendations
         )
     
-    def cleanup_old_analytics(self, cleanup_request: AnalyticsCleanupRequest) -> AnalyticsCleanupResponse:
+    def cleanup_old_analytics(self, cleanup_request: "AnalyticsCleanupRequest") -> "AnalyticsCleanupResponse":
         """Clean up old analytics records"""
+        from schemas.reseller_analytics_admin import AnalyticsCleanupResponse
+        
         cutoff_date = datetime.utcnow() - timedelta(days=cleanup_request.older_than_days)
         
         query = self.db.query(ResellerAnalytics).filter(
@@ -566,11 +601,62 @@ class ResellerAnalyticsService:
             message=f"Deleted {deleted_count} old analytics records"
         )
     
-    def _convert_to_response(self, analytics: ResellerAnalytics, include_business_stats: bool = True) -> ResellerAnalyticsResponse:
+    @staticmethod
+    def _with_business_stats(query: Query) -> Query:
+        """Eager-load business_user_stats and each stat's business name with two IN queries"""
+        return query.options(
+            selectinload(ResellerAnalytics.business_user_stats)
+            .selectinload(BusinessUserAnalytics.user)
+            .load_only(User.business_name)
+        )
+    
+    def _uses_materialized_view(self) -> bool:
+        return self.db.get_bind().dialect.name == "postgresql"
+    
+    def _get_business_stats_from_view(self, analytics_ids: List[str]) -> Dict[str, List[BusinessUserStats]]:
+        """Pre-aggregated business user stats from reseller_analytics_mv in one query.
+        
+        Returns {} outside PostgreSQL or when the view is missing; records created since the
+        last refresh are absent and fall back to the ORM relationship. Records already in the
+        view are served as of the last refresh (every 5 minutes), so business stats updated in
+        between show their old values until then.
+        """
+        if not analytics_ids or not self._uses_materialized_view():
+            return {}
+        mv = reseller_analytics_mv
+        try:
+            # A savepoint, so a missing view rolls back only this query and not the caller's work
+            with self.db.begin_nested():
+                rows = self.db.execute(
+                    select(mv.c.analytics_id, mv.c.business_user_stats).where(mv.c.analytics_id.in_(analytics_ids))
+                ).all()
+        except DBAPIError as e:
+            logger.warning(f"reseller_analytics_mv unavailable, loading business stats via ORM: {e}")
+            return {}
+        return {
+            analytics_id: [BusinessUserStats(**stat) for stat in stats or []]
+            for analytics_id, stats in rows
+        }
+    
+    def refresh_materialized_view(self) -> bool:
+        """Refresh reseller_analytics_mv without blocking readers. Returns False outside PostgreSQL."""
+        if not self._uses_materialized_view():
+            return False
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY reseller_analytics_mv"))
+        self.db.commit()
+        return True
+    
+    def _convert_to_response(
+        self,
+        analytics: ResellerAnalytics,
+        include_business_stats: bool = True,
+        business_stats: Optional[List[BusinessUserStats]] = None
+    ) -> ResellerAnalyticsResponse:
         """Convert analytics model to response schema"""
-        # Get business user stats if requested
-        business_stats = []
-        if include_business_stats:
+        # Get business user stats if requested and not already loaded from the materialized view
+        if not include_business_stats:
+            business_stats = []
+        elif business_stats is None:
             business_stats = [
                 BusinessUserStats(
                     user_id=stat.user_id,
@@ -0,0 +1,120 @@
+"""In-process cache of the device session columns validate_session() decides on.
+
+Each worker keeps a SessionSnapshot per session for up to SESSION_CACHE_TTL seconds, so the
+common "session is valid" answer needs no SELECT. Concurrent misses for the same session share
+one load. Every DeviceSession write in DeviceSessionService drops the local entry and stores a
+new version token for the session in Redis. A hit is only used while the token still matches
+the one it was loaded under, so a revocation reaches every worker on its next check. Without
+Redis other workers' writes cannot be seen, so nothing is cached and each check reads the row.
+Expiry is always re-checked against the clock, never taken from the cache.
+"""
+import threading
+import uuid
+from datetime import datetime
+from typing import Dict, NamedTuple, Optional
+
+import redis
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from core.cache import TTLCache, get_redis, _mark_unavailable
+from core.config import settings
+from models.device_session import DeviceSession
+
+# How long a concurrent miss waits for the leading load before querying on its own
+_INFLIGHT_WAIT = 1.0
+
+class SessionSnapshot(NamedTuple):
+    session_id: str
+    is_valid: bool
+    is_active: bool
+    is_compromised: bool
+    expires_at: datetime
+
+    def is_usable(self, now: datetime) -> bool:
+        return self.is_valid and self.is_active and not self.is_compromised and now <= self.expires_at
+
+# session_id -> (SessionSnapshot, version it was loaded under)
+_snapshots = TTLCache(maxsize=10_000, ttl=settings.SESSION_CACHE_TTL)
+_inflight: Dict[str, threading.Event] = {}
+_inflight_lock = threading.Lock()
+# Bumped by every invalidation; a load that raced one is returned but not cached
+_generation = 0
+
+def _version_key(session_id: str) -> str:
+    return f"session:{session_id}:version"
+
+def _current_version(client: redis.Redis, session_id: str) -> Optional[bytes]:
+    try:
+        value = client.get(_version_key(session_id))
+    except redis.RedisError:
+        _mark_unavailable()
+        return None
+    return value if value is not None else b""
+
+def _load_snapshot(db: Session, session_id: str) -> Optional[SessionSnapshot]:
+    row = db.execute(
+        select(
+            DeviceSession.session_id, DeviceSession.is_valid, DeviceSession.is_active,
+            DeviceSession.is_compromised, DeviceSession.expires_at
+        ).where(DeviceSession.session_id == session_id)
+    ).first()
+    return SessionSnapshot(*row) if row else None
+
+def _cached_snapshot(session_id: str, version: bytes) -> Optional[SessionSnapshot]:
+    entry = _snapshots.get(session_id)
+    return entry[0] if entry is not None and entry[1] == version else None
+
+def get_session_snapshot(db: Session, session_id: str) -> Optional[SessionSnapshot]:
+    """Return the cached snapshot for session_id, loading it once on a miss. None if the session does not exist."""
+    client = get_redis()
+    version = _current_version(client, session_id) if client is not None else None
+    if version is None:
+        return _load_snapshot(db, session_id)
+
+    snapshot = _cached_snapshot(session_id, version)
+    if snapshot is not None:
+        return snapshot
+
+    with _inflight_lock:
+        event = _inflight.get(session_id)
+        leader = event is None
+        if leader:
+            event = _inflight[session_id] = threading.Event()
+            generation = _generation
+
+    if not leader:
+        event.wait(_INFLIGHT_WAIT)
+        snapshot = _cached_snapshot(session_id, version)
+        return snapshot if snapshot is not None else _load_snapshot(db, session_id)
+
+    try:
+        snapshot = _load_snapshot(db, session_id)
+        with _inflight_lock:
+            if snapshot is not None and generation == _generation:
+                _snapshots.set(session_id, (snapshot, version))
+        return snapshot
+    finally:
+        with _inflight_lock:
+            del _inflight[session_id]
+        event.set()
+
+def invalidate_session_snapshot(*session_ids: str) -> None:
+    """Drop the local snapshots and bump their Redis versions so every other worker reloads them too"""
+    global _generation
+    with _inflight_lock:
+        _generation += 1
+    for session_id in session_ids:
+        _snapshots.pop(session_id)
+
+    client = get_redis()
+    if client is None or not session_ids:
+        return
+    try:
+        with client.pipeline(transaction=False) as pipe:
+            for session_id in session_ids:
+                # Versions are never reused, and only have to outlive the snapshots loaded before them
+                pipe.set(_version_key(session_id), uuid.uuid4().hex, ex=max(settings.SESSION_CACHE_TTL, 1))
+            pipe.execute()
+    except redis.RedisError:
+        _mark_unavailable()
@@ -0,0 +1,185 @@
+"""Redis-backed activity counters for device sessions.
+
+Request/message increments are accumulated with HINCRBY on a per-session hash instead of
+updating the device_sessions row on every call, and the latest last_activity/last_ip_address
+ride along in the same hash; flush_session_counters() folds the pending values into the table
+and is run periodically by the Celery beat schedule. Buffered values are only removed from
+Redis after the database commit, so a failed flush leaves them for the next run.
+"""
+from datetime import datetime
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+import redis
+from sqlalchemy import DateTime, String, and_, bindparam, case, func, or_, update
+from sqlalchemy.orm import Session
+
+from core.cache import get_redis, _mark_unavailable
+from models.device_session import DeviceSession
+
+_DIRTY_KEY = "sess:counters:dirty"
+_FLUSH_BATCH_SIZE = 500
+
+# Runs after the flush commits. Subtracts what was written (increments made meanwhile stay), drops
+# last_activity/last_ip_address only if they were not overwritten, and leaves the session in
+# the dirty set while anything is still pending.
+# KEYS: counters hash, dirty set. ARGV: session_id, requests, messages, last_activity, ip.
+_SETTLE_SCRIPT = """
+local key = KEYS[1]
+if tonumber(ARGV[2]) ~= 0 then redis.call('HINCRBY', key, 'total_requests', -tonumber(ARGV[2])) end
+if tonumber(ARGV[3]) ~= 0 then redis.call('HINCRBY', key, 'messages_sent_via_session', -tonumber(ARGV[3])) end
+if ARGV[4] ~= '' and redis.call('HGET', key, 'last_activity') == ARGV[4] then redis.call('HDEL', key, 'last_activity') end
+if ARGV[5] ~= '' and redis.call('HGET', key, 'last_ip_address') == ARGV[5] then redis.call('HDEL', key, 'last_ip_address') end
+for _, field in ipairs({'total_requests', 'messages_sent_via_session'}) do
+    if tonumber(redis.call('HGET', key, field)) == 0 then redis.call('HDEL', key, field) end
+end
+if redis.call('HLEN', key) == 0 then redis.call('SREM', KEYS[2], ARGV[1]) end
+return 1
+"""
+
+def _counters_key(session_id: str) -> str:
+    return f"sess:{session_id}:counters"
+
+def incr_session_counters(
+    session_id: str, requests: int = 1, messages: int = 0,
+    activity_at: Optional[datetime] = None, ip_address: Optional[str] = None
+) -> bool:
+    """Record activity in Redis. Returns False when Redis is unavailable so callers update the row."""
+    client = get_redis()
+    if client is None:
+        return False
+    key = _counters_key(session_id)
+    try:
+        pipe = client.pipeline(transaction=True)
+        if requests:
+            pipe.hincrby(key, "total_requests", requests)
+        if messages:
+            pipe.hincrby(key, "messages_sent_via_session", messages)
+        if activity_at is not None:
+            pipe.hset(key, "last_activity", activity_at.isoformat())
+        if ip_address:
+            pipe.hset(key, "last_ip_address", ip_address)
+        pipe.sadd(_DIRTY_KEY, session_id)
+        pipe.execute()
+    except redis.RedisError:
+        _mark_unavailable()
+        return False
+    return True
+
+def pending_session_counters(session_id: str) -> Tuple[int, int]:
+    """Return (total_requests, messages_sent_via_session) not yet flushed to the database"""
+    client = get_redis()
+    if client is None:
+        return 0, 0
+    try:
+        values = client.hmget(_counters_key(session_id), "total_requests", "messages_sent_via_session")
+    except redis.RedisError:
+        _mark_unavailable()
+        return 0, 0
+    return int(values[0] or 0), int(values[1] or 0)
+
+def pending_last_activity(session_id: str) -> Optional[datetime]:
+    """Return the last_activity recorded in Redis but not yet flushed, if any"""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        value = client.hget(_counters_key(session_id), "last_activity")
+    except redis.RedisError:
+        _mark_unavailable()
+        return None
+    return datetime.fromisoformat(value.decode()) if value else None
+
+def pending_session_counters_many(session_ids: Iterable[str]) -> Dict[str, Tuple[int, int]]:
+    """pending_session_counters() for several sessions in one round trip"""
+    session_ids = list(session_ids)
+    client = get_redis()
+    if client is None or not session_ids:
+        return {}
+    try:
+        pipe = client.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.hmget(_counters_key(session_id), "total_requests", "messages_sent_via_session")
+        results = pipe.execute()
+    except redis.RedisError:
+        _mark_unavailable()
+        return {}
+    return {
+        session_id: (int(values[0] or 0), int(values[1] or 0))
+        for session_id, values in zip(session_ids, results)
+    }
+
+def flush_session_counters(db: Session) -> int:
+    """Apply pending counter deltas to device_sessions. Returns the number of sessions flushed.
+    
+    Delivery is at-least-once: if Redis fails between the commit and the settle step, that batch
+    is applied again on the next run.
+    """
+    client = get_redis()
+    if client is None:
+        return 0
+
+    table = DeviceSession.__table__
+    activity = bindparam("activity", type_=DateTime)
+    # Never move last_activity backwards past a newer direct write (login, extend, ...)
+    stmt = update(table).where(table.c.session_id == bindparam("sid")).values(
+        total_requests=table.c.total_requests + bindparam("requests"),
+        messages_sent_via_session=table.c.messages_sent_via_session + bindparam("messages"),
+        last_activity=case(
+            (and_(activity.is_not(None), or_(table.c.last_activity.is_(None), table.c.last_activity < activity)), activity),
+            else_=table.c.last_activity
+        ),
+        last_ip_address=func.coalesce(bindparam("ip", type_=String), table.c.last_ip_address)
+    )
+    settle = client.register_script(_SETTLE_SCRIPT)
+
+    flushed = 0
+    dirty = client.sscan_iter(_DIRTY_KEY, count=_FLUSH_BATCH_SIZE)
+    while True:
+        # SSCAN may repeat a member; each batch must apply a session once
+        session_ids = list(dict.fromkeys(sid.decode() for sid in islice(dirty, _FLUSH_BATCH_SIZE)))
+        if not session_ids:
+            break
+
+        # Read without clearing: the values stay in Redis until the UPDATE has committed
+        pipe = client.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.hgetall(_counters_key(session_id))
+        results = pipe.execute()
+
+        pending = [
+            (
+                session_id,
+                int(counters.get(b"total_requests", 0)),
+                int(counters.get(b"messages_sent_via_session", 0)),
+                counters.get(b"last_activity", b"").decode(),
+                counters.get(b"last_ip_address", b"").decode()
+            )
+            for session_id, counters in zip(session_ids, results)
+        ]
+        rows = [
+            {
+                "sid": session_id,
+                "requests": requests,
+                "messages": messages,
+                "activity": datetime.fromisoformat(activity) if activity else None,
+                "ip": ip_address or None
+            }
+            for session_id, requests, messages, activity, ip_address in pending
+            if requests or messages or activity or ip_address
+        ]
+        if rows:
+            try:
+                db.execute(stmt, rows)
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            flushed += len(rows)
+
+        pipe = client.pipeline(transaction=False)
+        for values in pending:
+            settle(keys=[_counters_key(values[0]), _DIRTY_KEY], args=list(values), client=pipe)
+        pipe.execute()
+
+    return flushed
@@ -39,7 +39,7 @@ class UnofficialDeviceService:
         device = UnofficialLinkedDevice(
             user_id=device_data.user_id,
             device_name=device_data.device_name,
-            device_type=device_data.device_type.value,
+            device_type=device_data.device_type,
             device_os=device_data.device_os,
             browser_info=device_data.browser_info,
             ip_address=device_data.ip_address,
@@ -71,7 +71,7 @@ class UnofficialDeviceService:
         if not device:
             return None
         
-        update_dict = update_data.dict(exclude_unset=True)
+        update_dict = update_data.model_dump(exclude_unset=True)
         for field, value in update_dict.items():
             setattr(device, field, value)
         
@@ -219,15 +219,12 @@ class UnofficialDeviceService:
         
         return device
     
-    def get_device_stats(self, device_id: str) -> DeviceStats:
-        device = self.get_device_by_id(device_id)
-        if not device:
-            raise ValueError("Device not found")
-        
+    @staticmethod
+    def _build_device_stats(device: UnofficialLinkedDevice, now: datetime) -> DeviceStats:
         # Calculate uptime percentage (simplified)
         uptime_percentage = 0.0
         if device.created_at:
-            total_time = (datetime.utcnow() - device.created_at).total_seconds() / 60  # in minutes
+            total_time = (now - device.created_at).total_seconds() / 60  # in minutes
             if total_time > 0:
                 uptime_percentage = (device.total_activity_time / total_time) * 100
         
@@ -244,24 +241,31 @@ class UnofficialDeviceService:
             uptime_percentage=min(uptime_percentage, 100.0)
         )
     
+    def get_device_stats(self, device_id: str) -> DeviceStats:
+        device = self.get_device_by_id(device_id)
+        if not device:
+            raise ValueError("Device not found")
+        
+        return self._build_device_stats(device, datetime.utcnow())
+    
     def get_user_device_stats(self, user_id: str) -> UserDeviceStats:
         devices = self.get_devices_by_user(user_id)
+        now = datetime.utcnow()
         
-        total_devices = len(devices)
-        active_devices = len([d for d in devices if d.is_active])
-        connected_devices = len([d for d in devices if d.session_status == "connected"])
-        
-        total_messages_sent = sum(d.messages_sent for d in devices)
-        total_messages_received = sum(d.messages_received for d in devices)
-        
+        # One pass over the loaded rows; per-device stats are built from them, not re-fetched
+        active_devices = connected_devices = 0
+        total_messages_sent = total_messages_received = 0
         device_stats = []
         for device in devices:
-            stats = self.get_device_stats(device.device_id)
-            device_stats.append(stats)
+            active_devices += device.is_active
+            connected_devices += device.session_status == "connected"
+            total_messages_sent += device.messages_sent
+            total_messages_received += device.messages_received
+            device_stats.append(self._build_device_stats(device, now))
         
         return UserDeviceStats(
             user_id=user_id,
-            total_devices=total_devices,
+            total_devices=len(devices),
             active_devices=active_devices,
             connected_devices=connected_devices,
             total_messages_sent=total_messages_sent,
@@ -1,25 +1,90 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import DateTime, or_
+from sqlalchemy.orm import Session, raiseload
 from models.user import User
 from schemas.user import UserCreate, UserUpdate
+from core.cache import cache_get, cache_set, cache_delete
+from core.user_cache import invalidate_user_projection
+from core.config import settings
 from typing import Optional, List
 from datetime import datetime
 import bcrypt
 
+# Credentials never go to Redis; logins read them from the database
+_USER_COLUMNS = tuple(column.key for column in User.__table__.columns if column.key != "password_hash")
+_USER_DATETIME_COLUMNS = frozenset(
+    column.key for column in User.__table__.columns if isinstance(column.type, DateTime)
+)
+
+def _user_to_cache(user: User) -> dict:
+    return {column: getattr(user, column) for column in _USER_COLUMNS}
+
+def _user_from_cache(data: dict) -> User:
+    # Detached, read-only copy of the row; write paths always load the user from the session
+    for column in _USER_DATETIME_COLUMNS:
+        if data.get(column):
+            data[column] = datetime.fromisoformat(data[column])
+    return User(**data)
+
+def invalidate_cached_user(user: User) -> None:
+    cache_delete(f"user:{user.user_id}", f"user:username:{user.username}")
+    invalidate_user_projection(user.user_id)
+
 class UserService:
+    __slots__ = ("db",)
+
     def __init__(self, db: Session):
         self.db = db
     
     def get_user_by_id(self, user_id: str) -> Optional[User]:
+        cached = cache_get(f"user:{user_id}")
+        if cached is not None:
+            return _user_from_cache(cached)
+        
+        user = self._load_user_by_id(user_id)
+        if user:
+            cache_set(f"user:{user_id}", _user_to_cache(user), settings.USER_CACHE_TTL)
+        return user
+    
+    def _load_user_by_id(self, user_id: str) -> Optional[User]:
         return self.db.query(User).filter(User.user_id == user_id).first()
     
+    def get_user_updated_at(self, user_id: str) -> Optional[datetime]:
+        return self.db.query(User.updated_at).filter(User.user_id == user_id).scalar()
+    
     def get_user_by_username(self, username: str) -> Optional[User]:
+        cached = cache_get(f"user:username:{username}")
+        if cached is not None:
+            return _user_from_cache(cached)
+        
+        user = self.get_user_for_login(username)
+        if user:
+            cache_set(f"user:username:{username}", _user_to_cache(user), settings.USER_CACHE_TTL)
+        return user
+    
+    def get_user_for_login(self, username: str) -> Optional[User]:
+        """Load the user with its password hash, always from the database"""
         return self.db.query(User).filter(User.username == username).first()
     
     def get_user_by_email(self, email: str) -> Optional[User]:
         return self.db.query(User).filter(User.email == email).first()
     
+    def preflight_user_checks(self, username: str, email: str, reseller_id: Optional[str] = None) -> dict:
+        """Resolve the reseller and duplicate username/email checks in a single query"""
+        conditions = [User.username == username, User.email == email]
+        if reseller_id:
+            conditions.append(User.user_id == reseller_id)
+        
+        rows = self.db.query(User.user_id, User.role, User.username, User.email).filter(or_(*conditions)).all()
+        
+        return {
+            "reseller_exists": any(row.user_id == reseller_id and row.role == "reseller" for row in rows) if reseller_id else None,
+            "username_taken": any(row.username == username for row in rows),
+            "email_taken": any(row.email == email for row in rows)
+        }
+    
     def get_users(self, skip: int = 0, limit: int = 100) -> List[User]:
-        return self.db.query(User).offset(skip).limit(limit).all()
+        # Listings only read column attributes; fail loudly instead of lazy-loading per row
+        return self.db.query(User).options(raiseload("*")).offset(skip).limit(limit).all()
     
     def create_user(self, user_data: UserCreate) -> User:
         # Hash password
@@ -53,14 +118,16 @@ class UserService:
         self.db.add(db_user)
         self.db.commit()
         self.db.refresh(db_user)
+        invalidate_cached_user(db_user)
         return db_user
     
     def update_user(self, user_id: str, user_data: UserUpdate) -> Optional[User]:
-        db_user = self.get_user_by_id(user_id)
+        db_user = self._load_user_by_id(user_id)
         if not db_user:
             return None
         
-        update_data = user_data.dict(exclude_unset=True)
+        invalidate_cached_user(db_user)
+        update_data = user_data.model_dump(exclude_unset=True)
         
         for field, value in update_data.items():
             if field == "profile" and value:
@@ -90,19 +157,21 @@ class UserService:
         db_user.updated_at = datetime.utcnow()
         self.db.commit()
         self.db.refresh(db_user)
+        invalidate_cached_user(db_user)
         return db_user
     
     def delete_user(self, user_id: str) -> bool:
-        db_user = self.get_user_by_id(user_id)
+        db_user = self._load_user_by_id(user_id)
         if not db_user:
             return False
         
         self.db.delete(db_user)
         self.db.commit()
+        invalidate_cached_user(db_user)
         return True
     
     def authenticate_user(self, username: str, password: str) -> Optional[User]:
-        user = self.get_user_by_username(username)
+        user = self.get_user_for_login(username)
         if not user:
             return None
         
@@ -111,7 +180,9 @@ class UserService:
         return None
     
     def get_business_owners_by_reseller(self, reseller_id: str, skip: int = 0, limit: int = 100) -> List[User]:
-        return self.db.query(User).filter(User.parent_reseller_id == reseller_id).offset(skip).limit(limit).all()
+        return self.db.query(User).options(raiseload("*")).filter(
+            User.parent_reseller_id == reseller_id
+        ).offset(skip).limit(limit).all()
     
     def create_business_owner(self, user_data: UserCreate, reseller_id: str) -> User:
         # Set parent reseller and role
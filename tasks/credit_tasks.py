@@ -1,8 +1,15 @@
+from datetime import datetime, timedelta
+
 from celery import Celery
 from sqlalchemy.orm import Session
+from core.config import settings
 from db.database import SessionLocal
 from services.credit_distribution_service import CreditDistributionService
 from services.user_service import UserService
+from services.session_counters import flush_session_counters
+from models.device_session import DeviceSession
+from models.usage_log_partitions import drop_usage_log_partitions_before, ensure_usage_log_partitions
+from services.reseller_analytics_service import ResellerAnalyticsService
 from schemas.credit_distribution import CreditDistributionCreate
 
 # Initialize Celery
@@ -43,12 +50,96 @@ def update_user_credits_periodically():
     finally:
         db.close()
 
+@celery_app.task
+def flush_session_counters_periodically():
+    """Fold Redis-buffered session request/message counters into device_sessions"""
+    db = SessionLocal()
+    try:
+        flushed = flush_session_counters(db)
+        return {"status": "success", "message": f"Flushed counters for {flushed} sessions"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def reap_expired_sessions_periodically():
+    """Revoke expired device sessions in a single UPDATE"""
+    db = SessionLocal()
+    try:
+        reaped = DeviceSession.bulk_reap_expired(db)
+        return {"status": "success", "message": f"Revoked {reaped} expired sessions"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def refresh_reseller_analytics_view():
+    """Refresh the reseller_analytics_mv materialized view (PostgreSQL only)"""
+    db = SessionLocal()
+    try:
+        refreshed = ResellerAnalyticsService(db).refresh_materialized_view()
+        message = "Materialized view refreshed" if refreshed else "Materialized view not used on this database"
+        return {"status": "success", "message": message}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def create_usage_log_partitions():
+    """Create upcoming monthly message_usage_logs partitions (PostgreSQL only)"""
+    db = SessionLocal()
+    try:
+        created = ensure_usage_log_partitions(db)
+        return {"status": "success", "message": f"Ensured partitions: {', '.join(created) or 'none'}"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
+@celery_app.task
+def drop_old_usage_log_partitions():
+    """Drop monthly message_usage_logs partitions past USAGE_LOG_RETENTION_DAYS (PostgreSQL only)"""
+    if settings.USAGE_LOG_RETENTION_DAYS <= 0:
+        return {"status": "success", "message": "Usage log retention disabled"}
+    db = SessionLocal()
+    try:
+        cutoff = datetime.utcnow() - timedelta(days=settings.USAGE_LOG_RETENTION_DAYS)
+        dropped = drop_usage_log_partitions_before(db, cutoff)
+        return {"status": "success", "message": f"Dropped partitions holding {dropped} usage logs"}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+    finally:
+        db.close()
+
 # Schedule periodic tasks
 celery_app.conf.beat_schedule = {
     'update-credits-daily': {
         'task': 'tasks.credit_tasks.update_user_credits_periodically',
         'schedule': 86400.0,  # Run daily
     },
+    'flush-session-counters': {
+        'task': 'tasks.credit_tasks.flush_session_counters_periodically',
+        'schedule': 30.0,  # Run every 30 seconds
+    },
+    'reap-expired-sessions': {
+        'task': 'tasks.credit_tasks.reap_expired_sessions_periodically',
+        'schedule': 60.0,  # Run every minute
+    },
+    'refresh-reseller-analytics-view': {
+        'task': 'tasks.credit_tasks.refresh_reseller_analytics_view',
+        'schedule': 300.0,  # Run every 5 minutes
+    },
+    'create-usage-log-partitions': {
+        'task': 'tasks.credit_tasks.create_usage_log_partitions',
+        'schedule': 86400.0,  # Run daily
+    },
+    'drop-old-usage-log-partitions': {
+        'task': 'tasks.credit_tasks.drop_old_usage_log_partitions',
+        'schedule': 86400.0,  # Run daily
+    },
 }
 
 celery_app.conf.timezone = 'UTC'
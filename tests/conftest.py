@@ -0,0 +1,88 @@
+import os
+import sys
+import tempfile
+
+# Point the app at a throwaway SQLite file before anything imports db.database
+_DB_DIR = tempfile.mkdtemp(prefix="whatsapp-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_DB_DIR}/test.db"
+os.environ["CACHE_ENABLED"] = "true"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import core.cache
+import core.security
+import core.user_cache
+import services.session_cache
+from db.database import Base, SessionLocal, engine
+from models.unofficial_device import UnofficialLinkedDevice
+from models.user import User
+from schemas.device_session import SessionCreateRequest
+from services.device_session_service import DeviceSessionService
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    """Every test starts from empty tables, no Redis client and empty per-worker caches"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    core.cache._client = None
+    core.cache._retry_at = float("inf")
+    core.security._token_cache.clear()
+    core.user_cache._projections.clear()
+    services.session_cache._snapshots.clear()
+    yield
+    core.cache._client = None
+    core.cache._retry_at = 0.0
+
+@pytest.fixture
+def redis_client():
+    """In-memory Redis (with Lua scripting) installed as the shared client from core.cache"""
+    fakeredis = pytest.importorskip("fakeredis")
+    client = fakeredis.FakeRedis()
+    core.cache._client = client
+    yield client
+    client.flushall()
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+@pytest.fixture
+def client():
+    return TestClient(main.app)
+
+@pytest.fixture
+def make_user(client):
+    def _make_user(username="reseller", role="reseller", credits=1000):
+        response = client.post("/users/", json={
+            "role": role,
+            "profile": {"name": username.title(), "username": username, "email": f"{username}@example.com",
+                        "phone": "+910000000000", "password_hash": "secret"},
+            "wallet": {"total_credits": credits, "available_credits": credits}
+        })
+        assert response.status_code == 201, response.text
+        return response.json()
+    return _make_user
+
+@pytest.fixture
+def session_service(db):
+    return DeviceSessionService(db)
+
+@pytest.fixture
+def session_id(db, session_service):
+    user = User(name="Owner", username="owner", email="owner@example.com", phone="+910000000001",
+                password_hash="x", role="business_owner")
+    db.add(user)
+    db.commit()
+    device = UnofficialLinkedDevice(user_id=user.user_id, device_name="phone", device_type="web",
+                                    session_status="connected")
+    db.add(device)
+    db.commit()
+    return session_service.create_session(SessionCreateRequest(device_id=device.device_id, session_data="secret")).session_id
@@ -0,0 +1,48 @@
+def _make_business_owner(client, make_user, credits):
+    reseller = make_user(credits=1000)
+    owner = client.post(f"/resellers/{reseller['user_id']}/business-owners/", json={
+        "role": "business_owner",
+        "profile": {"name": "Owner", "username": "owner", "email": "owner@example.com",
+                    "phone": "+910000000001", "password_hash": "secret"}
+    }).json()
+    client.post("/credit-distributions/", json={
+        "from_reseller_id": reseller["user_id"], "to_business_user_id": owner["user_id"], "credits_shared": credits
+    })
+    return owner
+
+def test_bulk_send_debits_only_affordable_messages(client, make_user):
+    owner = _make_business_owner(client, make_user, credits=2)
+
+    response = client.post(f"/users/{owner['user_id']}/send-bulk-messages/", json={
+        "receiver_numbers": ["+911111111111", "+912222222222", "+913333333333"],
+        "message_type": "text", "message_body": "hello"
+    })
+    assert response.status_code == 200, response.text
+    assert [m["receiver_number"] for m in response.json()] == ["+911111111111", "+912222222222"]
+
+    wallet = client.get(f"/users/{owner['user_id']}").json()["business_owner_wallet"]
+    assert wallet["credits_remaining"] == 0
+    assert wallet["credits_used"] == 2
+
+def test_sending_messages_writes_no_usage_logs(client, make_user):
+    owner = _make_business_owner(client, make_user, credits=5)
+
+    client.post(f"/users/{owner['user_id']}/send-message/", json={
+        "receiver_number": "+911111111111", "message_type": "text", "message_body": "hello"
+    })
+    client.post(f"/users/{owner['user_id']}/send-bulk-messages/", json={
+        "receiver_numbers": ["+912222222222"], "message_type": "text", "message_body": "hello"
+    })
+    assert client.get(f"/users/{owner['user_id']}/usage-logs/").json() == []
+
+def test_bulk_send_logs_skipped_receivers(client, make_user, caplog):
+    owner = _make_business_owner(client, make_user, credits=1)
+
+    with caplog.at_level("WARNING", logger="services.message_service"):
+        client.post(f"/users/{owner['user_id']}/send-bulk-messages/", json={
+            "receiver_numbers": ["+911111111111", "not-a-number", "+912222222222"],
+            "message_type": "text", "message_body": "hello"
+        })
+    messages = [record.getMessage() for record in caplog.records]
+    assert any("not-a-number" in message for message in messages)
+    assert "Failed to send message to +912222222222: Insufficient credits" in messages
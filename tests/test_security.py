@@ -0,0 +1,27 @@
+import time
+from datetime import timedelta
+
+from core import security
+
+def test_verify_token_decodes_once_per_token(monkeypatch):
+    token = security.create_access_token({"sub": "user-1"})
+    calls = []
+    decode = security.jwt.decode
+    monkeypatch.setattr(security.jwt, "decode", lambda *args, **kwargs: calls.append(1) or decode(*args, **kwargs))
+
+    assert security.verify_token(token)["sub"] == "user-1"
+    assert security.verify_token(token)["sub"] == "user-1"
+    assert len(calls) == 1
+
+def test_cached_payload_never_outlives_the_token():
+    token = security.create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=5))
+    assert security.verify_token(token) is not None
+
+    (_, expires_at), = security._token_cache._data.values()
+    assert expires_at - time.monotonic() <= 5
+
+def test_invalid_and_expired_tokens_are_not_cached():
+    expired = security.create_access_token({"sub": "user-1"}, expires_delta=timedelta(seconds=-1))
+    assert security.verify_token(expired) is None
+    assert security.verify_token("not-a-token") is None
+    assert not security._token_cache._data
@@ -0,0 +1,38 @@
+from sqlalchemy import update
+
+from models.device_session import DeviceSession
+from schemas.device_session import SessionRevokeRequest
+from services import session_cache
+
+def test_snapshot_is_reused_while_version_matches(db, session_service, session_id, redis_client):
+    assert session_service.validate_session(session_id).is_valid
+    snapshot, _ = session_cache._snapshots.get(session_id)
+
+    # A write that skips the service leaves the cached snapshot in place
+    db.execute(update(DeviceSession).where(DeviceSession.session_id == session_id).values(is_valid=False))
+    db.commit()
+    assert session_cache.get_session_snapshot(db, session_id) is snapshot
+
+def test_revocation_drops_local_snapshot(session_service, session_id, redis_client):
+    assert session_service.validate_session(session_id).is_valid
+    session_service.revoke_session(SessionRevokeRequest(session_id=session_id, reason="lost phone"))
+    assert session_cache._snapshots.get(session_id) is None
+    assert not session_service.validate_session(session_id).is_valid
+
+def test_revocation_reaches_snapshots_held_by_other_workers(session_service, session_id, redis_client):
+    assert session_service.validate_session(session_id).is_valid
+    stale = session_cache._snapshots.get(session_id)
+
+    session_service.revoke_session(SessionRevokeRequest(session_id=session_id, reason="lost phone"))
+    # Another worker still holds the entry it loaded before the revocation
+    session_cache._snapshots.set(session_id, stale)
+
+    assert not session_service.validate_session(session_id).is_valid
+
+def test_snapshots_are_not_cached_without_redis(db, session_service, session_id):
+    assert session_service.validate_session(session_id).is_valid
+    assert session_cache._snapshots.get(session_id) is None
+
+    db.execute(update(DeviceSession).where(DeviceSession.session_id == session_id).values(is_valid=False))
+    db.commit()
+    assert not session_service.validate_session(session_id).is_valid
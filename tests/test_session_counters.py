@@ -0,0 +1,57 @@
+import time
+from datetime import datetime
+
+import pytest
+
+import core.cache
+from models.device_session import DeviceSession
+from services import session_counters
+
+def _row(db, session_id):
+    db.expire_all()
+    return db.get(DeviceSession, session_id)
+
+def test_increments_are_buffered_until_flushed(db, session_id, redis_client):
+    before = _row(db, session_id).total_requests
+    activity_at = datetime(2030, 1, 1, 12, 0, 0)
+
+    assert session_counters.incr_session_counters(session_id, requests=2, messages=1, activity_at=activity_at)
+    assert session_counters.pending_session_counters(session_id) == (2, 1)
+    assert session_counters.pending_last_activity(session_id) == activity_at
+    assert _row(db, session_id).total_requests == before
+
+    assert session_counters.flush_session_counters(db) == 1
+    row = _row(db, session_id)
+    assert (row.total_requests, row.messages_sent_via_session) == (before + 2, 1)
+    assert row.last_activity == activity_at
+    assert session_counters.pending_session_counters(session_id) == (0, 0)
+    assert not redis_client.sismember(session_counters._DIRTY_KEY, session_id)
+
+def test_failed_flush_keeps_buffered_counters(db, session_id, redis_client, monkeypatch):
+    session_counters.incr_session_counters(session_id, requests=3)
+
+    def failing_commit():
+        raise RuntimeError("database went away")
+    monkeypatch.setattr(db, "commit", failing_commit)
+    with pytest.raises(RuntimeError):
+        session_counters.flush_session_counters(db)
+    monkeypatch.undo()
+
+    assert session_counters.pending_session_counters(session_id) == (3, 0)
+    assert session_counters.flush_session_counters(db) == 1
+    assert session_counters.pending_session_counters(session_id) == (0, 0)
+
+def test_redis_errors_back_off_and_fall_back_to_the_row(db, session_service, session_id):
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    server.connected = False
+    core.cache._client = fakeredis.FakeRedis(server=server)
+    before = _row(db, session_id).total_requests
+
+    assert not session_counters.incr_session_counters(session_id)
+    assert core.cache._client is None
+    assert time.monotonic() < core.cache._retry_at < float("inf")
+
+    assert session_counters.pending_session_counters(session_id) == (0, 0)
+    assert session_service.validate_session(session_id).is_valid
+    assert _row(db, session_id).total_requests == before + 1
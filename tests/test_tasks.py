@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from core.config import settings
+from models.device_session import DeviceSession
+from services import session_counters
+from tasks import credit_tasks
+
+def test_flush_task_folds_buffered_counters_into_the_row(db, session_id, redis_client):
+    before = db.get(DeviceSession, session_id).total_requests
+    session_counters.incr_session_counters(session_id, requests=4, messages=2)
+
+    result = credit_tasks.flush_session_counters_periodically()
+    assert result == {"status": "success", "message": "Flushed counters for 1 sessions"}
+
+    db.expire_all()
+    row = db.get(DeviceSession, session_id)
+    assert (row.total_requests, row.messages_sent_via_session) == (before + 4, 2)
+
+def test_flush_task_without_redis_does_nothing():
+    assert credit_tasks.flush_session_counters_periodically()["message"] == "Flushed counters for 0 sessions"
+
+def test_reap_task_revokes_expired_sessions(db, session_id):
+    db.execute(
+        update(DeviceSession).where(DeviceSession.session_id == session_id)
+        .values(expires_at=datetime.utcnow() - timedelta(hours=1))
+    )
+    db.commit()
+
+    assert credit_tasks.reap_expired_sessions_periodically()["message"] == "Revoked 1 expired sessions"
+    db.expire_all()
+    row = db.get(DeviceSession, session_id)
+    assert not row.is_active and row.revoked_at is not None
+
+def test_drop_partitions_task_is_disabled_without_retention(monkeypatch):
+    monkeypatch.setattr(settings, "USAGE_LOG_RETENTION_DAYS", 0)
+    assert credit_tasks.drop_old_usage_log_partitions()["message"] == "Usage log retention disabled"
+
+def test_partition_and_view_tasks_are_noops_on_sqlite(monkeypatch):
+    monkeypatch.setattr(settings, "USAGE_LOG_RETENTION_DAYS", 30)
+    assert credit_tasks.drop_old_usage_log_partitions()["status"] == "success"
+    assert credit_tasks.create_usage_log_partitions()["message"] == "Ensured partitions: none"
+    assert credit_tasks.refresh_reseller_analytics_view()["message"] == "Materialized view not used on this database"
@@ -0,0 +1,60 @@
+import json
+
+from sqlalchemy import update
+
+from models.user import User
+
+def test_get_user_is_served_from_redis_on_second_read(client, db, redis_client, make_user):
+    user = make_user()
+    user_id = user["user_id"]
+
+    first = client.get(f"/users/{user_id}")
+    assert first.status_code == 200
+    cached = json.loads(redis_client.get(f"user:{user_id}"))
+    assert "password_hash" not in cached
+
+    # Change the row behind the cache's back; a cache hit must still answer with the cached copy
+    db.execute(update(User).where(User.user_id == user_id).values(name="Changed"))
+    db.commit()
+
+    second = client.get(f"/users/{user_id}")
+    assert second.status_code == 200
+    assert second.json() == first.json()
+    assert second.json()["profile"]["name"] == "Reseller"
+
+def test_user_responses_never_include_password_hash(client, redis_client, make_user):
+    user = make_user()
+    assert "password_hash" not in user["profile"]
+    for _ in range(2):
+        assert "password_hash" not in client.get(f"/users/{user['user_id']}").json()["profile"]
+
+def test_login_reads_credentials_from_database_on_cache_hit(client, redis_client, make_user):
+    make_user()
+    client.get("/users/")
+    assert client.post("/users/login", json={"username": "reseller", "password": "secret"}).status_code == 200
+    assert client.post("/users/login", json={"username": "reseller", "password": "wrong"}).status_code == 401
+
+def test_credit_distribution_invalidates_cached_users(client, redis_client, make_user):
+    reseller = make_user()
+    owner = client.post(f"/resellers/{reseller['user_id']}/business-owners/", json={
+        "role": "business_owner",
+        "profile": {"name": "Owner", "username": "owner", "email": "owner@example.com",
+                    "phone": "+910000000001", "password_hash": "secret"}
+    }).json()
+
+    client.get(f"/users/{reseller['user_id']}")
+    client.get(f"/users/{owner['user_id']}")
+    assert redis_client.exists(f"user:{reseller['user_id']}", f"user:{owner['user_id']}") == 2
+
+    response = client.post("/credit-distributions/", json={
+        "from_reseller_id": reseller["user_id"], "to_business_user_id": owner["user_id"], "credits_shared": 100
+    })
+    assert response.status_code == 201, response.text
+    assert redis_client.exists(f"user:{reseller['user_id']}", f"user:{owner['user_id']}") == 0
+
+    assert client.get(f"/users/{reseller['user_id']}").json()["wallet"]["available_credits"] == 900
+    assert client.get(f"/users/{owner['user_id']}").json()["business_owner_wallet"]["credits_remaining"] == 100
+
+def test_get_user_without_redis_reads_database(client, make_user):
+    user = make_user()
+    assert client.get(f"/users/{user['user_id']}").status_code == 200
@@ -1,6 +1,7 @@
 import re
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timezone
+from email.utils import format_datetime as _format_rfc_datetime, parsedate_to_datetime
 
 def validate_email(email: str) -> bool:
     """Validate email format"""
@@ -39,6 +40,29 @@ def parse_datetime(dt_str: str) -> Optional[datetime]:
     except (ValueError, AttributeError):
         return None
 
+def format_http_date(dt: datetime) -> str:
+    """Format a naive UTC datetime as an HTTP date (Last-Modified header)"""
+    return _format_rfc_datetime(dt.replace(tzinfo=timezone.utc, microsecond=0), usegmt=True)
+
+def parse_http_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse an HTTP date header into a naive UTC datetime"""
+    if not value:
+        return None
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+def is_not_modified(if_modified_since: Optional[str], last_modified: Optional[datetime]) -> bool:
+    """Check an If-Modified-Since header against a row timestamp (second precision)"""
+    since = parse_http_date(if_modified_since)
+    if since is None or last_modified is None:
+        return False
+    return last_modified.replace(microsecond=0) <= since
+
 def sanitize_string(text: str) -> str:
     """Sanitize string input"""
     if not text: